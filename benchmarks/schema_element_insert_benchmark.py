@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Benchmark of inserting the schema elements and the schema meta attribute
+mappings of a wide record schema. It compares the bulk insert used by
+`schema_repository._create_avro_schema`, which inserts the rows with Core
+multi-row insert statements, with adding each row to the session and flushing
+it through the ORM unit of work, which is how the rows were inserted before.
+
+It runs against an in-memory SQLite database by default. Pass a MySQL url with
+`--db-url` to benchmark against a database that has the schematizer tables.
+
+Usage: python -m benchmarks.schema_element_insert_benchmark [--columns N]
+           [--meta-attributes N] [--repeat N] [--db-url URL]
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import time
+import timeit
+
+from sqlalchemy import create_engine
+from sqlalchemy import event
+
+from schematizer import models
+from schematizer.logic import schema_repository
+from schematizer.models.database import session
+from schematizer.models.schema_meta_attribute_mapping import (
+    SchemaMetaAttributeMapping
+)
+
+
+def build_wide_schema_json(columns):
+    """Build a record schema json that has `columns` documented fields,
+    similar to the schema of a wide MySQL table.
+    """
+    return {
+        'type': 'record',
+        'name': 'wide_table',
+        'namespace': 'benchmark',
+        'doc': 'table with {} columns'.format(columns),
+        'fields': [
+            {
+                'name': 'column_{}'.format(i),
+                'type': ['null', 'string'],
+                'default': None,
+                'doc': 'column {}'.format(i)
+            }
+            for i in range(columns)
+        ]
+    }
+
+
+def insert_through_orm(schema_id, avro_schema_elements, meta_attr_schema_ids):
+    for avro_schema_element in avro_schema_elements:
+        avro_schema_element.avro_schema_id = schema_id
+        session.add(avro_schema_element)
+    session.flush()
+
+    for meta_attr_schema_id in meta_attr_schema_ids:
+        session.add(SchemaMetaAttributeMapping(
+            schema_id=schema_id,
+            meta_attr_schema_id=meta_attr_schema_id
+        ))
+    session.flush()
+
+
+def insert_in_bulk(schema_id, avro_schema_elements, meta_attr_schema_ids):
+    schema_repository._bulk_insert_schema_elements(
+        schema_id,
+        avro_schema_elements
+    )
+    schema_repository._add_meta_attribute_mappings(
+        schema_id,
+        source_id=None,
+        meta_attr_schema_ids=meta_attr_schema_ids
+    )
+
+
+def time_insert(insert_func, schema_json, meta_attr_schema_ids, repeat):
+    """Returns the best time of inserting the schema elements and the meta
+    attribute mappings of the given schema. The inserted rows are rolled back
+    after each run.
+    """
+    timings = []
+    for _ in range(repeat):
+        avro_schema_elements = (
+            models.AvroSchema.create_schema_elements_from_json(schema_json)
+        )
+        start_time = timeit.default_timer()
+        insert_func(1, avro_schema_elements, meta_attr_schema_ids)
+        timings.append(timeit.default_timer() - start_time)
+        session.rollback()
+    return min(timings), len(avro_schema_elements)
+
+
+def _register_unix_timestamp(dbapi_connection, connection_record):
+    dbapi_connection.create_function(
+        'unix_timestamp',
+        0,
+        lambda: int(time.time())
+    )
+
+
+def setup_database(db_url):
+    engine = create_engine(db_url)
+    if engine.dialect.name == 'sqlite':
+        event.listen(engine, 'connect', _register_unix_timestamp)
+        models.AvroSchemaElement.__table__.create(engine)
+        SchemaMetaAttributeMapping.__table__.create(engine)
+    session.bind = engine
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark inserting the schema elements.'
+    )
+    parser.add_argument('--columns', type=int, default=400)
+    parser.add_argument('--meta-attributes', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--db-url', default='sqlite://')
+    return parser.parse_args()
+
+
+def run():
+    args = parse_args()
+    setup_database(args.db_url)
+    schema_json = build_wide_schema_json(args.columns)
+    meta_attr_schema_ids = range(1, args.meta_attributes + 1)
+
+    orm_time, element_count = time_insert(
+        insert_through_orm,
+        schema_json,
+        meta_attr_schema_ids,
+        args.repeat
+    )
+    bulk_time, _ = time_insert(
+        insert_in_bulk,
+        schema_json,
+        meta_attr_schema_ids,
+        args.repeat
+    )
+
+    print('elements={}, meta_attributes={}'.format(
+        element_count,
+        args.meta_attributes
+    ))
+    print('ORM unit of work: {:.4f}s'.format(orm_time))
+    print('bulk insert:      {:.4f}s'.format(bulk_time))
+    print('speedup:          {:.1f}x'.format(orm_time / bulk_time))
+
+
+if __name__ == '__main__':
+    run()
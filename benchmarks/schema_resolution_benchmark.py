@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Benchmark of the schema resolution on deeply nested record schemas with wide
+union fields. It compares the current `SchemaResolution` with the one that
+builds the memo keys from the `to_json` of the schemas, which is how the memo
+keys were created before they were based on the schema fingerprints.
+
+Usage: python -m benchmarks.schema_resolution_benchmark [--depth N]
+           [--union-width N] [--repeat N]
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import timeit
+
+from avro import schema
+
+from schematizer.logic.schema_resolution import SchemaResolution
+
+
+class ToJsonKeySchemaResolution(SchemaResolution):
+    """SchemaResolution that creates the memo keys from the frozen `to_json`
+    of the writer schema and the reader schema.
+    """
+
+    def _create_key(self, writer_schema, reader_schema):
+        return (self._freeze_object(writer_schema.to_json()),
+                self._freeze_object(reader_schema.to_json()))
+
+    def _freeze_object(self, obj):
+        if isinstance(obj, (tuple, list)):
+            return tuple([self._freeze_object(item) for item in obj])
+        if isinstance(obj, dict):
+            new_dict = dict(
+                (k, self._freeze_object(v)) for k, v in obj.items()
+            )
+            return frozenset(sorted(new_dict.items()))
+        return obj
+
+
+def build_nested_schema_json(depth, union_width, fields_per_record=3):
+    """Build a record schema json nested `depth` levels deep. Each record has
+    a few primitive fields, a union field of `union_width` enum branches, and
+    a field of the next level record.
+    """
+    record_json = None
+    for level in reversed(range(depth)):
+        fields = [
+            {'name': 'field_{}'.format(i), 'type': 'int', 'default': 0}
+            for i in range(fields_per_record)
+        ]
+        fields.append({
+            'name': 'choice',
+            'type': ['null'] + [
+                {
+                    'type': 'enum',
+                    'name': 'enum_{}_{}'.format(level, i),
+                    'symbols': ['A', 'B', 'C']
+                }
+                for i in range(union_width)
+            ],
+            'default': None
+        })
+        if record_json:
+            fields.append({'name': 'child', 'type': record_json})
+        record_json = {
+            'type': 'record',
+            'name': 'record_{}'.format(level),
+            'namespace': 'benchmark',
+            'fields': fields
+        }
+    return record_json
+
+
+def time_resolution(resolution_cls, schema_json, repeat):
+    """Returns the best time of resolving the writer schema against the
+    reader schema. The schemas are parsed again for each run so that no
+    fingerprint computed in the previous runs is reused.
+    """
+    timings = []
+    for _ in range(repeat):
+        writer_schema = schema.make_avsc_object(schema_json)
+        reader_schema = schema.make_avsc_object(schema_json)
+        start_time = timeit.default_timer()
+        assert resolution_cls().resolve_schema(writer_schema, reader_schema)
+        timings.append(timeit.default_timer() - start_time)
+    return min(timings)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the Avro schema resolution.'
+    )
+    parser.add_argument('--depth', type=int, default=10)
+    parser.add_argument('--union-width', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5)
+    return parser.parse_args()
+
+
+def run():
+    args = parse_args()
+    schema_json = build_nested_schema_json(args.depth, args.union_width)
+
+    to_json_key_time = time_resolution(
+        ToJsonKeySchemaResolution,
+        schema_json,
+        args.repeat
+    )
+    fingerprint_key_time = time_resolution(
+        SchemaResolution,
+        schema_json,
+        args.repeat
+    )
+
+    print('depth={}, union_width={}'.format(args.depth, args.union_width))
+    print('to_json memo keys:     {:.4f}s'.format(to_json_key_time))
+    print('fingerprint memo keys: {:.4f}s'.format(fingerprint_key_time))
+    print('speedup:               {:.1f}x'.format(
+        to_json_key_time / fingerprint_key_time
+    ))
+
+
+if __name__ == '__main__':
+    run()
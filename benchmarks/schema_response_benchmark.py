@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Benchmark of building and encoding the response of a list of schemas, such
+as the response of `GET /v1/schemas`. It compares the responses built in
+their final wire shape by `responses_v1`, with the previous post-processing
+of the `transform_api_response` decorator, which walked every response dict
+twice to format the datetime fields and to remove the None fields.
+
+The schemas are built in memory and are not added to the session, so no
+database is needed.
+
+Usage: python -m benchmarks.schema_response_benchmark [--schemas N]
+           [--repeat N]
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import json
+import timeit
+from datetime import datetime
+
+from schematizer import models
+from schematizer.api.responses import responses_v1
+from schematizer.helpers.formatting import _format_datetime
+
+
+def build_schemas(count):
+    """Build `count` schemas of different topics, sources, and namespaces,
+    with one in ten schemas having a note.
+    """
+    now = datetime.utcnow()
+    schemas = []
+    notes = []
+    for i in range(count):
+        namespace = models.Namespace(
+            id=i,
+            name='namespace_{}'.format(i % 10),
+            created_at=now,
+            updated_at=now
+        )
+        source = models.Source(
+            id=i,
+            name='source_{}'.format(i),
+            owner_email='owner@example.com',
+            namespace=namespace,
+            created_at=now,
+            updated_at=now
+        )
+        topic = models.Topic(
+            id=i,
+            name='topic_{}'.format(i),
+            source=source,
+            contains_pii=False,
+            cluster_type='datapipe',
+            primary_keys=['id'],
+            created_at=now,
+            updated_at=now
+        )
+        schemas.append(models.AvroSchema(
+            id=i,
+            avro_schema=(
+                '{"type": "record", "name": "table_%d", "pkey": ["id"], '
+                '"fields": [{"name": "id", "type": "int", "pkey": 1}]}' % i
+            ),
+            status=models.AvroSchemaStatus.READ_AND_WRITE,
+            topic=topic,
+            created_at=now,
+            updated_at=now
+        ))
+        if i % 10 == 0:
+            notes.append(models.Note(
+                id=i,
+                reference_type=models.ReferenceTypeEnum.SCHEMA,
+                reference_id=i,
+                note='note of schema {}'.format(i),
+                last_updated_by='owner@example.com',
+                created_at=now,
+                updated_at=now
+            ))
+    return schemas, responses_v1.NoteIndex(notes)
+
+
+def _transform_datetime_field(response):
+    if isinstance(response, dict):
+        for key, value in response.iteritems():
+            if isinstance(value, datetime):
+                response[key] = _format_datetime(value)
+            elif isinstance(value, dict):
+                _transform_datetime_field(value)
+
+
+def _dict_filter_out_none_values(input_dict):
+    if isinstance(input_dict, dict):
+        for key in input_dict.keys():
+            if input_dict[key] is None:
+                del input_dict[key]
+            elif isinstance(input_dict[key], dict):
+                _dict_filter_out_none_values(input_dict[key])
+
+
+def build_responses(schemas, note_index):
+    return [
+        responses_v1.get_schema_response_from_avro_schema(
+            avro_schema,
+            note_index=note_index
+        )
+        for avro_schema in schemas
+    ]
+
+
+def build_and_post_process_responses(schemas, note_index):
+    """How the list was built before, i.e. the responses were post-processed
+    by the transformers of the `transform_api_response` decorator.
+    """
+    responses = build_responses(schemas, note_index)
+    for response in responses:
+        _transform_datetime_field(response)
+        _dict_filter_out_none_values(response)
+    return responses
+
+
+def time_render(build_func, schemas, note_index, repeat):
+    """Returns the best time of building the responses of the given schemas
+    and encoding them, as the `json` renderer does.
+    """
+    return min(timeit.repeat(
+        lambda: json.dumps(build_func(schemas, note_index)),
+        number=1,
+        repeat=repeat
+    ))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark building a list of schema responses.'
+    )
+    parser.add_argument('--schemas', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=50)
+    return parser.parse_args()
+
+
+def run():
+    args = parse_args()
+    schemas, note_index = build_schemas(args.schemas)
+    # Decode the schema json of every schema once, as the registration and
+    # the earlier requests would have.
+    for avro_schema in schemas:
+        avro_schema.avro_schema_json
+
+    post_process_time = time_render(
+        build_and_post_process_responses,
+        schemas,
+        note_index,
+        args.repeat
+    )
+    single_pass_time = time_render(
+        build_responses,
+        schemas,
+        note_index,
+        args.repeat
+    )
+
+    print('schemas={}'.format(args.schemas))
+    print('built and post-processed: {:.4f}s'.format(post_process_time))
+    print('built in wire shape:      {:.4f}s'.format(single_pass_time))
+    print('speedup:                  {:.1f}x'.format(
+        post_process_time / single_pass_time
+    ))
+
+
+if __name__ == '__main__':
+    run()
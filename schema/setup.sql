@@ -10,4 +10,7 @@ GRANT SELECT, INSERT, UPDATE, DELETE, CREATE, CREATE TEMPORARY TABLES
 
 GRANT USAGE ON *.* TO 'schematizerro'@'%';
 
+-- Needed to check the replica lag with SHOW SLAVE STATUS
+GRANT REPLICATION CLIENT ON *.* TO 'schematizerro'@'%';
+
 GRANT SELECT ON `yelp_schematizer`.* TO 'schematizerro'@'%' ;
\ No newline at end of file
@@ -1,6 +1,7 @@
 CREATE TABLE `avro_schema` (
   `id` int(11) NOT NULL AUTO_INCREMENT,
   `avro_schema` text COLLATE utf8_unicode_ci NOT NULL,
+  `fingerprint` char(64) COLLATE utf8_unicode_ci DEFAULT NULL,
   `topic_id` int(11) NOT NULL,
   `base_schema_id` int(11) DEFAULT NULL,
   `alias` varchar(255) DEFAULT NULL,
@@ -9,5 +10,6 @@ CREATE TABLE `avro_schema` (
   `updated_at` int(11) NOT NULL,
   PRIMARY KEY (`id`),
   KEY `topic_id` (`topic_id`),
-  KEY `alias` (`alias`)
+  KEY `alias` (`alias`),
+  KEY `fingerprint_base_schema_id_topic_id` (`fingerprint`,`base_schema_id`,`topic_id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8 COLLATE=utf8_unicode_ci;
@@ -0,0 +1,6 @@
+CREATE TABLE `catalog_version` (
+  `id` int(11) NOT NULL,
+  `version` bigint(20) NOT NULL,
+  `updated_at` int(11) NOT NULL,
+  PRIMARY KEY (`id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8 COLLATE=utf8_unicode_ci;
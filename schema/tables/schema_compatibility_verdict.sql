@@ -0,0 +1,9 @@
+CREATE TABLE `schema_compatibility_verdict` (
+  `id` int(11) NOT NULL AUTO_INCREMENT,
+  `writer_fingerprint` char(64) COLLATE utf8_unicode_ci NOT NULL,
+  `reader_fingerprint` char(64) COLLATE utf8_unicode_ci NOT NULL,
+  `is_compatible` tinyint(1) NOT NULL,
+  `created_at` int(11) NOT NULL,
+  PRIMARY KEY (`id`),
+  UNIQUE KEY `writer_reader_fingerprint_unique_constraint` (`writer_fingerprint`, `reader_fingerprint`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8 COLLATE=utf8_unicode_ci;
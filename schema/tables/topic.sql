@@ -4,6 +4,7 @@ CREATE TABLE `topic` (
   `source_id` int(11) NOT NULL,
   `contains_pii` tinyint(1) NOT NULL,
   `cluster_type` varchar(255) COLLATE utf8_unicode_ci NOT NULL,
+  `primary_keys` text COLLATE utf8_unicode_ci DEFAULT NULL,
   `created_at` int(11) NOT NULL,
   `updated_at` int(11) NOT NULL,
   PRIMARY KEY (`id`),
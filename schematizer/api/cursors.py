@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+This module encodes and decodes the opaque cursors of the paginated list
+APIs. A cursor holds the position the next page starts at, such as
+`{"min_id": 101}`, and is encoded as url-safe base64 of its json, so that
+clients pass it back as-is and do not depend on how the position is kept.
+"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import base64
+import binascii
+
+import simplejson
+
+
+def encode_cursor(position):
+    """Encode the given position, a dict of the keyset values the next page
+    starts at, into an opaque cursor string.
+    """
+    position_json = simplejson.dumps(
+        position,
+        sort_keys=True,
+        separators=(',', ':')
+    )
+    return base64.urlsafe_b64encode(position_json.encode('utf-8')).decode(
+        'ascii'
+    )
+
+
+def decode_cursor(cursor, required_keys=('min_id',)):
+    """Decode the given cursor string into the position it holds. The values
+    of the position are integers, and the position always contains the
+    `required_keys`, which default to `min_id` of the paginated list APIs.
+
+    :raises ValueError: the cursor is not one encoded by `encode_cursor`.
+    """
+    try:
+        position = simplejson.loads(
+            base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        )
+    except (TypeError, UnicodeError, binascii.Error, ValueError):
+        raise ValueError("Invalid cursor: {}".format(cursor))
+    if not isinstance(position, dict) or not all(
+        isinstance(value, (int, long)) for value in position.values()
+    ) or not all(key in position for key in required_keys):
+        raise ValueError("Invalid cursor: {}".format(cursor))
+    return position
@@ -38,6 +38,7 @@ REFRESH_NOT_FOUND_ERROR_MESSAGE = 'Refresh not found for the given refresh id'
 ENTITY_NOT_FOUND_ERROR = 'Entity not found.'
 UNSUPPORTED_TARGET_SCHEMA_MESSAGE = 'Desired target schema type is unsupported'
 EMPTY_SRC_NAME_ERROR = 'Source name must be non-empty.'
+LOCK_TIMEOUT_ERROR = 'Timed out waiting for a concurrent registration.'
 
 
 def invalid_schema_exception(err_message=INVALID_AVRO_SCHEMA_ERROR):
@@ -116,3 +117,7 @@ def unsupported_target_schema_exception(
     err_message=UNSUPPORTED_TARGET_SCHEMA_MESSAGE
 ):
     return httpexceptions.exception_response(501, detail=err_message)
+
+
+def lock_timeout_exception(err_message=LOCK_TIMEOUT_ERROR):
+    return httpexceptions.exception_response(503, detail=err_message)
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+This module parses the `fields` query parameter of the read APIs, which
+selects the fields of the responses, such as `schema_id,schema,topic.name`.
+A nested field, such as `topic`, selects the whole nested object unless some
+of its own fields are selected, such as `topic.name`. Unknown fields are
+ignored.
+
+The response builders only build the selected fields, and the loading
+profiles only load the selected relationships, so the relationships of the
+fields that are not selected are never loaded. The functions of this module
+take None as the selection of all the fields.
+"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+
+class FieldSelection(object):
+    """The selected fields of a response object. A selected nested object
+    maps to the :class:FieldSelection of its own fields, or to None if all
+    its fields are selected.
+    """
+
+    def __init__(self, fields):
+        self._fields = fields
+
+    @classmethod
+    def parse(cls, fields_param):
+        """Parse the comma separated field paths of the `fields` query
+        parameter. It returns None, i.e. all the fields, if no field is
+        given.
+        """
+        tree = {}
+        for path in (fields_param or '').split(','):
+            names = [name.strip() for name in path.split('.')]
+            if not all(names):
+                continue
+            node = tree
+            for name in names[:-1]:
+                node = node.setdefault(name, {})
+                if node is None:
+                    # The whole nested object is selected already.
+                    break
+            else:
+                node[names[-1]] = None
+        return cls._from_tree(tree) if tree else None
+
+    @classmethod
+    def _from_tree(cls, tree):
+        return cls(dict(
+            (name, None if subtree is None else cls._from_tree(subtree))
+            for name, subtree in tree.iteritems()
+        ))
+
+    def includes(self, name):
+        return name in self._fields
+
+    def get(self, name):
+        return self._fields.get(name)
+
+    def project(self, response):
+        """Get a copy of the given response that only has the selected
+        fields. The given response is not modified.
+        """
+        projected = {}
+        for name, fields in self._fields.iteritems():
+            if name not in response:
+                continue
+            value = response[name]
+            if fields is not None and isinstance(value, dict):
+                value = fields.project(value)
+            projected[name] = value
+        return projected
+
+
+def includes(fields, name):
+    """Whether the field of the given name is selected by the given
+    :class:FieldSelection or None.
+    """
+    return fields is None or fields.includes(name)
+
+
+def get_subfields(fields, name):
+    """Get the selection of the fields of the nested object of the given
+    name, or None if all its fields are selected.
+    """
+    return None if fields is None else fields.get(name)
+
+
+def project(fields, response):
+    return response if fields is None else fields.project(response)
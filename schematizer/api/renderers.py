@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+This module contains the custom Pyramid renderers of the service.
+"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import tempfile
+
+import simplejson
+from pyramid.response import FileIter
+
+from schematizer.config import get_config
+
+
+class StreamingJSONRenderer(object):
+    """Renders an iterable of JSON serializable items, such as a generator
+    that builds the responses of the entities loaded batch by batch, as a
+    JSON array.
+
+    The items are encoded one at a time into a spooled temporary file, which
+    is kept in memory until it grows over `streaming_response_spool_size`
+    bytes and is moved to disk afterwards, and the file becomes the response
+    body. So the memory of rendering a list does not grow with the size of
+    the list.
+
+    The whole array is encoded while the view is rendered, i.e. while the
+    database session of the request is still open, and an error raised by
+    the iterable fails the request instead of truncating the response.
+    """
+
+    def __init__(self, info):
+        pass
+
+    def __call__(self, value, system):
+        body_file = tempfile.SpooledTemporaryFile(
+            max_size=get_config().streaming_response_spool_size
+        )
+        try:
+            _write_json_array(body_file, value)
+            content_length = body_file.tell()
+            body_file.seek(0)
+        except:
+            body_file.close()
+            raise
+
+        response = system['request'].response
+        response.content_type = 'application/json'
+        response.app_iter = FileIter(body_file)
+        response.content_length = content_length
+        # The response body has been set, so there is nothing to return.
+        return None
+
+
+def _write_json_array(body_file, items):
+    body_file.write(b'[')
+    for index, item in enumerate(items):
+        if index > 0:
+            body_file.write(b', ')
+        body_file.write(simplejson.dumps(item).encode('utf-8'))
+    body_file.write(b']')
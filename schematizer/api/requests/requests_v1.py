@@ -21,6 +21,11 @@ from datetime import datetime
 import simplejson
 from cached_property import cached_property
 
+from schematizer.api import cursors
+from schematizer.api.fields import FieldSelection
+from schematizer.api.exceptions import exceptions_v1
+from schematizer.config import get_config
+from schematizer.logic import catalog_snapshot
 from schematizer.models.page_info import PageInfo
 
 DEFAULT_KAFKA_CLUSTER_TYPE = 'datapipe'
@@ -49,10 +54,7 @@ class GetSourcesRequest(RequestBase):
 
     def __init__(self, query_params):
         super(GetSourcesRequest, self).__init__()
-        self.page_info = PageInfo(
-            query_params.get('count', 0),
-            query_params.get('min_id', 0)
-        )
+        self.page_info = get_pagination_info(query_params)
 
 
 class RegisterSchemaRequest(RequestBase):
@@ -81,6 +83,13 @@ class RegisterSchemaRequest(RequestBase):
         return simplejson.loads(self.schema) if self.schema else None
 
 
+class RegisterSchemasInBatchRequest(RequestBase):
+
+    def __init__(self, schemas):
+        super(RegisterSchemasInBatchRequest, self).__init__()
+        self.schemas = [RegisterSchemaRequest(**item) for item in schemas]
+
+
 class RegisterSchemaFromMySqlRequest(RequestBase):
 
     def __init__(
@@ -167,11 +176,46 @@ class GetSchemasRequest(RequestBase):
         self.created_after, self.created_after_datetime = self._get_datetime(
             query_params.get('created_after')
         )
-        self.page_info = PageInfo(
-            query_params.get('count'),
-            query_params.get('min_id')
-        )
+        self.page_info = get_pagination_info(query_params)
         self.include_disabled = query_params.get('include_disabled')
+        self.fields = get_field_selection(query_params)
+
+
+class WatchSchemasRequest(RequestBase):
+
+    def __init__(self, query_params):
+        super(WatchSchemasRequest, self).__init__()
+        config = get_config()
+        self.after_id = get_non_negative_int_param(
+            query_params,
+            'after_id',
+            default=0
+        )
+        timeout = get_non_negative_int_param(
+            query_params,
+            'timeout',
+            default=config.schema_watch_default_timeout_seconds
+        )
+        self.timeout_seconds = min(
+            timeout,
+            config.schema_watch_max_timeout_seconds
+        )
+        # The new schemas are always returned in bounded pages, since a
+        # client which starts watching from the first schema would get the
+        # whole catalog otherwise.
+        count = get_non_negative_int_param(query_params, 'count', default=0)
+        self.count = min(
+            count or config.max_page_size,
+            config.max_page_size
+        )
+        self.fields = get_field_selection(query_params)
+
+
+class GetCatalogSnapshotRequest(RequestBase):
+
+    def __init__(self, query_params):
+        super(GetCatalogSnapshotRequest, self).__init__()
+        self.since = get_snapshot_position(query_params.get('since'))
 
 
 class GetTopicsRequest(RequestBase):
@@ -183,10 +227,7 @@ class GetTopicsRequest(RequestBase):
         self.created_after, self.created_after_datetime = self._get_datetime(
             query_params.get('created_after')
         )
-        self.page_info = PageInfo(
-            query_params.get('count'),
-            query_params.get('min_id')
-        )
+        self.page_info = get_pagination_info(query_params)
 
 
 class GetRefreshesRequest(RequestBase):
@@ -201,6 +242,7 @@ class GetRefreshesRequest(RequestBase):
         self.updated_after, self.updated_after_datetime = self._get_datetime(
             query_params.get('updated_after')
         )
+        self.page_info = get_pagination_info(query_params)
 
 
 class CreateRefreshRequest(RequestBase):
@@ -263,7 +305,83 @@ class CreateConsumerGroupDataSourceRequest(RequestBase):
 
 
 def get_pagination_info(query_params):
+    """Get the :class:schematizer.models.page_info.PageInfo of a list request.
+
+    The page starts at the position held by the `cursor` parameter, which is
+    the cursor of the next page returned with the previous page, or at the
+    `min_id` parameter if there is no cursor. The page size is the `count`
+    parameter, or the `default_page_size` config if it is not specified, and
+    0 means no limit, so the lists are only paginated when the clients ask
+    for it by default. A page size is capped at the `max_page_size` config.
+    A list without a limit is still loaded and rendered in batches, see
+    :func:`schematizer.views.view_common.get_streaming_batch_size`.
+
+    :raises HTTPBadRequest: the count, min_id, or cursor is invalid.
+    """
+    config = get_config()
+    count = get_non_negative_int_param(
+        query_params,
+        'count',
+        default=config.default_page_size
+    )
+    if count:
+        count = min(count, config.max_page_size)
+
+    cursor = query_params.get('cursor')
+    if not cursor:
+        return PageInfo(
+            count,
+            get_non_negative_int_param(query_params, 'min_id', default=0)
+        )
+    try:
+        position = cursors.decode_cursor(cursor)
+    except ValueError as e:
+        raise exceptions_v1.invalid_request_exception(str(e))
     return PageInfo(
-        query_params.get('count', 0),
-        query_params.get('min_id', 0)
+        count,
+        position['min_id'],
+        priority=position.get('priority'),
+        source_id=position.get('source_id')
     )
+
+
+def get_non_negative_int_param(query_params, name, default):
+    """Get the value of the given query parameter as a non-negative integer,
+    or `default` if it is not specified.
+
+    :raises HTTPBadRequest: the value is not a non-negative integer.
+    """
+    value = query_params.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        value = -1
+    if value < 0:
+        raise exceptions_v1.invalid_request_exception(
+            '{} must be a non-negative integer.'.format(name)
+        )
+    return value
+
+
+def get_snapshot_position(position_token):
+    """Get the catalog snapshot position held by the given token, which is
+    taken from the X-Snapshot-Position header of a snapshot or delta. It
+    returns None if there is no token.
+    """
+    if not position_token:
+        return None
+    try:
+        position = cursors.decode_cursor(position_token, required_keys=())
+        catalog_snapshot.validate_position(position)
+    except ValueError as e:
+        raise exceptions_v1.invalid_request_exception(str(e))
+    return position
+
+
+def get_field_selection(query_params):
+    """Get the :class:schematizer.api.fields.FieldSelection of the `fields`
+    query parameter, or None if all the fields are requested.
+    """
+    return FieldSelection.parse(query_params.get('fields'))
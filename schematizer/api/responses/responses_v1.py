@@ -17,6 +17,15 @@
 
 Most of them are shared in various API responses, and therefore keep them
 in this module.
+
+The responses are built in their final wire shape in one pass: the datetime
+fields are formatted as they are added, and the fields whose value is None
+are left out, since `null` is not supported by the swagger schemas. Views
+return these responses as-is.
+
+The builders of the schema and topic responses also take the
+:class:schematizer.api.fields.FieldSelection of the `fields` query parameter,
+and do not touch the relationships of the fields that are not selected.
 """
 from __future__ import absolute_import
 from __future__ import unicode_literals
@@ -24,7 +33,33 @@ from __future__ import unicode_literals
 from data_pipeline_avro_util.data_pipeline.avro_meta_data \
     import AvroMetaDataKeys
 
+from schematizer.api import fields as api_fields
 from schematizer.helpers.formatting import _format_datetime
+from schematizer.models.note import ReferenceTypeEnum
+
+
+class NoteIndex(object):
+    """Notes of a page of schemas and schema elements keyed by the entity
+    they reference. Views that build the responses of many schemas or
+    schema elements fetch the notes of the page with one query, such as
+    :func:`schematizer.logic.doc_tool.get_notes_by_schemas_and_elements`,
+    and pass the index to the response builders, so that the builders do not
+    query the note of each entity.
+    """
+
+    def __init__(self, notes):
+        self._notes = dict(
+            ((note.reference_type, note.reference_id), note)
+            for note in notes
+        )
+
+    def get_schema_note(self, schema_id):
+        return self._notes.get((ReferenceTypeEnum.SCHEMA, schema_id))
+
+    def get_element_note(self, element_id):
+        return self._notes.get(
+            (ReferenceTypeEnum.SCHEMA_ELEMENT, element_id)
+        )
 
 
 def get_namespace_response_from_namespace(namespace):
@@ -36,51 +71,102 @@ def get_namespace_response_from_namespace(namespace):
     }
 
 
-def get_source_response_from_source(source):
-    return {
+def get_source_response_from_source(source, fields=None):
+    response = {
         'source_id': source.id,
         'name': source.name,
         'owner_email': source.owner_email,
-        'namespace': get_namespace_response_from_namespace(source.namespace),
-        'category': (
-            None if source.category is None else source.category.category
-        ),
         'created_at': _format_datetime(source.created_at),
         'updated_at': _format_datetime(source.updated_at)
     }
+    if api_fields.includes(fields, 'namespace'):
+        response['namespace'] = get_namespace_response_from_namespace(
+            source.namespace
+        )
+    if api_fields.includes(fields, 'category'):
+        category = source.category
+        if category is not None:
+            response['category'] = category.category
+    return api_fields.project(fields, response)
 
 
-def get_topic_response_from_topic(topic):
-    return {
+def get_topic_response_from_topic(topic, fields=None):
+    response = {
         'topic_id': topic.id,
         'name': topic.name,
-        'source': get_source_response_from_source(topic.source),
         'contains_pii': topic.contains_pii,
         'cluster_type': topic.cluster_type,
         'primary_keys': topic.primary_keys,
         'created_at': _format_datetime(topic.created_at),
         'updated_at': _format_datetime(topic.updated_at)
     }
+    if api_fields.includes(fields, 'source'):
+        response['source'] = get_source_response_from_source(
+            topic.source,
+            fields=api_fields.get_subfields(fields, 'source')
+        )
+    return api_fields.project(fields, response)
 
 
-def get_schema_response_from_avro_schema(avro_schema):
+def get_schema_response_from_avro_schema(
+    avro_schema,
+    note_index=None,
+    fields=None
+):
+    """Get the response of the given schema. The note of the schema is looked
+    up in the given :class:`NoteIndex`, or queried if there is no index.
+
+    The schema json is not read unless the `schema` or `primary_keys` field
+    is selected, so that it can be deferred when the schema is queried.
+    """
     response = {
         'schema_id': avro_schema.id,
-        'schema': avro_schema.avro_schema,
         'status': avro_schema.status,
-        'topic': get_topic_response_from_topic(avro_schema.topic),
-        'primary_keys': avro_schema.avro_schema_json.get(
-            AvroMetaDataKeys.PRIMARY_KEY,
-            []
-        ),
-        'note': get_note_response_from_note(avro_schema.note),
         'created_at': _format_datetime(avro_schema.created_at),
         'updated_at': _format_datetime(avro_schema.updated_at)
     }
-    # Since swagger cannot take null or None value for integer type,
-    # here we just simply strip out this field.
+    if api_fields.includes(fields, 'schema'):
+        response['schema'] = avro_schema.avro_schema
+    if api_fields.includes(fields, 'primary_keys'):
+        response['primary_keys'] = avro_schema.avro_schema_json.get(
+            AvroMetaDataKeys.PRIMARY_KEY,
+            []
+        )
+    if api_fields.includes(fields, 'topic'):
+        response['topic'] = get_topic_response_from_topic(
+            avro_schema.topic,
+            fields=api_fields.get_subfields(fields, 'topic')
+        )
+    if api_fields.includes(fields, 'note'):
+        note = (
+            avro_schema.note if note_index is None
+            else note_index.get_schema_note(avro_schema.id)
+        )
+        if note is not None:
+            response['note'] = get_note_response_from_note(note)
     if avro_schema.base_schema_id is not None:
         response['base_schema_id'] = avro_schema.base_schema_id
+    return api_fields.project(fields, response)
+
+
+def get_batch_registration_response(
+    index,
+    avro_schema=None,
+    error=None,
+    note_index=None
+):
+    """Get the response of the `index`-th schema in a batch registration
+    request, which contains either the registered schema or the error
+    message of the failed registration.
+    """
+    response = {'index': index}
+    if avro_schema is not None:
+        response['schema'] = get_schema_response_from_avro_schema(
+            avro_schema,
+            note_index=note_index
+        )
+    elif error is not None:
+        response['error'] = error
     return response
 
 
@@ -108,20 +194,35 @@ def get_category_response_from_source_category(source_category):
     }
 
 
-def get_refresh_response_from_refresh(refresh):
-    return {
+def get_refresh_response_from_refresh(
+    refresh,
+    source_name=None,
+    namespace_name=None
+):
+    """Build the response of the given refresh. The source name and the
+    namespace name are read from `refresh.source` unless they are given,
+    such as when they are queried together with the refresh.
+    """
+    if source_name is None:
+        source_name = refresh.source.name
+    if namespace_name is None:
+        namespace_name = refresh.source.namespace.name
+    response = {
         'refresh_id': refresh.id,
-        'source_name': refresh.source.name,
-        'namespace_name': refresh.source.namespace.name,
+        'source_name': source_name,
+        'namespace_name': namespace_name,
         'status': refresh.status,
         'offset': refresh.offset,
         'batch_size': refresh.batch_size,
         'priority': refresh.priority,
-        'filter_condition': refresh.filter_condition,
-        'avg_rows_per_second_cap': refresh.avg_rows_per_second_cap,
         'created_at': _format_datetime(refresh.created_at),
         'updated_at': _format_datetime(refresh.updated_at)
     }
+    if refresh.filter_condition is not None:
+        response['filter_condition'] = refresh.filter_condition
+    if refresh.avg_rows_per_second_cap is not None:
+        response['avg_rows_per_second_cap'] = refresh.avg_rows_per_second_cap
+    return response
 
 
 def get_data_target_response_from_data_target(data_target):
@@ -162,17 +263,28 @@ def get_response_from_consumer_group_data_source(consumer_group_data_source):
     }
 
 
-def get_element_response_from_element(element):
-    return {
+def get_element_response_from_element(element, note_index=None):
+    """Get the response of the given schema element. The note of the element
+    is looked up in the given :class:`NoteIndex`, or queried if there is no
+    index.
+    """
+    note = (
+        element.note if note_index is None
+        else note_index.get_element_note(element.id)
+    )
+    response = {
         'id': element.id,
         'schema_id': element.avro_schema_id,
         'element_type': element.element_type,
         'key': element.key,
-        'doc': element.doc,
-        'note': get_note_response_from_note(element.note),
         'created_at': _format_datetime(element.created_at),
         'updated_at': _format_datetime(element.updated_at),
     }
+    if element.doc is not None:
+        response['doc'] = element.doc
+    if note is not None:
+        response['note'] = get_note_response_from_note(note)
+    return response
 
 
 def get_meta_attr_mapping_response(entity_type, entity_id, meta_attr_id):
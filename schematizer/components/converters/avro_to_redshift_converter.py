@@ -25,6 +25,7 @@ from schematizer.components.converters.converter_base \
     import SchemaConversionException
 from schematizer.components.converters.converter_base \
     import UnsupportedTypeException
+from schematizer.helpers.avro_schema_cache import get_avro_schema_object
 from schematizer.models import redshift_data_types
 from schematizer.models import SchemaKindEnum
 from schematizer.models.sql_entities import MetaDataKey
@@ -52,7 +53,7 @@ class AvroToRedshiftConverter(BaseConverter):
         if not src_schema:
             return None
         try:
-            avro_record = schema.make_avsc_object(src_schema)
+            avro_record = get_avro_schema_object(src_schema)
         except:
             raise SchemaConversionException('Invalid Avro record schema.')
 
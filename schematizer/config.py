@@ -45,6 +45,27 @@ class Config(object):
             default='topology.yaml'
         )
 
+    @property
+    def read_replica_name(self):
+        return staticconf.get(
+            'read_replica_name',
+            default='slave'
+        )
+
+    @property
+    def read_replica_max_lag_seconds(self):
+        return staticconf.read_int(
+            'read_replica_max_lag_seconds',
+            default=5
+        )
+
+    @property
+    def read_replica_lag_check_interval_seconds(self):
+        return staticconf.read_int(
+            'read_replica_lag_check_interval_seconds',
+            default=1
+        )
+
     @cached_property
     def namespace_no_doc_required(self):
         return staticconf.read_list_of_string(
@@ -52,6 +73,176 @@ class Config(object):
             default=[]
         )
 
+    @property
+    def parsed_avro_schema_cache_size(self):
+        return staticconf.read_int(
+            'parsed_avro_schema_cache_size',
+            default=1000
+        )
+
+    @property
+    def batch_registration_max_size(self):
+        return staticconf.read_int(
+            'batch_registration_max_size',
+            default=1000
+        )
+
+    @property
+    def batch_registration_chunk_size(self):
+        return staticconf.read_int(
+            'batch_registration_chunk_size',
+            default=100
+        )
+
+    @property
+    def batch_registration_validation_workers(self):
+        return staticconf.read_int(
+            'batch_registration_validation_workers',
+            default=4
+        )
+
+    @property
+    def schema_fingerprint_fallback_enabled(self):
+        # Set it to false once the fingerprints of the schemas registered
+        # before the fingerprint column was added have been backfilled.
+        return staticconf.read_bool(
+            'schema_fingerprint_fallback_enabled',
+            default=True
+        )
+
+    @property
+    def registration_coalescing_enabled(self):
+        return staticconf.read_bool(
+            'registration_coalescing_enabled',
+            default=True
+        )
+
+    @property
+    def registration_coalescing_timeout_seconds(self):
+        return staticconf.read_int(
+            'registration_coalescing_timeout_seconds',
+            default=30
+        )
+
+    @property
+    def schema_response_cache_size(self):
+        return staticconf.read_int(
+            'schema_response_cache_size',
+            default=10000
+        )
+
+    @property
+    def schema_response_cache_ttl_seconds(self):
+        return staticconf.read_int(
+            'schema_response_cache_ttl_seconds',
+            default=60
+        )
+
+    @property
+    def lookup_cache_backend(self):
+        return staticconf.read_string(
+            'lookup_cache_backend',
+            default='lru'
+        )
+
+    @property
+    def lookup_cache_size(self):
+        return staticconf.read_int(
+            'lookup_cache_size',
+            default=10000
+        )
+
+    @property
+    def lookup_cache_ttl_seconds(self):
+        return staticconf.read_int(
+            'lookup_cache_ttl_seconds',
+            default=60
+        )
+
+    @property
+    def lookup_cache_memcache_server(self):
+        return staticconf.read_string(
+            'lookup_cache_memcache_server',
+            default='localhost:11211'
+        )
+
+    @property
+    def catalog_version_check_interval_seconds(self):
+        return staticconf.read_int(
+            'catalog_version_check_interval_seconds',
+            default=1
+        )
+
+    @property
+    def schema_watch_poll_interval_seconds(self):
+        return staticconf.read_float(
+            'schema_watch_poll_interval_seconds',
+            default=1.0
+        )
+
+    @property
+    def schema_watch_default_timeout_seconds(self):
+        return staticconf.read_int(
+            'schema_watch_default_timeout_seconds',
+            default=30
+        )
+
+    @property
+    def schema_watch_max_timeout_seconds(self):
+        return staticconf.read_int(
+            'schema_watch_max_timeout_seconds',
+            default=60
+        )
+
+    @property
+    def default_page_size(self):
+        return staticconf.read_int(
+            'default_page_size',
+            default=0
+        )
+
+    @property
+    def max_page_size(self):
+        return staticconf.read_int(
+            'max_page_size',
+            default=10000
+        )
+
+    @property
+    def streaming_response_batch_size(self):
+        return staticconf.read_int(
+            'streaming_response_batch_size',
+            default=500
+        )
+
+    @property
+    def streaming_response_spool_size(self):
+        return staticconf.read_int(
+            'streaming_response_spool_size',
+            default=4 * 1024 * 1024
+        )
+
+    @property
+    def source_lock_timeout_seconds(self):
+        return staticconf.read_int(
+            'source_lock_timeout_seconds',
+            default=10
+        )
+
+    @property
+    def reader_schema_plan_cache_size(self):
+        return staticconf.read_int(
+            'reader_schema_plan_cache_size',
+            default=100
+        )
+
+    @property
+    def compatibility_verdict_cache_size(self):
+        return staticconf.read_int(
+            'compatibility_verdict_cache_size',
+            default=10000
+        )
+
 
 def get_config():
     """Returns the global schematizer configuration object"""
@@ -164,6 +355,16 @@ def routes(config):
         'api.v1.register_schema',
         '/v1/schemas/avro'
     )
+    config.add_route(
+        'api.v1.register_schemas_in_batch',
+        '/v1/schemas/avro/batch',
+        request_method="POST"
+    )
+    config.add_route(
+        'api.v1.watch_schemas',
+        '/v1/schemas/watch',
+        request_method="GET"
+    )
     config.add_route(
         'api.v1.get_schema_by_id',
         '/v1/schemas/{schema_id}'
@@ -281,3 +482,15 @@ def routes(config):
         '/v1/schemas',
         request_method="GET"
     )
+
+    config.add_route(
+        'api.v1.get_catalog_snapshot',
+        '/v1/snapshots/catalog',
+        request_method="GET"
+    )
+
+    config.add_route(
+        'status.caches',
+        '/status/caches',
+        request_method="GET"
+    )
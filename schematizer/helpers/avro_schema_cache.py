@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+This module keeps a process-wide cache of parsed Avro schema objects. Parsing
+the Avro schema json with `avro.schema.make_avsc_object` is expensive for wide
+schemas, and the same schema json is usually parsed several times within a
+single request, such as validating, extracting schema elements, and checking
+the compatibility against existing schemas.
+
+The parsed schema objects are keyed by the fingerprint of the canonical json
+representation of the schema, so two json objects that only differ in the
+order of their keys share the same parsed schema object.
+
+Note that the parsed schema objects are shared across the requests. Callers
+must not modify them, and should use `avro.schema.make_avsc_object` directly
+if they need to change the parsed schema object.
+"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import hashlib
+
+import simplejson
+from avro import schema
+
+from schematizer.config import get_config
+from schematizer.helpers.decorators import memoized
+from schematizer.helpers.lru_cache import LRUCache
+
+
+def get_canonical_json(avro_schema_json):
+    """Get the canonical json string of the given Avro schema json object,
+    i.e. the keys are sorted and there is no extra whitespace.
+    """
+    return simplejson.dumps(
+        avro_schema_json,
+        sort_keys=True,
+        separators=(',', ':')
+    )
+
+
+def get_schema_fingerprint(avro_schema_json):
+    """Get the fingerprint (hex string of SHA-256 hash) of the canonical json
+    representation of the given Avro schema json object.
+    """
+    canonical_json = get_canonical_json(avro_schema_json)
+    return hashlib.sha256(canonical_json.encode('utf-8')).hexdigest()
+
+
+@memoized
+def _get_parsed_schema_cache():
+    return LRUCache(max_size=get_config().parsed_avro_schema_cache_size)
+
+
+def get_avro_schema_object(avro_schema_json):
+    """Get the parsed Avro schema object of the given Avro schema json object.
+    The parsed schema object is cached, and the same object is returned for
+    the schema json objects that have the same fingerprint. The returned
+    object must be treated as read-only.
+
+    :raises avro.schema.SchemaParseException: invalid Avro schema json.
+    """
+    return _get_parsed_schema_cache().get_or_create(
+        get_schema_fingerprint(avro_schema_json),
+        lambda: schema.make_avsc_object(avro_schema_json)
+    )
+
+
+def get_parsed_schema_cache_stats():
+    """Get the :class:schematizer.helpers.lru_cache.CacheStats of the parsed
+    Avro schema object cache.
+    """
+    return _get_parsed_schema_cache().stats
+
+
+def clear_parsed_schema_cache():
+    _get_parsed_schema_cache().clear()
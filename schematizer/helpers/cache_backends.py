@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+This module contains the backends of the caches that may be shared across
+processes. A backend maps string keys to byte string values with `get`,
+`set`, and `delete`, so the callers serialize the cached values themselves
+and the same cache can be kept either in the current process or in a
+memcached server.
+
+The backends never raise on cache failures: a value that cannot be read is
+a miss, and a failed write or delete is logged, so that the callers fall back
+to their source of truth.
+"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import hashlib
+import socket
+import threading
+
+from pymemcache.client.base import Client
+from pymemcache.exceptions import MemcacheError
+
+from schematizer.config import log
+from schematizer.helpers.lru_cache import CacheStats
+from schematizer.helpers.lru_cache import LRUCache
+
+
+class LRUCacheBackend(object):
+    """Backend that keeps the values in an in-process
+    :class:schematizer.helpers.lru_cache.LRUCache.
+    """
+
+    def __init__(self, max_size, ttl_seconds=None):
+        self._cache = LRUCache(max_size=max_size, ttl_seconds=ttl_seconds)
+
+    def get(self, key):
+        return self._cache.get(key)
+
+    def set(self, key, value):
+        self._cache.set(key, value)
+
+    def delete(self, key):
+        self._cache.delete(key)
+
+    def clear(self):
+        self._cache.clear()
+
+    @property
+    def stats(self):
+        return self._cache.stats
+
+
+class MemcacheBackend(object):
+    """Backend that keeps the values in a memcached server, so that the
+    values and their invalidations are shared by all the processes that use
+    the same server. It uses a single pymemcache client, which reconnects
+    on the next command after any error.
+
+    The keys are hashed, since memcached keys cannot contain whitespace and
+    are limited to 250 bytes. The `stats` only count the lookups of the
+    current process; the size of the cache is kept by the server.
+
+    Args:
+        host (str): host of the memcached server.
+        port (int): port of the memcached server.
+        ttl_seconds (Optional[int]): number of seconds the values expire
+            after. Default the values do not expire.
+        key_prefix (Optional[str]): prefix of the keys, which separates the
+            keys of different caches sharing the same server.
+        timeout_seconds (Optional[float]): timeout of connecting to the
+            server and of each socket operation.
+    """
+
+    def __init__(
+        self,
+        host,
+        port,
+        ttl_seconds=None,
+        key_prefix='schematizer',
+        timeout_seconds=0.5
+    ):
+        self.host = host
+        self.port = port
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+        self.timeout_seconds = timeout_seconds
+        # The client is not thread-safe, so the commands are serialized.
+        self._lock = threading.Lock()
+        self._client = Client(
+            (host, port),
+            connect_timeout=timeout_seconds,
+            timeout=timeout_seconds,
+            no_delay=True
+        )
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key):
+        memcache_key = self._get_memcache_key(key)
+        try:
+            with self._lock:
+                value = self._client.get(memcache_key)
+                if value is None:
+                    self._misses += 1
+                else:
+                    self._hits += 1
+                return value
+        except _MEMCACHE_ERRORS as e:
+            log.warning("Failed to get key {} from memcached: {}".format(
+                key,
+                e
+            ))
+            return None
+
+    def set(self, key, value):
+        memcache_key = self._get_memcache_key(key)
+        try:
+            with self._lock:
+                self._client.set(
+                    memcache_key,
+                    value,
+                    expire=self.ttl_seconds or 0,
+                    noreply=False
+                )
+        except _MEMCACHE_ERRORS as e:
+            log.warning("Failed to set key {} in memcached: {}".format(
+                key,
+                e
+            ))
+
+    def delete(self, key):
+        memcache_key = self._get_memcache_key(key)
+        try:
+            with self._lock:
+                self._client.delete(memcache_key, noreply=False)
+        except _MEMCACHE_ERRORS as e:
+            # The value of the key is stale until it expires.
+            log.warning("Failed to delete key {} from memcached: {}".format(
+                key,
+                e
+            ))
+
+    @property
+    def stats(self):
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=0,
+                size=None,
+                max_size=None
+            )
+
+    def close(self):
+        with self._lock:
+            self._client.close()
+
+    def _get_memcache_key(self, key):
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return '{}:{}'.format(self.key_prefix, digest).encode('ascii')
+
+
+# The errors of the memcached commands, including the ones of the connection.
+_MEMCACHE_ERRORS = (MemcacheError, socket.error)
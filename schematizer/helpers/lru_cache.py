@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import threading
+import time
+from collections import namedtuple
+from collections import OrderedDict
+
+
+class CacheStats(namedtuple(
+    'CacheStats',
+    ['hits', 'misses', 'evictions', 'size', 'max_size']
+)):
+
+    __slots__ = ()
+
+    @property
+    def hit_ratio(self):
+        """Ratio of the lookups that are served from the cache, or 0.0 if
+        the cache has not been looked up yet.
+        """
+        lookups = self.hits + self.misses
+        return float(self.hits) / lookups if lookups else 0.0
+
+
+class LRUCache(object):
+    """Thread-safe, size-bounded cache which evicts the least recently used
+    entry once it is full. It keeps the hit, miss, and eviction counts so
+    the effectiveness of the cache can be reported.
+
+    If `ttl_seconds` is specified, an entry expires once it has been in the
+    cache for that many seconds, and looking it up afterwards is a miss.
+
+    Note that the values are shared by all the callers, so the callers should
+    treat the cached values as read-only.
+    """
+
+    def __init__(self, max_size, ttl_seconds=None):
+        if max_size <= 0:
+            raise ValueError(
+                "max_size must be positive. Value: {}".format(max_size)
+            )
+        if ttl_seconds is not None and ttl_seconds <= 0:
+            raise ValueError(
+                "ttl_seconds must be positive. Value: {}".format(ttl_seconds)
+            )
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._get_live_entry(key)
+            if entry is None:
+                self._misses += 1
+                return default
+            self._entries[key] = self._entries.pop(key)
+            self._hits += 1
+            return entry[0]
+
+    def set(self, key, value):
+        expires_at = (
+            None if self.ttl_seconds is None
+            else time.time() + self.ttl_seconds
+        )
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (value, expires_at)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def get_or_create(self, key, create_func):
+        """Get the value of the given key. If the key is not in the cache, the
+        value is created by `create_func` and then added into the cache. The
+        `create_func` is called without holding the lock, so a value that is
+        expensive to create does not block other readers.
+        """
+        value = self.get(key, _missing)
+        if value is _missing:
+            value = create_func()
+            self.set(key, value)
+        return value
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def stats(self):
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._entries),
+                max_size=self.max_size
+            )
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._get_live_entry(key) is not None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def _get_live_entry(self, key):
+        """Get the (value, expires_at) entry of the given key, or None if the
+        key is not in the cache. An expired entry is removed from the cache.
+        Must be called while holding the lock.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at = entry[1]
+        if expires_at is not None and expires_at <= time.time():
+            del self._entries[key]
+            return None
+        return entry
+
+
+_missing = object()
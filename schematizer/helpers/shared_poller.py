@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import threading
+import time
+
+
+class SharedPoller(object):
+    """Thread-safe poller of a value that never decreases, such as the max
+    id of a table, shared by the threads waiting for the value to exceed
+    their thresholds.
+
+    The polls are run by the waiting threads themselves: whenever the last
+    poll is older than `poll_interval_seconds`, one of the waiting threads
+    calls `poll_func` while the others keep waiting, and all of them are
+    woken up with the new value. So the value is polled at most once per
+    interval no matter how many threads are waiting, and it is not polled
+    at all when nobody waits.
+
+    Args:
+        poll_func (function): function returning the current value, or None
+            if there is no value yet.
+        poll_interval_seconds (float): minimum number of seconds between two
+            polls.
+    """
+
+    def __init__(self, poll_func, poll_interval_seconds):
+        self.poll_func = poll_func
+        self.poll_interval_seconds = poll_interval_seconds
+        self.value = None
+        self._polled_at = None
+        self._is_polling = False
+        self._condition = threading.Condition()
+
+    def wait_for_value_above(self, threshold, timeout_seconds):
+        """Wait until the polled value is greater than the given threshold,
+        or until the timeout expires.
+
+        :return: the last polled value, which is not greater than the
+            threshold if the wait times out.
+        """
+        deadline = time.time() + timeout_seconds
+        with self._condition:
+            while True:
+                if self.value is not None and self.value > threshold:
+                    return self.value
+
+                now = time.time()
+                next_poll_at = (
+                    now if self._polled_at is None
+                    else self._polled_at + self.poll_interval_seconds
+                )
+                if not self._is_polling and now >= next_poll_at:
+                    self._poll()
+                    continue
+                if now >= deadline:
+                    return self.value
+
+                # While another thread is polling, wait for it to notify the
+                # new value.
+                wake_up_at = deadline
+                if not self._is_polling:
+                    wake_up_at = min(deadline, next_poll_at)
+                self._condition.wait(wake_up_at - now)
+
+    def _poll(self):
+        """Poll the value without holding the lock. Must be called while
+        holding the lock.
+        """
+        self._is_polling = True
+        self._condition.release()
+        value = None
+        try:
+            value = self.poll_func()
+        finally:
+            self._condition.acquire()
+            self._is_polling = False
+            self._polled_at = time.time()
+            if value is not None and (
+                self.value is None or value > self.value
+            ):
+                self.value = value
+            self._condition.notify_all()
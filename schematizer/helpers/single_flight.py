@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import threading
+from collections import namedtuple
+
+
+SingleFlightStats = namedtuple(
+    'SingleFlightStats',
+    ['leader_calls', 'coalesced_calls', 'in_flight']
+)
+
+
+class _Call(object):
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.succeeded = False
+        self.waiters = 0
+
+
+class SingleFlight(object):
+    """Thread-safe coalescer of concurrent calls with the same key. The first
+    caller of a key, the leader, runs the function, and the callers that
+    arrive with the same key while the leader is still running wait for it
+    and get the same result instead of running the function again. If the
+    leader fails, each waiting caller runs the function by itself, so the
+    exceptions are never shared across threads. The key is forgotten once
+    the leader finishes, so the results are not cached.
+
+    Note that the result is shared by the leader and all the waiting callers,
+    so the callers should treat the result as read-only.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._leader_calls = 0
+        self._coalesced_calls = 0
+
+    def do(self, key, func, timeout=None, before_share=None):
+        """Run `func` unless a call of the same key is in flight, in which
+        case wait for that call and return its result.
+
+        :param timeout: seconds to wait for the in-flight call. If it does
+            not finish in time, `func` is run by this caller as well. None
+            waits until the in-flight call finishes.
+        :param before_share: function the leader calls with the result of
+            `func` before the result is given to the waiting callers. It is
+            only called if any caller waits for the result, and the result
+            is not shared if it fails.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _Call()
+                self._calls[key] = call
+                self._leader_calls += 1
+            else:
+                call.waiters += 1
+                self._coalesced_calls += 1
+
+        if is_leader:
+            return self._run_leader_call(key, call, func, before_share)
+
+        if call.done.wait(timeout) and call.succeeded:
+            return call.result
+        return func()
+
+    def _run_leader_call(self, key, call, func, before_share):
+        try:
+            result = func()
+            # Once the call is forgotten, no more callers can wait for it,
+            # so whether its result is shared is settled.
+            if self._forget_call(key, call) and before_share:
+                before_share(result)
+            call.result = result
+            call.succeeded = True
+            return result
+        finally:
+            self._forget_call(key, call)
+            call.done.set()
+
+    def _forget_call(self, key, call):
+        """Forget the given in-flight call of the key if it is not forgotten
+        yet, and return whether any caller waits for it.
+        """
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+            return call.waiters > 0
+
+    @property
+    def stats(self):
+        with self._lock:
+            return SingleFlightStats(
+                leader_calls=self._leader_calls,
+                coalesced_calls=self._coalesced_calls,
+                in_flight=len(self._calls)
+            )
@@ -0,0 +1,410 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+This module exports the schema catalog, i.e. the namespaces, sources, topics,
+Avro schemas, and their meta attribute mappings, as a snapshot that clients
+can bootstrap from with a single download.
+
+A snapshot is a gzip-compressed file of json lines. The first line is the
+header, and each following line is the record of one entity, ordered by the
+record type in the order of `RECORD_TYPES` and then by the entity id. The
+header holds the position of the snapshot: the max id of each record type
+when the snapshot was taken, and the time since which updated entities are
+exported again by the next delta.
+
+A delta from a position contains the entities created after the position,
+i.e. with greater ids, and the entities updated since the position, so a
+client applies it to the snapshot of that position by replacing the records
+of the same type and id. The records of the types in the `complete_types` of
+the header are all included, because these entities can be deleted; the
+records of these types in the snapshot are replaced as a whole. Applying a
+delta to a snapshot gives the snapshot of the position of the delta, which
+is how new snapshots are built incrementally, see `merge_snapshot`.
+
+Snapshots and deltas are read in a single transaction, which should be
+read-only, so that all the records are from the same point in time.
+"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import datetime
+import gzip
+import time
+from collections import namedtuple
+from functools import partial
+
+import simplejson
+from sqlalchemy import func
+from sqlalchemy import or_
+
+from schematizer import models
+from schematizer.helpers.formatting import _format_datetime
+from schematizer.logic import catalog_version
+from schematizer.models.database import session
+from schematizer.models.meta_attribute_mapping_store import (
+    MetaAttributeMappingStore
+)
+from schematizer.models.schema_meta_attribute_mapping import (
+    SchemaMetaAttributeMapping
+)
+
+
+FORMAT_VERSION = 1
+
+# The entities updated this many seconds before a snapshot is taken are
+# exported again by the deltas from the snapshot, so that the updates which
+# were not committed yet when the snapshot was taken are not missed.
+UPDATE_MARGIN_SECONDS = 60
+
+HEADER_TYPE = 'header'
+
+
+_RecordType = namedtuple(
+    '_RecordType',
+    ['name', 'model', 'id_field', 'get_record', 'build_query',
+     'get_updated_filter']
+)
+
+
+def _get_namespace_record(namespace):
+    return {
+        'namespace_id': namespace.id,
+        'name': namespace.name,
+        'created_at': _format_datetime(namespace.created_at),
+        'updated_at': _format_datetime(namespace.updated_at)
+    }
+
+
+def _build_source_query():
+    return session.query(
+        models.Source,
+        models.SourceCategory.category
+    ).outerjoin(
+        models.SourceCategory
+    )
+
+
+def _get_source_updated_filter(updated_since):
+    # Changing the category of a source only updates its category row.
+    return or_(
+        _get_time_column_filter(models.Source, updated_since),
+        _get_time_column_filter(models.SourceCategory, updated_since)
+    )
+
+
+def _get_source_record(row):
+    source, category = row
+    return {
+        'source_id': source.id,
+        'namespace_id': source.namespace_id,
+        'name': source.name,
+        'owner_email': source.owner_email,
+        'category': category,
+        'created_at': _format_datetime(source.created_at),
+        'updated_at': _format_datetime(source.updated_at)
+    }
+
+
+def _get_topic_record(topic):
+    return {
+        'topic_id': topic.id,
+        'source_id': topic.source_id,
+        'name': topic.name,
+        'contains_pii': topic.contains_pii,
+        'cluster_type': topic.cluster_type,
+        'primary_keys': topic.primary_keys,
+        'created_at': _format_datetime(topic.created_at),
+        'updated_at': _format_datetime(topic.updated_at)
+    }
+
+
+def _get_schema_record(avro_schema):
+    return {
+        'schema_id': avro_schema.id,
+        'topic_id': avro_schema.topic_id,
+        'schema': avro_schema.avro_schema,
+        'status': avro_schema.status,
+        'base_schema_id': avro_schema.base_schema_id,
+        'created_at': _format_datetime(avro_schema.created_at),
+        'updated_at': _format_datetime(avro_schema.updated_at)
+    }
+
+
+def _get_schema_meta_attribute_mapping_record(mapping):
+    return {
+        'id': mapping.id,
+        'schema_id': mapping.schema_id,
+        'meta_attr_schema_id': mapping.meta_attr_schema_id
+    }
+
+
+def _get_meta_attribute_mapping_record(mapping):
+    return {
+        'id': mapping.id,
+        'entity_type': mapping.entity_type,
+        'entity_id': mapping.entity_id,
+        'meta_attr_schema_id': mapping.meta_attr_schema_id
+    }
+
+
+def _get_time_column_filter(model, updated_since):
+    return model.updated_at >= datetime.datetime.utcfromtimestamp(
+        updated_since
+    )
+
+
+def _get_timestamp_column_filter(model, updated_since):
+    return model.updated_at >= updated_since
+
+
+_RECORD_TYPES = (
+    _RecordType(
+        name='namespace',
+        model=models.Namespace,
+        id_field='namespace_id',
+        get_record=_get_namespace_record,
+        build_query=None,
+        get_updated_filter=partial(_get_time_column_filter, models.Namespace)
+    ),
+    _RecordType(
+        name='source',
+        model=models.Source,
+        id_field='source_id',
+        get_record=_get_source_record,
+        build_query=_build_source_query,
+        get_updated_filter=_get_source_updated_filter
+    ),
+    _RecordType(
+        name='topic',
+        model=models.Topic,
+        id_field='topic_id',
+        get_record=_get_topic_record,
+        build_query=None,
+        get_updated_filter=partial(_get_time_column_filter, models.Topic)
+    ),
+    _RecordType(
+        name='schema',
+        model=models.AvroSchema,
+        id_field='schema_id',
+        get_record=_get_schema_record,
+        build_query=None,
+        get_updated_filter=partial(
+            _get_time_column_filter,
+            models.AvroSchema
+        )
+    ),
+    _RecordType(
+        name='schema_meta_attribute_mapping',
+        model=SchemaMetaAttributeMapping,
+        id_field='id',
+        get_record=_get_schema_meta_attribute_mapping_record,
+        build_query=None,
+        get_updated_filter=partial(
+            _get_timestamp_column_filter,
+            SchemaMetaAttributeMapping
+        )
+    ),
+    # The meta attribute mappings of the namespaces and sources can be
+    # deleted, and there are few of them, so the deltas always include all
+    # of them, i.e. they have no updated filter.
+    _RecordType(
+        name='meta_attribute_mapping',
+        model=MetaAttributeMappingStore,
+        id_field='id',
+        get_record=_get_meta_attribute_mapping_record,
+        build_query=None,
+        get_updated_filter=None
+    ),
+)
+
+RECORD_TYPES = tuple(record_type.name for record_type in _RECORD_TYPES)
+
+
+def get_current_position():
+    """Get the position of a snapshot taken now, i.e. the max id of each
+    record type, and the time since which the updated entities are exported
+    again by the next delta.
+    """
+    position = {
+        'updated_since': int(time.time()) - UPDATE_MARGIN_SECONDS
+    }
+    for record_type in _RECORD_TYPES:
+        position[record_type.name] = session.query(
+            func.max(record_type.model.id)
+        ).scalar() or 0
+    return position
+
+
+def validate_position(position):
+    """Validate the given snapshot position, such as the one decoded from a
+    client request.
+
+    :raises ValueError: the position is not a valid snapshot position.
+    """
+    keys = set(RECORD_TYPES) | {'updated_since'}
+    if not isinstance(position, dict) or set(position) != keys or not all(
+        isinstance(value, (int, long)) for value in position.itervalues()
+    ):
+        raise ValueError("Invalid snapshot position: {}".format(position))
+
+
+def iter_snapshot_records(since=None, batch_size=1000):
+    """Generate the header and the records of the snapshot of the current
+    catalog, or of the delta from the given position.
+
+    Args:
+        since (Optional[dict]): position of the snapshot the delta applies
+            to. Default it generates a full snapshot.
+        batch_size (Optional[int]): number of entities queried at a time.
+    """
+    if since is not None:
+        validate_position(since)
+    position = get_current_position()
+    yield {
+        'type': HEADER_TYPE,
+        'format_version': FORMAT_VERSION,
+        'is_delta': since is not None,
+        'position': position,
+        'base_position': since,
+        'complete_types': [
+            record_type.name for record_type in _RECORD_TYPES
+            if since is None or record_type.get_updated_filter is None
+        ],
+        'catalog_version': catalog_version.get_catalog_version(),
+        'created_at': _format_datetime(datetime.datetime.utcnow())
+    }
+    for record_type in _RECORD_TYPES:
+        for record in _iter_records(record_type, position, since, batch_size):
+            yield record
+
+
+def _iter_records(record_type, position, since, batch_size):
+    if record_type.build_query:
+        qry = record_type.build_query()
+    else:
+        qry = session.query(record_type.model)
+    qry = qry.filter(
+        record_type.model.id <= position[record_type.name]
+    )
+    if since is not None and record_type.get_updated_filter:
+        qry = qry.filter(
+            or_(
+                record_type.model.id > since[record_type.name],
+                record_type.get_updated_filter(since['updated_since'])
+            )
+        )
+    qry = qry.order_by(record_type.model.id)
+
+    last_id = 0
+    while True:
+        rows = qry.filter(
+            record_type.model.id > last_id
+        ).limit(
+            batch_size
+        ).all()
+        for row in rows:
+            record = record_type.get_record(row)
+            record['type'] = record_type.name
+            yield record
+        if len(rows) < batch_size:
+            return
+        last_id = record[record_type.id_field]
+
+
+def write_snapshot(fileobj, records):
+    """Write the given snapshot records, the header first, into the given
+    binary file object as gzip-compressed json lines.
+    """
+    # The mtime is fixed, so that the same records give the same bytes.
+    with gzip.GzipFile(fileobj=fileobj, mode='wb', mtime=0) as gzip_file:
+        for record in records:
+            gzip_file.write(simplejson.dumps(record).encode('utf-8'))
+            gzip_file.write(b'\n')
+
+
+def read_snapshot(fileobj):
+    """Generate the records, the header first, of the snapshot or delta in
+    the given binary file object written by `write_snapshot`.
+
+    :raises ValueError: the file is not a snapshot of the supported format.
+    """
+    with gzip.GzipFile(fileobj=fileobj, mode='rb') as gzip_file:
+        header = simplejson.loads(gzip_file.readline() or 'null')
+        if (not isinstance(header, dict) or
+                header.get('type') != HEADER_TYPE or
+                header.get('format_version') != FORMAT_VERSION):
+            raise ValueError("Unsupported snapshot header: {}".format(header))
+        yield header
+        for line in gzip_file:
+            yield simplejson.loads(line)
+
+
+def merge_snapshot(base_records, delta_records):
+    """Apply the delta to the full snapshot it is taken from, and generate
+    the records of the full snapshot at the position of the delta. Both the
+    snapshot and the delta are only iterated once, so neither of them is
+    loaded into memory.
+
+    :raises ValueError: the base is not a full snapshot, or the delta is not
+        taken from the position of the base.
+    """
+    base_records = iter(base_records)
+    delta_records = iter(delta_records)
+    base_header = next(base_records)
+    delta_header = next(delta_records)
+    if base_header['is_delta']:
+        raise ValueError("The base of the merge must be a full snapshot.")
+    if delta_header['base_position'] != base_header['position']:
+        raise ValueError(
+            "The delta is not taken from the position of the snapshot."
+        )
+
+    yield dict(
+        delta_header,
+        is_delta=False,
+        base_position=None,
+        complete_types=list(RECORD_TYPES)
+    )
+    complete_types = set(delta_header['complete_types'])
+    base_records = (
+        record for record in base_records
+        if record['type'] not in complete_types
+    )
+    for record in _merge_sorted_records(base_records, delta_records):
+        yield record
+
+
+def _get_record_key(record):
+    record_type = _RECORD_TYPES[RECORD_TYPES.index(record['type'])]
+    return RECORD_TYPES.index(record['type']), record[record_type.id_field]
+
+
+def _merge_sorted_records(base_records, delta_records):
+    """Merge the records sorted by their keys. The delta record replaces the
+    base record of the same key.
+    """
+    base_record = next(base_records, None)
+    for delta_record in delta_records:
+        delta_key = _get_record_key(delta_record)
+        while (base_record is not None and
+                _get_record_key(base_record) <= delta_key):
+            if _get_record_key(base_record) < delta_key:
+                yield base_record
+            base_record = next(base_records, None)
+        yield delta_record
+    while base_record is not None:
+        yield base_record
+        base_record = next(base_records, None)
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+This module keeps the version of the schema catalog, a counter in the single
+row of the `catalog_version` table. Every write that changes the topics, the
+schemas, their notes, meta attribute mappings, or source categories marks its
+session transaction, and once that transaction is committed, the version is
+bumped in a separate short transaction. The row lock of the counter is
+therefore held only for the bump itself rather than for the whole write, so
+the writes of different sources are not serialized by it.
+
+Each process remembers the version it last saw. Before handling a request,
+`sync_local_caches` reads the version, at most once every
+`catalog_version_check_interval_seconds`, and clears the caches kept in the
+process if the version has changed, so the writes handled by other processes
+are picked up after one primary key read rather than after the cache TTLs.
+The version is read on its own connection, so the read neither starts the
+snapshot of the request transaction nor is affected by it, see
+:mod:schematizer.logic.source_lock.
+"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy import exc
+from sqlalchemy import select
+from sqlalchemy import update
+
+from schematizer.config import get_config
+from schematizer.config import log
+from schematizer.environment_configs import FORCE_AVOID_INTERNAL_PACKAGES
+from schematizer.helpers.decorators import memoized
+from schematizer.logic import lookup_cache
+from schematizer.logic import schema_response_cache
+from schematizer.models.catalog_version import CatalogVersion
+from schematizer.models.database import reading_from_master
+from schematizer.models.database import session
+
+
+try:
+    # TODO(DATAPIPE-1506|abrar): Currently we have
+    # force_avoid_internal_packages as a means of simulating an absence
+    # of a yelp's internal package. And all references
+    # of force_avoid_internal_packages have to be removed from
+    # schematizer after we have completely ready for open source.
+    if FORCE_AVOID_INTERNAL_PACKAGES:
+        raise ImportError
+    from yelp_conn.mysqldb import IntegrityError
+except ImportError:
+    from sqlalchemy.exc import IntegrityError
+
+
+_CATALOG_CHANGED_INFO_KEY = 'schematizer_catalog_changed'
+
+
+def get_catalog_version():
+    """Get the current version of the schema catalog, which is 0 if the
+    catalog has never been changed.
+    """
+    version = session.query(
+        CatalogVersion.version
+    ).filter(
+        CatalogVersion.id == CatalogVersion.CATALOG_VERSION_ID
+    ).scalar()
+    return version or 0
+
+
+def bump_catalog_version():
+    """Increase the version of the schema catalog by one once the current
+    session transaction is committed. It should be called in the transaction
+    of each write that changes the catalog. The version is not changed if the
+    transaction is rolled back.
+    """
+    session.info[_CATALOG_CHANGED_INFO_KEY] = True
+
+
+def _get_master_bind(current_session):
+    # An update statement makes the session bind to the master.
+    return current_session.get_bind(
+        mapper=CatalogVersion.__mapper__,
+        clause=update(CatalogVersion.__table__)
+    )
+
+
+def _increase_catalog_version(connection):
+    return connection.execute(
+        update(
+            CatalogVersion.__table__
+        ).where(
+            CatalogVersion.__table__.c.id == CatalogVersion.CATALOG_VERSION_ID
+        ).values(
+            version=CatalogVersion.__table__.c.version + 1
+        )
+    ).rowcount
+
+
+def _commit_catalog_version_bump(bind):
+    with bind.begin() as connection:
+        if _increase_catalog_version(connection):
+            return
+    try:
+        with bind.begin() as connection:
+            connection.execute(CatalogVersion.__table__.insert().values(
+                id=CatalogVersion.CATALOG_VERSION_ID,
+                version=1
+            ))
+    except (IntegrityError, exc.IntegrityError):
+        # Another process has created the row concurrently.
+        with bind.begin() as connection:
+            _increase_catalog_version(connection)
+
+
+def _bump_after_commit(current_session):
+    # Releasing a savepoint also fires `after_commit`; only the commit of the
+    # outermost transaction makes the changes visible to other processes.
+    if current_session.transaction.nested:
+        return
+    if not current_session.info.pop(_CATALOG_CHANGED_INFO_KEY, False):
+        return
+    try:
+        _commit_catalog_version_bump(_get_master_bind(current_session))
+    except Exception:
+        # The write has been committed already. The other processes pick it
+        # up once their caches expire.
+        log.exception('Failed to bump the catalog version.')
+
+
+def _discard_uncommitted_bump(current_session, transaction):
+    # The flag of a committed transaction has been popped by
+    # `_bump_after_commit`, so it is only left when it is rolled back.
+    if current_session.transaction is None:
+        current_session.info.pop(_CATALOG_CHANGED_INFO_KEY, None)
+
+
+def _read_catalog_version(bind):
+    with bind.connect() as connection:
+        version = connection.execute(
+            select([
+                CatalogVersion.__table__.c.version
+            ]).where(
+                CatalogVersion.__table__.c.id ==
+                CatalogVersion.CATALOG_VERSION_ID
+            )
+        ).scalar()
+    return version or 0
+
+
+event.listen(session, 'after_commit', _bump_after_commit)
+event.listen(session, 'after_transaction_end', _discard_uncommitted_bump)
+
+
+class CatalogVersionTracker(object):
+    """Tracks the catalog version last seen by the current process.
+
+    Args:
+        check_interval_seconds (int): minimum number of seconds between two
+            reads of the catalog version. 0 reads it on every check.
+    """
+
+    def __init__(self, check_interval_seconds):
+        self.check_interval_seconds = check_interval_seconds
+        self.version = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def check(self):
+        """Read the catalog version unless it has been read within the check
+        interval.
+
+        :return: True if the version has changed since the last read.
+        """
+        with self._lock:
+            now = time.time()
+            if (self._checked_at is not None and
+                    now - self._checked_at < self.check_interval_seconds):
+                return False
+            # The caches are filled from the master, so the version is read
+            # from the master too. It is read on its own connection rather
+            # than in the session transaction, which may not have read
+            # anything yet.
+            with reading_from_master():
+                bind = session().get_bind(mapper=CatalogVersion.__mapper__)
+            version = _read_catalog_version(bind)
+            self._checked_at = now
+            has_changed = (
+                self.version is not None and version != self.version
+            )
+            self.version = version
+            return has_changed
+
+
+@memoized
+def _get_tracker():
+    return CatalogVersionTracker(
+        get_config().catalog_version_check_interval_seconds
+    )
+
+
+def sync_local_caches():
+    """Clear the caches kept in the current process if the catalog version
+    has changed since the last check.
+    """
+    if _get_tracker().check():
+        schema_response_cache.clear_schema_response_cache()
+        lookup_cache.clear_lookup_cache()
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+This module stores the compatibility verdicts of (writer schema, reader schema)
+pairs. Checking the compatibility requires resolving the two schemas, which is
+expensive for topics that have many schema versions, but the verdict of two
+schemas never changes because the schema json is immutable once registered.
+
+The verdicts are persisted in the `schema_compatibility_verdict` table, keyed
+by the fingerprints of the writer schema and the reader schema, and the most
+recently used verdicts are also kept in a process-wide in-memory cache in front
+of the table.
+
+Only the schema registrations, which write to the master anyway, store new
+verdicts into the table. The compatibility checks that do not register
+anything, such as the compatibility probes, only read the table, so they
+neither write in a read-only request nor fail when they read from a replica.
+"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from sqlalchemy import exc
+
+from schematizer.config import get_config
+from schematizer.environment_configs import FORCE_AVOID_INTERNAL_PACKAGES
+from schematizer.helpers.avro_schema_cache import get_schema_fingerprint
+from schematizer.helpers.decorators import memoized
+from schematizer.helpers.lru_cache import LRUCache
+from schematizer.logic.schema_resolution import SchemaCompatibilityValidator
+from schematizer.models.database import session
+from schematizer.models.schema_compatibility_verdict import (
+    SchemaCompatibilityVerdict
+)
+
+
+try:
+    # TODO(DATAPIPE-1506|abrar): Currently we have
+    # force_avoid_internal_packages as a means of simulating an absence
+    # of a yelp's internal package. And all references
+    # of force_avoid_internal_packages have to be removed from
+    # schematizer after we have completely ready for open source.
+    if FORCE_AVOID_INTERNAL_PACKAGES:
+        raise ImportError
+    from yelp_conn.mysqldb import IntegrityError
+except ImportError:
+    from sqlalchemy.exc import IntegrityError
+
+
+@memoized
+def _get_verdict_cache():
+    return LRUCache(max_size=get_config().compatibility_verdict_cache_size)
+
+
+def is_backward_compatible(
+    writer_schema_json,
+    reader_schema_json,
+    store_verdict=False
+):
+    """Whether the data serialized using specified writer_schema_json can be
+    deserialized using specified reader_schema_json. The verdict is looked up
+    from the in-memory cache first, then the verdict table, and it is only
+    computed if neither of them has it.
+
+    Args:
+        store_verdict (Optional[bool]): whether to store the verdict into the
+            verdict table if it is not there yet, which writes to the master
+            in the current session transaction. Default it only reads the
+            table, and the verdict is kept in the in-memory cache only.
+    """
+    key = (
+        get_schema_fingerprint(writer_schema_json),
+        get_schema_fingerprint(reader_schema_json)
+    )
+    verdict_cache = _get_verdict_cache()
+    cached_verdict = verdict_cache.get(key)
+    if cached_verdict is not None:
+        is_compatible, is_stored = cached_verdict
+        if store_verdict and not is_stored:
+            _create_verdict_if_not_exist(key[0], key[1], is_compatible)
+            verdict_cache.set(key, (is_compatible, True))
+        return is_compatible
+
+    verdict = SchemaCompatibilityVerdict.get_by_fingerprints(*key)
+    if verdict:
+        is_compatible = verdict.is_compatible
+        is_stored = True
+    else:
+        is_compatible = bool(
+            SchemaCompatibilityValidator.is_backward_compatible(
+                writer_schema_json,
+                reader_schema_json
+            )
+        )
+        is_stored = store_verdict
+        if store_verdict:
+            _create_verdict_if_not_exist(key[0], key[1], is_compatible)
+
+    # The cache also remembers whether the verdict is in the table, so that a
+    # verdict computed by a check that does not store it is still stored by
+    # the next registration that needs it.
+    verdict_cache.set(key, (is_compatible, is_stored))
+    return is_compatible
+
+
+def _create_verdict_if_not_exist(
+    writer_fingerprint,
+    reader_fingerprint,
+    is_compatible
+):
+    try:
+        with session.begin_nested():
+            session.add(SchemaCompatibilityVerdict(
+                writer_fingerprint=writer_fingerprint,
+                reader_fingerprint=reader_fingerprint,
+                is_compatible=is_compatible
+            ))
+    except (IntegrityError, exc.IntegrityError):
+        # Ignore this error due to another request storing the same verdict
+        # concurrently; the verdict of the same schema pair is always the same.
+        pass
+
+
+def get_verdict_cache_stats():
+    """Get the :class:schematizer.helpers.lru_cache.CacheStats of the
+    in-memory compatibility verdict cache.
+    """
+    return _get_verdict_cache().stats
+
+
+def clear_verdict_cache():
+    _get_verdict_cache().clear()
@@ -22,6 +22,8 @@ from sqlalchemy import and_
 from sqlalchemy import or_
 
 from schematizer import models
+from schematizer.logic import catalog_version
+from schematizer.logic import schema_response_cache
 from schematizer.models.database import session
 
 
@@ -82,6 +84,12 @@ def get_notes_by_schemas_and_elements(schemas, elements):
 
 
 def update_note(id, note_text, last_updated_by):
+    note = get_note_by_id(id)
+    if note is not None:
+        _invalidate_caches_of_note(
+            note.reference_type,
+            note.reference_id
+        )
     return session.query(
         models.Note
     ).filter(
@@ -104,9 +112,16 @@ def create_note(reference_type, reference_id, note_text, last_updated_by):
     )
     session.add(note)
     session.flush()
+    _invalidate_caches_of_note(reference_type, reference_id)
     return note
 
 
+def _invalidate_caches_of_note(reference_type, reference_id):
+    catalog_version.bump_catalog_version()
+    if reference_type == models.ReferenceTypeEnum.SCHEMA:
+        schema_response_cache.invalidate_schema_response(reference_id)
+
+
 def get_distinct_categories():
     categories = session.query(models.SourceCategory.category).distinct().all()
     # categories is a list of single item lists. Return a single layered list.
@@ -143,6 +158,11 @@ def get_source_category_by_source_id(source_id):
 
 
 def update_source_category(source_id, category):
+    # The schema responses contain the category of their sources, and the
+    # schemas of a source are not tracked by the cache, so all the cached
+    # responses are dropped. Categories rarely change.
+    schema_response_cache.clear_schema_response_cache()
+    catalog_version.bump_catalog_version()
     return session.query(
         models.SourceCategory
     ).filter(
@@ -153,6 +173,8 @@ def update_source_category(source_id, category):
 
 
 def create_source_category(source_id, category):
+    schema_response_cache.clear_schema_response_cache()
+    catalog_version.bump_catalog_version()
     source_category = models.SourceCategory(
         source_id=source_id,
         category=category
@@ -163,6 +185,8 @@ def create_source_category(source_id, category):
 
 
 def delete_source_category_by_source_id(source_id):
+    schema_response_cache.clear_schema_response_cache()
+    catalog_version.bump_catalog_version()
     return session.query(
         models.SourceCategory
     ).filter(
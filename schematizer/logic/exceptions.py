@@ -23,3 +23,7 @@ class EntityNotFoundException(Exception):
 
 class IncompatibleSchemaException(Exception):
     pass
+
+
+class LockTimeoutException(Exception):
+    pass
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+This module contains the loading profiles of the entities returned by the
+repository functions. A loading profile is a list of SQLAlchemy loader
+options that loads the related entities together with the queried entities,
+so that building the API responses of a page of entities does not issue
+queries for each entity.
+
+The options refer to the relationships by name because some of them are
+backrefs, which do not exist until the mappers are configured.
+
+The profiles of the responses projected by the `fields` query parameter only
+load the relationships of the selected fields, see
+:mod:schematizer.api.fields.
+"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from sqlalchemy.orm import defer
+from sqlalchemy.orm import joinedload
+
+
+# Loads the entities `responses_v1.get_schema_response_from_avro_schema`
+# accesses through `models.AvroSchema.topic`.
+SCHEMA_RESPONSE = (
+    joinedload('topic').joinedload('source').joinedload('namespace'),
+    joinedload('topic').joinedload('source').joinedload('category'),
+)
+
+# Loads the entities `responses_v1.get_topic_response_from_topic` accesses
+# through `models.Topic.source`.
+TOPIC_RESPONSE = (
+    joinedload('source').joinedload('namespace'),
+    joinedload('source').joinedload('category'),
+)
+
+
+def get_schema_response_profile(fields=None):
+    """Get the loading profile of the schema responses that only have the
+    given :class:schematizer.api.fields.FieldSelection. The schema json is
+    deferred if neither the `schema` nor the `primary_keys` field is
+    selected.
+    """
+    if fields is None:
+        return SCHEMA_RESPONSE
+    options = []
+    if not (fields.includes('schema') or fields.includes('primary_keys')):
+        options.append(defer('avro_schema'))
+    if fields.includes('topic'):
+        options.extend(_get_topic_options(
+            joinedload('topic'),
+            fields.get('topic')
+        ))
+    return tuple(options)
+
+
+def get_topic_response_profile(fields=None):
+    """Get the loading profile of the topic responses that only have the
+    given :class:schematizer.api.fields.FieldSelection.
+    """
+    if fields is None:
+        return TOPIC_RESPONSE
+    return tuple(_get_topic_options(None, fields))
+
+
+def _get_topic_options(topic_loader, fields):
+    if fields is not None and not fields.includes('source'):
+        return [topic_loader] if topic_loader is not None else []
+    source_fields = fields.get('source') if fields is not None else None
+    source_loader = (
+        joinedload('source') if topic_loader is None
+        else topic_loader.joinedload('source')
+    )
+    options = [
+        source_loader.joinedload(relationship)
+        for relationship in ('namespace', 'category')
+        if source_fields is None or source_fields.includes(relationship)
+    ]
+    return options or [source_loader]
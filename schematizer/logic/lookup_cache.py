@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+This module is the read-through cache of the most frequently called lookups
+of the repository, such as the topic of a given name and the latest schema
+of a topic. The cached entities are keyed by what they are looked up by, and
+the writes that change the result of a lookup invalidate its key explicitly.
+A key is invalidated both when it is written and once the write transaction
+is committed, since a concurrent read may fill the cache with the entity as
+it was before the commit in between. The cached entities also expire after
+`lookup_cache_ttl_seconds`, which bounds how long a lookup can be stale when
+an invalidation is missed.
+
+The cache is kept in a backend of :mod:schematizer.helpers.cache_backends
+chosen by `lookup_cache_backend`: `lru` keeps it in the current process,
+where it is cleared when the catalog version changes (see
+:mod:schematizer.logic.catalog_version), and `memcache` shares it, and its
+invalidations, among all the processes that use the memcached server at
+`lookup_cache_memcache_server`.
+
+The entities are cached as the json of their column values, and only the
+entities of the models in `_CACHEABLE_MODELS` are cached, so the cached data
+never decides which code runs when it is read back. A cached entity is
+rebuilt explicitly and added into the current session without querying the
+database, and its relationships are lazy-loaded as usual.
+"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import simplejson
+from sqlalchemy import event
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.types import TypeDecorator
+
+from schematizer import models
+from schematizer.config import get_config
+from schematizer.config import log
+from schematizer.helpers.cache_backends import LRUCacheBackend
+from schematizer.helpers.cache_backends import MemcacheBackend
+from schematizer.helpers.decorators import memoized
+from schematizer.models.database import reading_from_master
+from schematizer.models.database import session
+
+
+# The models whose entities can be cached, keyed by the model names stored
+# with the cached values.
+_CACHEABLE_MODELS = dict(
+    (model.__name__, model) for model in (models.Topic, models.AvroSchema)
+)
+
+_INVALIDATED_KEYS_INFO_KEY = 'schematizer_lookup_cache_invalidated_keys'
+
+
+@memoized
+def _get_backend():
+    config = get_config()
+    if config.lookup_cache_backend == 'lru':
+        return LRUCacheBackend(
+            max_size=config.lookup_cache_size,
+            ttl_seconds=config.lookup_cache_ttl_seconds
+        )
+    if config.lookup_cache_backend == 'memcache':
+        host, _, port = config.lookup_cache_memcache_server.rpartition(':')
+        return MemcacheBackend(
+            host=host,
+            port=int(port),
+            ttl_seconds=config.lookup_cache_ttl_seconds,
+            key_prefix='schematizer:lookup:json'
+        )
+    raise ValueError("Unknown lookup cache backend: {}".format(
+        config.lookup_cache_backend
+    ))
+
+
+def get_topic_key(topic_name):
+    return 'topic:{}'.format(topic_name)
+
+
+def get_latest_schema_key(topic_id):
+    return 'latest_schema:{}'.format(topic_id)
+
+
+def get_or_load(key, load_func):
+    """Get the entity of the given key from the cache. If it is not cached,
+    the entity is loaded by `load_func` from the master database and then
+    added into the cache. A None entity is not cached.
+
+    The keys invalidated by the current session transaction are neither read
+    from nor added into the cache until the transaction ends, because the
+    session sees its own uncommitted writes.
+    """
+    if key in session.info.get(_INVALIDATED_KEYS_INFO_KEY, ()):
+        with reading_from_master():
+            return load_func()
+
+    backend = _get_backend()
+    data = backend.get(key)
+    if data is not None:
+        entity = _deserialize(data)
+        if entity is not None:
+            return entity
+
+    with reading_from_master():
+        entity = load_func()
+    if entity is not None:
+        backend.set(key, _serialize(entity))
+    return entity
+
+
+def invalidate(*keys):
+    """Invalidate the given keys right away and again once the current
+    session transaction is committed. It should be called in the transaction
+    of each write that changes the result of the lookups of the keys.
+    """
+    session.info.setdefault(_INVALIDATED_KEYS_INFO_KEY, set()).update(keys)
+    _delete_keys(keys)
+
+
+def _delete_keys(keys):
+    backend = _get_backend()
+    for key in keys:
+        backend.delete(key)
+
+
+def _invalidate_after_commit(current_session):
+    # Releasing a savepoint also fires `after_commit`; only the commit of the
+    # outermost transaction makes the changes visible to other processes.
+    if current_session.transaction.nested:
+        return
+    keys = current_session.info.pop(_INVALIDATED_KEYS_INFO_KEY, None)
+    if keys:
+        _delete_keys(keys)
+
+
+def _discard_uncommitted_invalidations(current_session, transaction):
+    # The keys of a committed transaction have been popped by
+    # `_invalidate_after_commit`, so they are only left when it is rolled
+    # back, in which case the cached entities are still up to date.
+    if current_session.transaction is None:
+        current_session.info.pop(_INVALIDATED_KEYS_INFO_KEY, None)
+
+
+def get_lookup_cache_stats():
+    """Get the :class:schematizer.helpers.lru_cache.CacheStats of the lookup
+    cache.
+    """
+    return _get_backend().stats
+
+
+def clear_lookup_cache():
+    """Clear the lookup cache if it is kept in the current process. The shared
+    backends are invalidated by the writes explicitly and are left as is.
+    """
+    backend = _get_backend()
+    if isinstance(backend, LRUCacheBackend):
+        backend.clear()
+
+
+def _serialize(entity):
+    model_name = entity.__class__.__name__
+    if _CACHEABLE_MODELS.get(model_name) is not entity.__class__:
+        raise ValueError("{} entities cannot be cached.".format(model_name))
+
+    values = {}
+    for attr in inspect(entity).mapper.column_attrs:
+        value = getattr(entity, attr.key)
+        column_type = attr.columns[0].type
+        if isinstance(column_type, TypeDecorator):
+            # E.g. the time columns are cached as their integer timestamps.
+            value = column_type.process_bind_param(value, None)
+        values[attr.key] = value
+    return simplejson.dumps({'model': model_name, 'values': values})
+
+
+def _deserialize(data):
+    try:
+        cached = simplejson.loads(data)
+        entity_cls = _CACHEABLE_MODELS[cached['model']]
+        entity = entity_cls()
+        for attr in inspect(entity_cls).column_attrs:
+            value = cached['values'][attr.key]
+            column_type = attr.columns[0].type
+            if isinstance(column_type, TypeDecorator):
+                value = column_type.process_result_value(value, None)
+            # Same as a query, the values are set without running the
+            # validators of the model, e.g. the one of `avro_schema`.
+            set_committed_value(entity, attr.key, value)
+    except (ValueError, TypeError, KeyError):
+        log.exception("Failed to deserialize the cached entity.")
+        return None
+
+    # The entity becomes a detached entity as if it were loaded by a query,
+    # which can be merged into the session without loading it.
+    make_transient_to_detached(entity)
+    existing_entity = session.identity_map.get(
+        inspect(entity).mapper.identity_key_from_instance(entity)
+    )
+    if existing_entity is not None:
+        # The entity in the session may have changes that must not be
+        # overwritten by the cached values.
+        return existing_entity
+    return session.merge(entity, load=False)
+
+
+event.listen(session, 'after_commit', _invalidate_after_commit)
+event.listen(
+    session,
+    'after_transaction_end',
+    _discard_uncommitted_invalidations
+)
@@ -21,6 +21,7 @@ from sqlalchemy import exc
 from sqlalchemy import or_
 
 from schematizer.environment_configs import FORCE_AVOID_INTERNAL_PACKAGES
+from schematizer.logic import catalog_version
 from schematizer.logic.validators import verify_entity_exists
 from schematizer.models import AvroSchema
 from schematizer.models import Namespace
@@ -57,6 +58,8 @@ def register_meta_attribute_for_entity(
                 meta_attr_schema_id=meta_attr_schema_id
             )
             session.add(new_mapping)
+            session.flush()
+            catalog_version.bump_catalog_version()
     except (IntegrityError, exc.IntegrityError):
         # Ignore this error due to trying to create a duplicate mapping
         new_mapping = MetaAttributeMappingStore.get_by_mapping(
@@ -87,6 +90,8 @@ def delete_meta_attribute_mapping_for_entity(
         MetaAttributeMappingStore.entity_id == entity_id,
         MetaAttributeMappingStore.meta_attr_schema_id == meta_attr_schema_id
     ).delete()
+    if mapping_to_delete is not None:
+        catalog_version.bump_catalog_version()
 
     return mapping_to_delete
 
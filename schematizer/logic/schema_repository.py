@@ -16,22 +16,39 @@
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
+import itertools
 import re
 import uuid
+from collections import namedtuple
+from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
 
-import simplejson
+from data_pipeline_avro_util.data_pipeline.avro_meta_data \
+    import AvroMetaDataKeys
+from sqlalchemy import and_
 from sqlalchemy import desc
 from sqlalchemy import exc
+from sqlalchemy import exists
+from sqlalchemy import func
+from sqlalchemy import or_
+from sqlalchemy.orm import aliased
 from sqlalchemy.orm import exc as orm_exc
 
 from schematizer import models
 from schematizer.components.converters.converter_base import BaseConverter
+from schematizer.config import get_config
 from schematizer.config import log
 from schematizer.environment_configs import FORCE_AVOID_INTERNAL_PACKAGES
+from schematizer.helpers.avro_schema_cache import get_schema_fingerprint
+from schematizer.logic import catalog_version
+from schematizer.logic import compatibility_verdict_store
 from schematizer.logic import exceptions as sch_exc
+from schematizer.logic import lookup_cache
 from schematizer.logic import meta_attribute_mappers as meta_attr_logic
-from schematizer.logic.schema_resolution import SchemaCompatibilityValidator
+from schematizer.logic import schema_response_cache
+from schematizer.logic import source_lock
 from schematizer.models.database import session
+from schematizer.models.page_info import PageInfo
 from schematizer.models.schema_meta_attribute_mapping import (
     SchemaMetaAttributeMapping
 )
@@ -50,32 +67,52 @@ except ImportError:
     from sqlalchemy.exc import IntegrityError
 
 
-def is_backward_compatible(old_schema_json, new_schema_json):
+RegistrationResult = namedtuple('RegistrationResult', ['avro_schema', 'error'])
+
+
+def is_backward_compatible(
+    old_schema_json,
+    new_schema_json,
+    store_verdicts=False
+):
     """Whether the data serialized using specified old_schema_json can be
-    deserialized using specified new_schema_json.
+    deserialized using specified new_schema_json. The computed verdict is
+    only stored in the verdict table if store_verdicts is True.
     """
-    return SchemaCompatibilityValidator.is_backward_compatible(
+    return compatibility_verdict_store.is_backward_compatible(
         old_schema_json,
-        new_schema_json
+        new_schema_json,
+        store_verdict=store_verdicts
     )
 
 
-def is_forward_compatible(old_schema_json, new_schema_json):
+def is_forward_compatible(
+    old_schema_json,
+    new_schema_json,
+    store_verdicts=False
+):
     """Whether the data serialized using specified new_schema_json can be
-    deserialized using specified old_schema_json.
+    deserialized using specified old_schema_json. The computed verdict is
+    only stored in the verdict table if store_verdicts is True.
     """
-    return SchemaCompatibilityValidator.is_backward_compatible(
+    return compatibility_verdict_store.is_backward_compatible(
         new_schema_json,
-        old_schema_json
+        old_schema_json,
+        store_verdict=store_verdicts
     )
 
 
-def is_full_compatible(old_schema_json, new_schema_json):
+def is_full_compatible(old_schema_json, new_schema_json, store_verdicts=False):
     """Whether the data serialized using specified old_schema_json can be
-    deserialized using specified new_schema_json, and vice versa.
+    deserialized using specified new_schema_json, and vice versa. The computed
+    verdicts are only stored in the verdict table if store_verdicts is True.
     """
-    return (is_backward_compatible(old_schema_json, new_schema_json) and
-            is_forward_compatible(old_schema_json, new_schema_json))
+    return (is_backward_compatible(old_schema_json,
+                                   new_schema_json,
+                                   store_verdicts=store_verdicts) and
+            is_forward_compatible(old_schema_json,
+                                  new_schema_json,
+                                  store_verdicts=store_verdicts))
 
 
 def _load_converters():
@@ -134,6 +171,44 @@ def register_avro_schema_from_avro_json(
     source_owner_email = _strip_if_not_none(source_owner_email)
     source_name = _strip_if_not_none(source_name)
 
+    _verify_registration(
+        avro_schema_json,
+        source_name,
+        source_owner_email,
+        docs_required
+    )
+
+    # The lock must be acquired before anything is read in the transaction.
+    source_lock.lock_source(namespace_name, source_name)
+    namespace = _get_namespace_or_create(namespace_name)
+    source = _get_source_or_create(
+        namespace.id,
+        source_name,
+        source_owner_email
+    )
+
+    return _register_avro_schema_in_source(
+        avro_schema_json=avro_schema_json,
+        namespace_name=namespace_name,
+        source=source,
+        contains_pii=contains_pii,
+        cluster_type=cluster_type,
+        status=status,
+        base_schema_id=base_schema_id
+    )
+
+
+def _verify_registration(
+    avro_schema_json,
+    source_name,
+    source_owner_email,
+    docs_required
+):
+    """Verify the given registration arguments. It doesn't access the
+    database, so it is safe to call it outside the request thread.
+
+    :raises ValueError: invalid registration arguments or Avro schema.
+    """
     _assert_non_empty_email(source_owner_email)
     _assert_non_empty_src_name(source_name)
 
@@ -145,16 +220,16 @@ def register_avro_schema_from_avro_json(
     if docs_required:
         models.AvroSchema.verify_avro_schema_has_docs(avro_schema_json)
 
-    namespace = _get_namespace_or_create(namespace_name)
-    _lock_namespace(namespace)
-
-    source = _get_source_or_create(
-        namespace.id,
-        source_name.strip(),
-        source_owner_email.strip()
-    )
-    _lock_source(source)
 
+def _register_avro_schema_in_source(
+    avro_schema_json,
+    namespace_name,
+    source,
+    contains_pii,
+    cluster_type,
+    status,
+    base_schema_id
+):
     topic_candidates = _get_topic_candidates(
         source_id=source.id,
         base_schema_id=base_schema_id,
@@ -163,47 +238,231 @@ def register_avro_schema_from_avro_json(
         limit=None if base_schema_id else 1
     )
 
-    for topic in topic_candidates:
-        _lock_topic_and_schemas(topic)
-        latest_schema = get_latest_schema_by_topic_id(topic.id)
-        is_same_schema = _is_same_schema(
-            schema=latest_schema,
-            avro_schema_json=avro_schema_json,
-            base_schema_id=base_schema_id,
-            source_id=source.id
-        )
-        log.info(
-            'Registering schema {} on namespace {} and source {}. '
-            'Checking same schema with latest {} on topic {}: {}'.format(
-                avro_schema_json,
-                namespace_name,
-                source_name,
-                latest_schema.id if latest_schema else 'None',
-                topic.name,
-                is_same_schema
-            )
+    # The meta attributes of the source are used to check the existing
+    # schemas and to create the mappings of the new schema, so they are
+    # only looked up once per registration.
+    source_meta_attr_ids = set(
+        meta_attr_logic.get_meta_attributes_by_source(source.id)
+    )
+
+    same_schema = _get_same_schema_in_topics(
+        topics=topic_candidates,
+        avro_schema_json=avro_schema_json,
+        base_schema_id=base_schema_id,
+        source_meta_attr_ids=source_meta_attr_ids
+    )
+    log.info(
+        'Registering schema {} on namespace {} and source {}. '
+        'Same schema found in candidate topics: {}'.format(
+            avro_schema_json,
+            namespace_name,
+            source.name,
+            same_schema.id if same_schema else 'None'
         )
-        if is_same_schema:
-            return latest_schema
+    )
+    if same_schema:
+        return same_schema
 
     most_recent_topic = topic_candidates[0] if topic_candidates else None
     if not _is_candidate_topic_compatible(
         topic=most_recent_topic,
         avro_schema_json=avro_schema_json,
-        contains_pii=contains_pii
+        contains_pii=contains_pii,
+        source_meta_attr_ids=source_meta_attr_ids
     ):
         most_recent_topic = _create_topic_for_source(
             namespace_name=namespace_name,
             source=source,
             contains_pii=contains_pii,
-            cluster_type=cluster_type
+            cluster_type=cluster_type,
+            primary_keys=avro_schema_json.get(
+                AvroMetaDataKeys.PRIMARY_KEY,
+                []
+            )
         )
     return _create_avro_schema(
         avro_schema_json=avro_schema_json,
         source_id=source.id,
         topic_id=most_recent_topic.id,
         status=status,
-        base_schema_id=base_schema_id
+        base_schema_id=base_schema_id,
+        meta_attr_schema_ids=source_meta_attr_ids
+    )
+
+
+def register_avro_schemas_from_avro_json_in_batch(
+    registrations,
+    chunk_size,
+    validation_workers=1
+):
+    """Register a batch of Avro schemas. Each registration is a dictionary of
+    the keyword arguments of :func:`register_avro_schema_from_avro_json`.
+
+    The registrations are verified in a pool of `validation_workers` threads
+    first. The valid registrations are then grouped by their sources, and
+    the sources are processed one at a time in the order they first appear in
+    the batch. The schemas of the same source are registered in the order of
+    the given registrations, in chunks of at most `chunk_size` schemas. Each
+    chunk is registered and committed in its own transaction, which holds the
+    lock of only its source, and each registration runs in its own savepoint
+    so that one failed schema does not roll back the others.
+
+    The batch is therefore not atomic. The registrations which fail, including
+    the ones whose source cannot be locked or whose chunk cannot be committed,
+    are reported in their results, and the rest of the batch is still
+    registered, so the results match what has been committed.
+
+    :return: list of :class:`RegistrationResult`, one for each registration
+        in the same order. The `error` of the result is the error message
+        if the registration fails, and the `avro_schema` is None.
+    """
+    registrations = [
+        _normalize_registration(registration)
+        for registration in registrations
+    ]
+    errors = _verify_registrations(registrations, validation_workers)
+    results = [
+        RegistrationResult(avro_schema=None, error=error)
+        for error in errors
+    ]
+    indices_by_source = OrderedDict()
+    for index, (registration, error) in enumerate(zip(registrations, errors)):
+        if error is None:
+            source_fullname = (
+                registration['namespace_name'],
+                registration['source_name']
+            )
+            indices_by_source.setdefault(source_fullname, []).append(index)
+
+    for indices in indices_by_source.values():
+        for start in range(0, len(indices), chunk_size):
+            chunk = indices[start:start + chunk_size]
+            chunk_results = _register_avro_schemas_of_source_in_transaction(
+                [registrations[index] for index in chunk]
+            )
+            for index, result in zip(chunk, chunk_results):
+                results[index] = result
+    return results
+
+
+def _register_avro_schemas_of_source_in_transaction(registrations):
+    """Register the schemas of the given registrations, which all belong to
+    the same source, and commit them in one transaction. If the source cannot
+    be locked or created, or the transaction cannot be committed, the
+    transaction is rolled back and all the registrations fail.
+    """
+    namespace_name = registrations[0]['namespace_name']
+    source_name = registrations[0]['source_name']
+    try:
+        # The lock must be acquired before anything is read in the
+        # transaction.
+        source_lock.lock_source(namespace_name, source_name)
+        namespace = _get_namespace_or_create(namespace_name)
+        source = _get_source_or_create(
+            namespace.id,
+            source_name,
+            registrations[0]['source_owner_email']
+        )
+        results = [
+            _register_avro_schema_in_savepoint(registration, source)
+            for registration in registrations
+        ]
+        session.commit()
+    except Exception as e:
+        log.exception(
+            'Failed to register schemas of namespace {} source {} in '
+            'batch.'.format(namespace_name, source_name)
+        )
+        session.rollback()
+        error = _get_registration_error_message(e)
+        return [
+            RegistrationResult(avro_schema=None, error=error)
+            for _ in registrations
+        ]
+    return results
+
+
+def _normalize_registration(registration):
+    registration = dict(registration)
+    registration.setdefault('status', models.AvroSchemaStatus.READ_AND_WRITE)
+    registration.setdefault('base_schema_id', None)
+    registration.setdefault('docs_required', True)
+    registration['source_owner_email'] = _strip_if_not_none(
+        registration['source_owner_email']
+    )
+    registration['source_name'] = _strip_if_not_none(
+        registration['source_name']
+    )
+    return registration
+
+
+def _verify_registrations(registrations, validation_workers):
+    """Verify the given registrations in a thread pool, and return the error
+    message of each registration, or None if the registration is valid.
+    """
+    if validation_workers <= 1 or len(registrations) <= 1:
+        return [_get_registration_error(r) for r in registrations]
+
+    pool = ThreadPool(min(validation_workers, len(registrations)))
+    try:
+        return pool.map(_get_registration_error, registrations)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def _get_registration_error(registration):
+    try:
+        _verify_registration(
+            registration['avro_schema_json'],
+            registration['source_name'],
+            registration['source_owner_email'],
+            registration['docs_required']
+        )
+    except ValueError as e:
+        return e.message
+    return None
+
+
+def _register_avro_schema_in_savepoint(registration, source):
+    """Register the schema of given registration in a savepoint, so that
+    only this registration is rolled back if it fails. The failure is
+    reported in the returned :class:`RegistrationResult`.
+    """
+    try:
+        with session.begin_nested():
+            avro_schema = _register_avro_schema_in_source(
+                avro_schema_json=registration['avro_schema_json'],
+                namespace_name=registration['namespace_name'],
+                source=source,
+                contains_pii=registration['contains_pii'],
+                cluster_type=registration['cluster_type'],
+                status=registration['status'],
+                base_schema_id=registration['base_schema_id']
+            )
+    except Exception as e:
+        log.exception('Failed to register schema {} in batch.'.format(
+            registration['avro_schema_json']
+        ))
+        return RegistrationResult(
+            avro_schema=None,
+            error=_get_registration_error_message(e)
+        )
+    return RegistrationResult(avro_schema=avro_schema, error=None)
+
+
+def _get_registration_error_message(error):
+    if isinstance(error, (
+        ValueError,
+        sch_exc.EntityNotFoundException,
+        sch_exc.IncompatibleSchemaException,
+        sch_exc.LockTimeoutException
+    )):
+        return error.message
+    # The details of the unexpected errors, such as the database errors, are
+    # only logged.
+    return 'Failed to register the schema due to an unexpected {}.'.format(
+        type(error).__name__
     )
 
 
@@ -213,27 +472,84 @@ def _strip_if_not_none(original_str):
     return original_str.strip()
 
 
-def _is_same_schema(
-    schema,
+def _get_same_schema_in_topics(
+    topics,
     avro_schema_json,
     base_schema_id,
-    source_id
+    source_meta_attr_ids
 ):
-    return (schema and
-            schema.avro_schema_json == avro_schema_json and
-            schema.base_schema_id == base_schema_id and
-            _are_meta_attr_mappings_same(schema.id, source_id))
-
+    """Get the schema that has the same content and base schema id as the
+    given Avro schema json, and is also the latest enabled schema in one of
+    the given topics. If there are multiple such schemas, the one in the most
+    recent topic is returned. It returns None if no such schema exists.
+
+    The schemas are looked up by the fingerprint of the schema json, so it
+    neither loads nor decodes the latest schema of each topic. Until the
+    `schema_fingerprint_fallback_enabled` config is turned off, the schemas
+    registered before the fingerprint column was added, whose fingerprint
+    has not been backfilled yet, are also compared by their decoded schema
+    json.
+
+    The schema must also have the same meta attributes as the given
+    `source_meta_attr_ids`.
+    """
+    if not topics:
+        return None
+
+    fingerprint = get_schema_fingerprint(avro_schema_json)
+
+    newer_schema = aliased(models.AvroSchema)
+    has_newer_enabled_schema = exists().where(and_(
+        newer_schema.topic_id == models.AvroSchema.topic_id,
+        newer_schema.id > models.AvroSchema.id,
+        newer_schema.status != models.AvroSchemaStatus.DISABLED
+    ))
+    fingerprint_filter = models.AvroSchema.fingerprint == fingerprint
+    if get_config().schema_fingerprint_fallback_enabled:
+        fingerprint_filter = or_(
+            fingerprint_filter,
+            models.AvroSchema.fingerprint.is_(None)
+        )
+    same_schemas = session.query(
+        models.AvroSchema
+    ).filter(
+        fingerprint_filter,
+        models.AvroSchema.base_schema_id == base_schema_id,
+        models.AvroSchema.topic_id.in_([topic.id for topic in topics]),
+        models.AvroSchema.status != models.AvroSchemaStatus.DISABLED,
+        ~has_newer_enabled_schema
+    ).order_by(
+        models.AvroSchema.topic_id.desc()
+    ).all()
 
-def _are_meta_attr_mappings_same(schema_id, source_id):
-    return (set(get_meta_attributes_by_schema_id(schema_id)) ==
-            set(meta_attr_logic.get_meta_attributes_by_source(source_id)))
+    same_schemas = [
+        same_schema for same_schema in same_schemas
+        if same_schema.fingerprint is not None or
+        same_schema.avro_schema_json == avro_schema_json
+    ]
+    schema_meta_attr_ids = get_meta_attributes_by_schema_ids(
+        [same_schema.id for same_schema in same_schemas]
+    )
+    for same_schema in same_schemas:
+        if schema_meta_attr_ids[same_schema.id] == source_meta_attr_ids:
+            return same_schema
+    return None
 
 
-def _is_candidate_topic_compatible(topic, avro_schema_json, contains_pii):
+def _is_candidate_topic_compatible(
+    topic,
+    avro_schema_json,
+    contains_pii,
+    source_meta_attr_ids
+):
     return (topic and
             topic.contains_pii == contains_pii and
-            is_schema_compatible_in_topic(avro_schema_json, topic) and
+            is_schema_compatible_in_topic(
+                avro_schema_json,
+                topic,
+                source_meta_attr_ids=source_meta_attr_ids,
+                store_verdicts=True
+            ) and
             _is_pkey_identical(avro_schema_json, topic.name))
 
 
@@ -241,7 +557,8 @@ def _create_topic_for_source(
     namespace_name,
     source,
     contains_pii,
-    cluster_type
+    cluster_type,
+    primary_keys
 ):
     # Note that creating duplicate topic names will throw a sqlalchemy
     # IntegrityError exception. When it occurs, it indicates the uuid
@@ -249,7 +566,13 @@ def _create_topic_for_source(
     # Per SEC-5079, sqlalchemy IntegrityError now is replaced with yelp-conn
     # IntegrityError.
     topic_name = _construct_topic_name(namespace_name, source.name)
-    return _create_topic(topic_name, source.id, contains_pii, cluster_type)
+    return _create_topic(
+        topic_name,
+        source.id,
+        contains_pii,
+        cluster_type,
+        primary_keys
+    )
 
 
 def _construct_topic_name(namespace, source):
@@ -257,7 +580,13 @@ def _construct_topic_name(namespace, source):
     return re.sub('[^\w-]', '_', topic_name)
 
 
-def _create_topic(topic_name, source_id, contains_pii, cluster_type):
+def _create_topic(
+    topic_name,
+    source_id,
+    contains_pii,
+    cluster_type,
+    primary_keys
+):
     """Create a topic named `topic_name` in the given source.
     It returns a newly created topic. If a topic with the same
     name already exists, an exception is thrown
@@ -266,10 +595,13 @@ def _create_topic(topic_name, source_id, contains_pii, cluster_type):
         name=topic_name,
         source_id=source_id,
         contains_pii=contains_pii,
-        cluster_type=cluster_type
+        cluster_type=cluster_type,
+        primary_keys=primary_keys
     )
     session.add(topic)
     session.flush()
+    lookup_cache.invalidate(lookup_cache.get_topic_key(topic_name))
+    catalog_version.bump_catalog_version()
     return topic
 
 
@@ -360,37 +692,6 @@ def _get_source_by_namespace_id_and_src_name(namespace_id, source):
     ).first()
 
 
-def _lock_namespace(namespace):
-    session.query(
-        models.Namespace
-    ).filter(
-        models.Namespace.id == namespace.id
-    ).with_for_update()
-
-
-def _lock_source(source):
-    session.query(
-        models.Source
-    ).filter(
-        models.Source.id == source.id
-    ).with_for_update()
-
-
-def _lock_topic_and_schemas(topic):
-    if not topic:
-        return
-    session.query(
-        models.Topic
-    ).filter(
-        models.Topic.id == topic.id
-    ).with_for_update()
-    session.query(
-        models.AvroSchema
-    ).filter(
-        models.AvroSchema.topic_id == topic.id
-    ).with_for_update()
-
-
 def get_latest_topic_of_namespace_source(namespace_name, source_name):
     source = get_source_by_fullname(namespace_name, source_name)
     if not source:
@@ -460,19 +761,47 @@ def _get_topic_candidates(
     return query.all()
 
 
-def is_schema_compatible_in_topic(target_schema, topic):
+def is_schema_compatible_in_topic(
+    target_schema,
+    topic,
+    source_meta_attr_ids=None,
+    store_verdicts=False
+):
     """Check whether given schema is a valid Avro schema and compatible
     with existing schemas in the specified topic. Note that target_schema
     is the avro json object.
+
+    The existing schemas must also have the same meta attributes as the
+    source of the topic. The caller may pass in the meta attribute ids of
+    the source if it already has them.
+
+    The computed compatibility verdicts are only stored in the verdict table
+    if store_verdicts is True, which the schema registration does because it
+    writes to the master anyway. The other checks only read, so that they can
+    run on a replica.
     """
     enabled_schemas = get_schemas_by_topic_name(topic.name)
+    if not enabled_schemas:
+        return True
+
+    if source_meta_attr_ids is None:
+        source_meta_attr_ids = set(
+            meta_attr_logic.get_meta_attributes_by_source(topic.source_id)
+        )
+    schema_meta_attr_ids = get_meta_attributes_by_schema_ids(
+        [enabled_schema.id for enabled_schema in enabled_schemas]
+    )
+    if any(schema_meta_attr_ids[enabled_schema.id] != source_meta_attr_ids
+           for enabled_schema in enabled_schemas):
+        return False
+
     for enabled_schema in enabled_schemas:
-        schema_json = simplejson.loads(enabled_schema.avro_schema)
-        if (not is_full_compatible(schema_json, target_schema) or
-            not _are_meta_attr_mappings_same(
-                enabled_schema.id,
-                topic.source_id
-        )):
+        schema_json = enabled_schema.avro_schema_json
+        if not is_full_compatible(
+            schema_json,
+            target_schema,
+            store_verdicts=store_verdicts
+        ):
             return False
     return True
 
@@ -480,8 +809,11 @@ def is_schema_compatible_in_topic(target_schema, topic):
 def _is_pkey_identical(new_schema_json, topic_name):
     """Check whether given schema has not mutated any primary key.
     """
-    old_schema_json = get_latest_schema_by_topic_name(
-        topic_name
+    # The registration compares against the database instead of the lookup
+    # cache, which may be stale.
+    topic = _query_topic_by_name(topic_name)
+    old_schema_json = _query_latest_schema_of_topic(
+        topic.id
     ).avro_schema_json
     old_pkey_set = set(
         (old_field['name'], old_field['pkey'])
@@ -498,8 +830,16 @@ def _is_pkey_identical(new_schema_json, topic_name):
 
 def get_topic_by_name(topic_name):
     """Get topic of specified topic name. It returns None if the specified
-    topic is not found.
+    topic is not found. The topic is read through the
+    :mod:schematizer.logic.lookup_cache.
     """
+    return lookup_cache.get_or_load(
+        lookup_cache.get_topic_key(topic_name),
+        lambda: _query_topic_by_name(topic_name)
+    )
+
+
+def _query_topic_by_name(topic_name):
     return session.query(
         models.Topic
     ).filter(
@@ -531,7 +871,8 @@ def _create_avro_schema(
     source_id,
     topic_id,
     status=models.AvroSchemaStatus.READ_AND_WRITE,
-    base_schema_id=None
+    base_schema_id=None,
+    meta_attr_schema_ids=None
 ):
     avro_schema_elements = models.AvroSchema.create_schema_elements_from_json(
         avro_schema_json
@@ -545,16 +886,43 @@ def _create_avro_schema(
     )
     session.add(avro_schema)
     session.flush()
+    lookup_cache.invalidate(lookup_cache.get_latest_schema_key(topic_id))
+    catalog_version.bump_catalog_version()
 
-    for avro_schema_element in avro_schema_elements:
-        avro_schema_element.avro_schema_id = avro_schema.id
-        session.add(avro_schema_element)
-
-    session.flush()
-    _add_meta_attribute_mappings(avro_schema.id, source_id)
+    _bulk_insert_schema_elements(avro_schema.id, avro_schema_elements)
+    _add_meta_attribute_mappings(
+        avro_schema.id,
+        source_id,
+        meta_attr_schema_ids=meta_attr_schema_ids
+    )
     return avro_schema
 
 
+def _bulk_insert_schema_elements(schema_id, avro_schema_elements):
+    """Insert the schema elements of the given schema with a single Core
+    multi-row insert statement instead of flushing each element through the
+    ORM unit of work. Wide schemas may have hundreds of elements, and the
+    ORM flush of these elements dominates the registration time.
+
+    Note that the inserted elements are not added into the session, and the
+    given element objects remain transient.
+    """
+    if not avro_schema_elements:
+        return
+    session.execute(
+        models.AvroSchemaElement.__table__.insert(),
+        [
+            {
+                'avro_schema_id': schema_id,
+                'key': element.key,
+                'element_type': element.element_type,
+                'doc': element.doc
+            }
+            for element in avro_schema_elements
+        ]
+    )
+
+
 def get_schema_by_id(schema_id):
     """Get the Avro schema of specified id. It returns None if not found.
     """
@@ -568,7 +936,9 @@ def get_schema_by_id(schema_id):
 def get_schemas_created_after(
     created_after,
     page_info=None,
-    include_disabled=False
+    include_disabled=False,
+    loading_profile=None,
+    batch_size=None
 ):
     # TODO [clin|DATAPIPE-1430] as part of the clean up, merge this function
     # into `get_schemas_by_criteira`.
@@ -585,6 +955,14 @@ def get_schemas_created_after(
             equal to min_id.
         include_disabled(Optional[bool]): set it to True to include disabled
             schemas. Default it excludes disabled ones.
+        loading_profile(Optional[tuple]): loader options of the related
+            entities to load with the schemas, such as
+            :data:schematizer.logic.loading_profiles.SCHEMA_RESPONSE.
+        batch_size(Optional[int]): if specified, the schemas are loaded
+            `batch_size` rows at a time as they are iterated, and an
+            iterator is returned instead of a list. Each batch is a separate
+            query which continues from the id of the last loaded schema, so
+            the driver never buffers more than one batch.
     Returns:
         (list[:class:schematizer.models.AvroSchema]): List of avro
             schemas created after (inclusive) the specified creation
@@ -603,12 +981,50 @@ def get_schemas_created_after(
         qry = qry.filter(
             models.AvroSchema.id >= page_info.min_id
         )
+    if loading_profile:
+        qry = qry.options(*loading_profile)
+    count = page_info.count if page_info else None
+    if batch_size:
+        return models.AvroSchema.iter_in_batches(qry, batch_size, count=count)
     qry = qry.order_by(models.AvroSchema.id)
-    if page_info and page_info.count:
-        qry = qry.limit(page_info.count)
+    if count:
+        qry = qry.limit(count)
     return qry.all()
 
 
+def get_schemas_after_id(after_id, count=None, loading_profile=None):
+    """Get the Avro schemas, including the disabled ones, whose ids are
+    greater than the given id in the order of their ids. The schemas are
+    filtered by the primary key, so the query stays cheap for callers that
+    repeatedly ask for the schemas registered since the last one they saw.
+
+    Args:
+        after_id(int): get schemas with an id greater than the given id.
+        count(Optional[int]): maximum number of schemas to return.
+        loading_profile(Optional[tuple]): loader options of the related
+            entities to load with the schemas.
+    """
+    qry = session.query(
+        models.AvroSchema
+    ).filter(
+        models.AvroSchema.id > after_id
+    ).order_by(
+        models.AvroSchema.id
+    )
+    if count:
+        qry = qry.limit(count)
+    if loading_profile:
+        qry = qry.options(*loading_profile)
+    return qry.all()
+
+
+def get_max_schema_id():
+    """Get the id of the most recently registered Avro schema, or None if
+    there is no schema.
+    """
+    return session.query(func.max(models.AvroSchema.id)).scalar()
+
+
 def get_latest_schema_by_topic_id(topic_id):
     """Get the latest enabled (Read-Write or Read-Only) schema of given topic.
     It returns None if no such schema can be found.
@@ -625,7 +1041,8 @@ def get_latest_schema_by_topic_id(topic_id):
 
 def get_latest_schema_by_topic_name(topic_name):
     """Get the latest enabled (Read-Write or Read-Only) schema of given topic.
-    It returns None if no such schema can be found.
+    It returns None if no such schema can be found. Both the topic and the
+    schema are read through the :mod:schematizer.logic.lookup_cache.
     """
     topic = get_topic_by_name(topic_name)
     if not topic:
@@ -633,10 +1050,17 @@ def get_latest_schema_by_topic_name(topic_name):
             "Cannot find topic {0}.".format(topic_name)
         )
 
+    return lookup_cache.get_or_load(
+        lookup_cache.get_latest_schema_key(topic.id),
+        lambda: _query_latest_schema_of_topic(topic.id)
+    )
+
+
+def _query_latest_schema_of_topic(topic_id):
     return session.query(
         models.AvroSchema
     ).filter(
-        models.AvroSchema.topic_id == topic.id,
+        models.AvroSchema.topic_id == topic_id,
         models.AvroSchema.status != models.AvroSchemaStatus.DISABLED
     ).order_by(
         models.AvroSchema.id.desc()
@@ -655,7 +1079,17 @@ def is_schema_compatible(target_schema, namespace, source):
     return is_schema_compatible_in_topic(target_schema, topic)
 
 
-def get_schemas_by_topic_name(topic_name, include_disabled=False):
+def get_schemas_by_topic_name(
+    topic_name,
+    include_disabled=False,
+    loading_profile=None
+):
+    """Get all the Avro schemas of specified topic. Default it excludes
+    disabled schemas. Set `include_disabled` to True to include disabled ones.
+    The related entities in the `loading_profile` loader options, such as
+    :data:schematizer.logic.loading_profiles.SCHEMA_RESPONSE, are loaded
+    together with the schemas.
+    """
     topic = get_topic_by_name(topic_name)
     if not topic:
         raise sch_exc.EntityNotFoundException(
@@ -671,6 +1105,8 @@ def get_schemas_by_topic_name(topic_name, include_disabled=False):
         qry = qry.filter(
             models.AvroSchema.status != models.AvroSchemaStatus.DISABLED
         )
+    if loading_profile:
+        qry = qry.options(*loading_profile)
     return qry.order_by(models.AvroSchema.id).all()
 
 
@@ -711,16 +1147,28 @@ def _update_schema_status(schema_id, status):
         {'status': status}
     )
     session.flush()
+    schema_response_cache.invalidate_schema_response(schema_id)
+    # The latest schema of the topic changes if the schema is disabled, or
+    # becomes enabled again.
+    topic_id = session.query(
+        models.AvroSchema.topic_id
+    ).filter(
+        models.AvroSchema.id == schema_id
+    ).scalar()
+    if topic_id is not None:
+        lookup_cache.invalidate(lookup_cache.get_latest_schema_key(topic_id))
+        catalog_version.bump_catalog_version()
 
 
-def get_topics_by_source_id(source_id):
-    return session.query(
+def get_topics_by_source_id(source_id, loading_profile=None):
+    qry = session.query(
         models.Topic
     ).filter(
         models.Topic.source_id == source_id
-    ).order_by(
-        models.Topic.id
-    ).all()
+    )
+    if loading_profile:
+        qry = qry.options(*loading_profile)
+    return qry.order_by(models.Topic.id).all()
 
 
 def get_source_by_id(source_id):
@@ -751,6 +1199,81 @@ def list_refreshes_by_source_id(source_id):
     ).all()
 
 
+def list_refreshes_by_namespace(
+    namespace_name,
+    page_info=None,
+    batch_size=None
+):
+    """Get the refreshes of all the sources in the given namespace, grouped
+    by their sources in the order of the source ids and then ordered by their
+    ids. The refreshes are queried together with the names of their sources
+    and namespace in a single query, so that the responses can be built
+    without loading `refresh.source` and `source.namespace`.
+
+    Args:
+        namespace_name (str): name of the namespace.
+        page_info (Optional[:class:schematizer.models.page_info.PageInfo]):
+            limits the refreshes to count and those positioned at or after
+            the (source_id, min_id) of the page info.
+        batch_size (Optional[int]): if specified, all the refreshes from the
+            position of the page info are returned by an iterator instead of
+            a list, and they are loaded `batch_size` at a time, see
+            :func:`_iter_pages`.
+
+    Returns:
+        (list[tuple]): list of (refresh, source_name, namespace_name) tuples.
+
+    :raises schematizer.models.exceptions.EntityNotFoundError: the namespace
+        does not exist.
+    """
+    if batch_size:
+        return _iter_pages(
+            lambda page: list_refreshes_by_namespace(namespace_name, page),
+            page_info,
+            batch_size,
+            get_position=lambda row: {
+                'source_id': row[0].source_id,
+                'min_id': row[0].id + 1
+            }
+        )
+    qry = session.query(
+        models.Refresh,
+        models.Source.name,
+        models.Namespace.name
+    ).join(
+        models.Source,
+        models.Source.id == models.Refresh.source_id
+    ).join(
+        models.Namespace,
+        models.Namespace.id == models.Source.namespace_id
+    ).filter(
+        models.Namespace.name == namespace_name
+    )
+    if page_info and page_info.source_id is not None:
+        qry = qry.filter(or_(
+            models.Refresh.source_id > page_info.source_id,
+            and_(
+                models.Refresh.source_id == page_info.source_id,
+                models.Refresh.id >= page_info.min_id
+            )
+        ))
+    elif page_info and page_info.min_id:
+        qry = qry.filter(models.Refresh.id >= page_info.min_id)
+    qry = qry.order_by(
+        models.Refresh.source_id
+    ).order_by(
+        models.Refresh.id
+    )
+    if page_info and page_info.count:
+        qry = qry.limit(page_info.count)
+    refresh_rows = qry.all()
+    if not refresh_rows:
+        # Only tells an empty namespace from a missing one when there is no
+        # refresh at all.
+        models.Namespace.get_by_name(namespace_name)
+    return refresh_rows
+
+
 def create_refresh(
         source_id,
         offset,
@@ -803,26 +1326,53 @@ def get_meta_attributes_by_schema_id(schema_id):
     return [m.meta_attr_schema_id for m in mappings]
 
 
-def _add_meta_attribute_mappings(schema_id, source_id):
-    mappings = []
-    for meta_attr_schema_id in meta_attr_logic.get_meta_attributes_by_source(
-        source_id
-    ):
-        new_mapping = SchemaMetaAttributeMapping(
-            schema_id=schema_id,
-            meta_attr_schema_id=meta_attr_schema_id
+def get_meta_attributes_by_schema_ids(schema_ids):
+    """Get the schema_ids of the meta attributes registered to each of the
+    specified schema ids with a single query. It returns a dictionary that
+    maps each given schema id to the set of its meta attribute schema ids.
+    """
+    meta_attr_ids_map = {schema_id: set() for schema_id in schema_ids}
+    if not meta_attr_ids_map:
+        return meta_attr_ids_map
+
+    mappings = session.query(
+        SchemaMetaAttributeMapping.schema_id,
+        SchemaMetaAttributeMapping.meta_attr_schema_id
+    ).filter(
+        SchemaMetaAttributeMapping.schema_id.in_(meta_attr_ids_map.keys())
+    ).all()
+    for schema_id, meta_attr_schema_id in mappings:
+        meta_attr_ids_map[schema_id].add(meta_attr_schema_id)
+    return meta_attr_ids_map
+
+
+def _add_meta_attribute_mappings(
+    schema_id,
+    source_id,
+    meta_attr_schema_ids=None
+):
+    if meta_attr_schema_ids is None:
+        meta_attr_schema_ids = meta_attr_logic.get_meta_attributes_by_source(
+            source_id
+        )
+    mappings = [
+        {'schema_id': schema_id, 'meta_attr_schema_id': meta_attr_schema_id}
+        for meta_attr_schema_id in meta_attr_schema_ids
+    ]
+    if mappings:
+        session.execute(
+            SchemaMetaAttributeMapping.__table__.insert(),
+            mappings
         )
-        session.add(new_mapping)
-        mappings.append(new_mapping)
-    session.flush()
-    return mappings
 
 
 def get_topics_by_criteria(
     namespace=None,
     source=None,
     created_after=None,
-    page_info=None
+    page_info=None,
+    loading_profile=None,
+    batch_size=None
 ):
     """Get all the topics that match given criteria, including namespace,
     source, and/or topic created timestamp.
@@ -838,6 +1388,13 @@ def get_topics_by_criteria(
         page_info(Optional[:class:schematizer.models.page_info.PageInfo]):
             limits the topics to count and those with id greater than or
             equal to min_id.
+        loading_profile(Optional[tuple]): loader options of the related
+            entities to load together with the topics, such as
+            :data:schematizer.logic.loading_profiles.TOPIC_RESPONSE.
+        batch_size(Optional[int]): if specified, the topics are loaded
+            `batch_size` rows at a time as they are iterated, and an
+            iterator is returned instead of a list, see
+            :meth:`schematizer.models.base_model.BaseModel.iter_in_batches`.
 
     Returns:
         (list[:class:schematizer.models.Topic]): List of topics sorted by
@@ -857,10 +1414,18 @@ def get_topics_by_criteria(
         qry = qry.filter(models.Source.name == source)
     if created_after is not None:
         qry = qry.filter(models.Topic.created_at >= created_after)
+    if loading_profile:
+        qry = qry.options(*loading_profile)
 
     min_id = page_info.min_id if page_info else 0
     qry = qry.filter(models.Topic.id >= min_id)
 
+    if batch_size:
+        return models.Topic.iter_in_batches(
+            qry,
+            batch_size,
+            count=page_info.count if page_info else None
+        )
     qry = qry.order_by(models.Topic.id)
     if page_info and page_info.count:
         qry = qry.limit(page_info.count)
@@ -931,9 +1496,12 @@ def get_refreshes_by_criteria(
     source_name=None,
     status=None,
     created_after=None,
-    updated_after=None
+    updated_after=None,
+    page_info=None,
+    batch_size=None
 ):
-    """Get all the refreshes that match the given filter criteria.
+    """Get all the refreshes that match the given filter criteria, ordered by
+    their priorities (descending) and then ids.
 
     Args:
         namespace(Optional[str]): get refreshes of given namespace
@@ -946,7 +1514,31 @@ def get_refreshes_by_criteria(
             after given utc datetime (inclusive) if specified.
         updated_after(Optional[datetime]): get refreshes updated
             after given utc datetime (inclusive) if specified.
+        page_info(Optional[:class:schematizer.models.page_info.PageInfo]):
+            limits the refreshes to count and those positioned at or after
+            the (priority, min_id) of the page info.
+        batch_size(Optional[int]): if specified, all the refreshes from the
+            position of the page info are returned by an iterator instead of
+            a list, and they are loaded `batch_size` at a time, see
+            :func:`_iter_pages`.
     """
+    if batch_size:
+        return _iter_pages(
+            lambda page: get_refreshes_by_criteria(
+                namespace=namespace,
+                source_name=source_name,
+                status=status,
+                created_after=created_after,
+                updated_after=updated_after,
+                page_info=page
+            ),
+            page_info,
+            batch_size,
+            get_position=lambda refresh: {
+                'priority': refresh.priority,
+                'min_id': refresh.id + 1
+            }
+        )
     qry = session.query(models.Refresh)
     if namespace:
         qry = qry.join(models.Source).filter(
@@ -967,11 +1559,52 @@ def get_refreshes_by_criteria(
         qry = qry.filter(models.Refresh.created_at >= created_after)
     if updated_after:
         qry = qry.filter(models.Refresh.updated_at >= updated_after)
-    return qry.order_by(
+    if page_info and page_info.priority is not None:
+        qry = qry.filter(or_(
+            models.Refresh.priority < page_info.priority,
+            and_(
+                models.Refresh.priority == page_info.priority,
+                models.Refresh.id >= page_info.min_id
+            )
+        ))
+    elif page_info and page_info.min_id:
+        qry = qry.filter(models.Refresh.id >= page_info.min_id)
+    qry = qry.order_by(
         desc(models.Refresh.priority)
     ).order_by(
         models.Refresh.id
-    ).all()
+    )
+    if page_info and page_info.count:
+        qry = qry.limit(page_info.count)
+    return qry.all()
+
+
+def _iter_pages(get_page, page_info, batch_size, get_position):
+    """Iterate over the entities of consecutive pages of `batch_size` entities,
+    starting at the position of the given page info. `get_page` queries the
+    page of the given :class:schematizer.models.page_info.PageInfo, and each
+    following page starts at the position `get_position` gets from the last
+    entity of the previous page, the same as the next cursor of the page.
+    The first page is loaded before this function returns, so that its
+    errors are raised to the caller rather than while iterating.
+    """
+    first_page = get_page(PageInfo(
+        batch_size,
+        page_info.min_id if page_info else 0,
+        priority=page_info.priority if page_info else None,
+        source_id=page_info.source_id if page_info else None
+    ))
+    return itertools.chain(
+        first_page,
+        _iter_next_pages(get_page, first_page, batch_size, get_position)
+    )
+
+
+def _iter_next_pages(get_page, page, batch_size, get_position):
+    while len(page) == batch_size:
+        page = get_page(PageInfo(batch_size, **get_position(page[-1])))
+        for entity in page:
+            yield entity
 
 
 def get_refresh_by_id(refresh_id):
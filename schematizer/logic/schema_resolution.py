@@ -27,10 +27,89 @@ rules. Therefore, a separate SchemaResolution class is implemented here.
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
-from collections import defaultdict
+import hashlib
 
+import simplejson
 from avro import schema
 
+from schematizer.config import get_config
+from schematizer.helpers.avro_schema_cache import get_avro_schema_object
+from schematizer.helpers.decorators import memoized
+from schematizer.helpers.lru_cache import LRUCache
+
+
+# Name of the attribute on the parsed Avro schema object that caches the
+# fingerprint of the schema object.
+_FINGERPRINT_ATTR = '_schematizer_fingerprint'
+
+
+def get_schema_object_fingerprint(avro_schema):
+    """Get the fingerprint of the given parsed Avro schema object. Schema
+    objects that have the same fingerprint have the same content.
+
+    The fingerprint of each schema node is computed from the fingerprints of
+    its child nodes, and is cached on the node, so that each node is only
+    fingerprinted once after it is parsed. Therefore the schema object should
+    not be modified once its fingerprint has been computed.
+    """
+    fingerprint, _ = _compute_fingerprint(avro_schema, set())
+    return fingerprint
+
+
+def _compute_fingerprint(avro_schema, ancestor_ids):
+    """Returns the fingerprint of the given schema object and the ids of its
+    ancestor schema objects which are referenced by the given schema object
+    (recursive schema). The fingerprint of a schema object that references
+    its ancestors depends on where it is in the schema tree, so it is not
+    cached on the schema object.
+    """
+    fingerprint = getattr(avro_schema, _FINGERPRINT_ATTR, None)
+    if fingerprint is not None:
+        return fingerprint, set()
+
+    schema_id = id(avro_schema)
+    if schema_id in ancestor_ids:
+        # Only named schemas can be referenced recursively, and the name
+        # is unique within the schema being fingerprinted.
+        return 'ref:' + avro_schema.fullname, {schema_id}
+
+    ancestor_ids.add(schema_id)
+    referenced_ancestor_ids = set()
+
+    def get_child_content(value):
+        if isinstance(value, schema.Schema):
+            child_fingerprint, child_refs = _compute_fingerprint(
+                value,
+                ancestor_ids
+            )
+            referenced_ancestor_ids.update(child_refs)
+            return child_fingerprint
+        if isinstance(value, schema.Field):
+            return get_child_content(value.props)
+        if isinstance(value, dict):
+            return dict((k, get_child_content(v)) for k, v in value.items())
+        if isinstance(value, (list, tuple)):
+            return [get_child_content(item) for item in value]
+        return value
+
+    if isinstance(avro_schema, schema.UnionSchema):
+        content = get_child_content(avro_schema.schemas)
+    else:
+        content = get_child_content(avro_schema.props)
+        if isinstance(avro_schema, schema.NamedSchema):
+            content['fullname'] = avro_schema.fullname
+
+    ancestor_ids.discard(schema_id)
+    referenced_ancestor_ids.discard(schema_id)
+
+    fingerprint = hashlib.sha1(simplejson.dumps(
+        [avro_schema.__class__.__name__, content],
+        sort_keys=True
+    ).encode('utf-8')).hexdigest()
+    if not referenced_ancestor_ids:
+        setattr(avro_schema, _FINGERPRINT_ATTR, fingerprint)
+    return fingerprint, referenced_ancestor_ids
+
 
 class SchemaCompatibilityValidator(object):
 
@@ -39,10 +118,61 @@ class SchemaCompatibilityValidator(object):
         """Whether the data serialized with given writer_schema can be
         deserialized using given reader schema
         """
-        writer_schema = schema.make_avsc_object(writer_schema_json)
-        reader_schema = schema.make_avsc_object(reader_schema_json)
-        resolver = SchemaResolution()
-        return resolver.resolve_schema(writer_schema, reader_schema)
+        writer_schema = get_avro_schema_object(writer_schema_json)
+        reader_plan = cls.compile_reader_schema(reader_schema_json)
+        return reader_plan.can_read(writer_schema)
+
+    @classmethod
+    def compile_reader_schema(cls, reader_schema_json):
+        """Get the :class:ReaderSchemaPlan of given reader schema. The plans
+        are cached by the reader schema fingerprint, so checking a schema
+        against all the schemas in a topic reuses the same plans.
+        """
+        reader_schema = get_avro_schema_object(reader_schema_json)
+        return _get_reader_plan_cache().get_or_create(
+            get_schema_object_fingerprint(reader_schema),
+            lambda: ReaderSchemaPlan(reader_schema)
+        )
+
+
+@memoized
+def _get_reader_plan_cache():
+    return LRUCache(max_size=get_config().reader_schema_plan_cache_size)
+
+
+class ReaderSchemaPlan(object):
+    """Reader schema compiled for checking whether the data serialized with
+    many writer schemas can be deserialized with it.
+
+    The plan keeps the parsed reader schema and the resolution results of all
+    the (writer sub-schema, reader sub-schema) pairs resolved so far. Writer
+    schemas of the same topic usually share most of their fields, so the
+    later writer schemas only need to resolve the parts that differ.
+
+    Args:
+        reader_schema (avro.schema.Schema): parsed reader schema. It must not
+            be modified after the plan is created.
+        max_resolved_pairs (int): the resolution results are discarded once
+            this many schema pairs have been resolved, so that the memory used
+            by a long-lived plan stays bounded.
+    """
+
+    def __init__(self, reader_schema, max_resolved_pairs=10000):
+        self.reader_schema = reader_schema
+        self.reader_fingerprint = get_schema_object_fingerprint(reader_schema)
+        self.max_resolved_pairs = max_resolved_pairs
+        self._resolution = SchemaResolution()
+
+    def can_read(self, writer_schema):
+        """Whether the data serialized with given parsed writer schema can be
+        deserialized using the reader schema of this plan.
+        """
+        if self._resolution.resolved_pairs_count >= self.max_resolved_pairs:
+            self._resolution.reset()
+        return self._resolution.resolve_schema(
+            writer_schema,
+            self.reader_schema
+        )
 
 
 class SchemaResolution(object):
@@ -59,9 +189,43 @@ class SchemaResolution(object):
     again.
     """
 
+    # Names of the resolver functions of each writer schema type. The resolver
+    # functions are looked up by name so that the subclasses can override
+    # them.
+    _resolver_names = {
+        schema.PrimitiveSchema: 'resolve_primitive_schema',
+        schema.EnumSchema: 'resolve_enum_schema',
+        schema.FixedSchema: 'resolve_fixed_schema',
+        schema.MapSchema: 'resolve_map_schema',
+        schema.ArraySchema: 'resolve_array_schema',
+        schema.RecordSchema: 'resolve_record_schema',
+        schema.UnionSchema: 'resolve_union_schema',
+        schema.BytesDecimalSchema: 'resolve_bytes_decimal_schema',
+        schema.FixedDecimalSchema: 'resolve_fixed_decimal_schema',
+        schema.DateSchema: 'resolve_date_and_time_schema',
+        schema.TimeMillisSchema: 'resolve_date_and_time_schema',
+        schema.TimeMicrosSchema: 'resolve_date_and_time_schema',
+        schema.TimestampMillisSchema: 'resolve_date_and_time_schema',
+        schema.TimestampMicrosSchema: 'resolve_date_and_time_schema',
+    }
+
+    # The primitive types each primitive type can be promoted to.
+    _promotable_types = {
+        'int': frozenset(['long', 'float', 'double']),
+        'long': frozenset(['float', 'double']),
+        'float': frozenset(['double']),
+    }
+
     def __init__(self):
         self._resolved_schemas_map = {}
 
+    @property
+    def resolved_pairs_count(self):
+        """Number of the writer schema and reader schema pairs that have
+        been resolved so far.
+        """
+        return len(self._resolved_schemas_map)
+
     def reset(self):
         """Clear all the writer schema and reader schema pairs that's been
         resolved so far. It should be called before starting a new resolution
@@ -115,12 +279,10 @@ class SchemaResolution(object):
         ):
             return False
 
-        promotable_map = defaultdict(tuple, {
-            'int': ('long', 'float', 'double'),
-            'long': ('float', 'double'),
-            'float': ('double',),
-        })
-        promotable_types = promotable_map[writer_schema.fullname]
+        promotable_types = self._promotable_types.get(
+            writer_schema.fullname,
+            frozenset()
+        )
         return reader_schema.fullname in promotable_types
 
     def _resolve_named_schema(self, writer_schema, reader_schema,
@@ -256,59 +418,26 @@ class SchemaResolution(object):
     def resolve_date_and_time_schema(self, writer_schema, reader_schema):
         return self.resolve_primitive_schema(writer_schema, reader_schema)
 
-    @property
-    def resolvers(self):
-        return {
-            schema.PrimitiveSchema: self.resolve_primitive_schema,
-            schema.EnumSchema: self.resolve_enum_schema,
-            schema.FixedSchema: self.resolve_fixed_schema,
-            schema.MapSchema: self.resolve_map_schema,
-            schema.ArraySchema: self.resolve_array_schema,
-            schema.RecordSchema: self.resolve_record_schema,
-            schema.UnionSchema: self.resolve_union_schema,
-            schema.BytesDecimalSchema: self.resolve_bytes_decimal_schema,
-            schema.FixedDecimalSchema: self.resolve_fixed_decimal_schema,
-            schema.DateSchema: self.resolve_date_and_time_schema,
-            schema.TimeMillisSchema: self.resolve_date_and_time_schema,
-            schema.TimeMicrosSchema: self.resolve_date_and_time_schema,
-            schema.TimestampMillisSchema: self.resolve_date_and_time_schema,
-            schema.TimestampMicrosSchema: self.resolve_date_and_time_schema,
-        }
-
     def resolve_schema(self, writer_schema, reader_schema):
         """Check if writer schema can be resolved to the reader schema"""
-        resolver = self.resolvers.get(writer_schema.__class__)
-        if (isinstance(writer_schema.type, schema.UnionSchema) or
-                isinstance(reader_schema, schema.UnionSchema)):
-            resolver = self.resolvers.get(schema.UnionSchema)
-
         key = self._create_key(writer_schema, reader_schema)
         is_resolved = self._resolved_schemas_map.get(key)
         if is_resolved is None:
+            if (isinstance(writer_schema.type, schema.UnionSchema) or
+                    isinstance(reader_schema, schema.UnionSchema)):
+                resolver_name = self._resolver_names[schema.UnionSchema]
+            else:
+                resolver_name = self._resolver_names[writer_schema.__class__]
+            resolver = getattr(self, resolver_name)
             is_resolved = resolver(writer_schema, reader_schema)
             self._resolved_schemas_map[key] = is_resolved
         return is_resolved
 
     def _create_key(self, writer_schema, reader_schema):
         """Create the dictionary key from the given writer schema and
-        reader schema. We'd like to compare the actual json content
-        instead of object id.
-
-        Since dictionary and set are unordered, it creates a frozenset
-        from the sorted dictionary and sorted set.
+        reader schema. We'd like to compare the actual schema content
+        instead of object id, so the key consists of the fingerprints of
+        the schemas.
         """
-        return (self.freeze_object(writer_schema.to_json()),
-                self.freeze_object(reader_schema.to_json()))
-
-    def freeze_object(self, obj):
-        if isinstance(obj, (tuple, list)):
-            return tuple([self.freeze_object(item) for item in obj])
-
-        if isinstance(obj, set):
-            return tuple([self.freeze_object(item) for item in sorted(obj)])
-
-        if isinstance(obj, dict):
-            new_dict = dict((k, self.freeze_object(v)) for k, v in obj.items())
-            return frozenset(sorted(new_dict.items()))
-
-        return obj
+        return (get_schema_object_fingerprint(writer_schema),
+                get_schema_object_fingerprint(reader_schema))
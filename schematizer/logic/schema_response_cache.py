@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+This module keeps a process-wide cache of the rendered responses of the
+schemas, keyed by the schema id. The schema json, topic, and source of a
+registered schema never change, so the response of a schema only changes when
+its status, its note, or the category of its source changes. Those writes
+invalidate the cached responses of this process, and bump the catalog version
+so that the other processes clear their caches, see
+:mod:schematizer.logic.catalog_version. The cached responses also expire
+after `schema_response_cache_ttl_seconds`.
+
+Each cached response comes with an entity tag computed from its content,
+which the api uses to answer conditional requests.
+"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import hashlib
+from collections import namedtuple
+
+import simplejson
+
+from schematizer.config import get_config
+from schematizer.helpers.decorators import memoized
+from schematizer.helpers.lru_cache import LRUCache
+from schematizer.models.database import reading_from_master
+
+
+CachedSchemaResponse = namedtuple(
+    'CachedSchemaResponse',
+    ['response', 'etag']
+)
+
+
+@memoized
+def _get_response_cache():
+    config = get_config()
+    return LRUCache(
+        max_size=config.schema_response_cache_size,
+        ttl_seconds=config.schema_response_cache_ttl_seconds
+    )
+
+
+def get_schema_response(schema_id, render_func):
+    """Get the :class:CachedSchemaResponse of the schema of the given id. If
+    the response is not cached, it is rendered by `render_func` from the
+    master database, which returns None if the schema does not exist. The
+    returned response is shared and must be treated as read-only.
+
+    :return: :class:CachedSchemaResponse, or None if the schema does not exist.
+    """
+    response_cache = _get_response_cache()
+    cached_response = response_cache.get(schema_id)
+    if cached_response is not None:
+        return cached_response
+
+    with reading_from_master():
+        response = render_func()
+    if response is None:
+        return None
+    cached_response = CachedSchemaResponse(
+        response=response,
+        etag=get_etag(response)
+    )
+    response_cache.set(schema_id, cached_response)
+    return cached_response
+
+
+def get_etag(response):
+    """Get the entity tag of the given response, which is the digest of its
+    canonical json.
+    """
+    content = simplejson.dumps(response, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+def invalidate_schema_response(schema_id):
+    _get_response_cache().delete(schema_id)
+
+
+def get_schema_response_cache_stats():
+    """Get the :class:schematizer.helpers.lru_cache.CacheStats of the
+    schema response cache.
+    """
+    return _get_response_cache().stats
+
+
+def clear_schema_response_cache():
+    _get_response_cache().clear()
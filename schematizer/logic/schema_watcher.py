@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+This module lets the requests wait for new Avro schemas to be registered.
+The waiting requests of a process share one
+:class:schematizer.helpers.shared_poller.SharedPoller of the max schema id,
+so the database is queried at most once every
+`schema_watch_poll_interval_seconds` no matter how many requests are
+waiting. Note that each waiting request still holds a worker thread.
+"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from schematizer.config import get_config
+from schematizer.helpers.decorators import memoized
+from schematizer.helpers.shared_poller import SharedPoller
+from schematizer.logic import schema_repository
+from schematizer.models.database import session
+
+
+@memoized
+def _get_max_schema_id_poller():
+    return SharedPoller(
+        _poll_max_schema_id,
+        get_config().schema_watch_poll_interval_seconds
+    )
+
+
+def _poll_max_schema_id():
+    max_schema_id = schema_repository.get_max_schema_id()
+    # End the read-only transaction, otherwise the next poll of this thread
+    # would read the same snapshot.
+    session.rollback()
+    return max_schema_id
+
+
+def wait_for_schemas_after(after_id, timeout_seconds):
+    """Wait until there are Avro schemas whose ids are greater than the given
+    id, or until the timeout expires.
+
+    The transaction of the current session is ended before it returns, so
+    that the following queries can see the schemas registered while waiting.
+    The session therefore must not have pending changes.
+
+    :return: True if there are schemas with greater ids.
+    """
+    max_schema_id = _get_max_schema_id_poller().wait_for_value_above(
+        after_id,
+        timeout_seconds
+    )
+    session.rollback()
+    return max_schema_id is not None and max_schema_id > after_id
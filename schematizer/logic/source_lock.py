@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+This module provides the MySQL advisory locks that serialize the schema
+registrations of the same source. Registrations of different sources take
+different locks, and therefore run in parallel.
+
+The locks are keyed by the namespace name and source name rather than the
+source id, so that the creation of a new source is serialized as well. Each
+lock is held on a dedicated connection until the session transaction that
+acquired it is committed or rolled back, so the registration that waits for
+the lock sees the schemas committed by the previous lock holder. Locks must
+be acquired before the transaction reads anything, otherwise the transaction
+may read from a snapshot taken before the previous lock holder committed.
+
+Before MySQL 5.7, acquiring a lock releases the lock previously acquired on
+the same connection, so every lock has a connection of its own. Registrations
+should still hold the lock of one source at a time, since each lock takes a
+connection from the pool.
+"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import hashlib
+
+import uwsgi_metrics
+from sqlalchemy import event
+from sqlalchemy import func
+from sqlalchemy import select
+
+from schematizer.config import get_config
+from schematizer.config import log
+from schematizer.logic import exceptions as sch_exc
+from schematizer.models.database import session
+
+
+_LOCK_NAME_PREFIX = 'schematizer.source.'
+
+_HELD_LOCKS_INFO_KEY = 'schematizer_held_source_locks'
+
+
+def get_source_lock_name(namespace_name, source_name):
+    """Get the name of the advisory lock of the given source. The names are
+    hashed because MySQL limits the length of the lock names to 64 chars.
+    """
+    fullname = '{}|{}'.format(namespace_name, source_name)
+    return _LOCK_NAME_PREFIX + hashlib.sha1(
+        fullname.encode('utf-8')
+    ).hexdigest()
+
+
+def lock_source(namespace_name, source_name, timeout=None):
+    """Acquire the advisory lock of the given source for the current session
+    transaction. It is a no-op if the lock has been acquired in the same
+    transaction.
+
+    :param timeout: seconds to wait for the lock. The default timeout is
+        `source_lock_timeout_seconds` config.
+    :raises schematizer.logic.exceptions.LockTimeoutException: the lock is
+        not acquired within the timeout.
+    """
+    lock_name = get_source_lock_name(namespace_name, source_name)
+    held_locks = session.info.setdefault(_HELD_LOCKS_INFO_KEY, {})
+    if lock_name in held_locks:
+        return
+
+    if timeout is None:
+        timeout = get_config().source_lock_timeout_seconds
+    connection = session.get_bind().connect()
+    try:
+        with uwsgi_metrics.timing(__name__, 'source_lock_wait'):
+            is_locked = connection.execute(
+                select([func.get_lock(lock_name, timeout)])
+            ).scalar()
+    except Exception:
+        connection.close()
+        raise
+    if is_locked != 1:
+        connection.close()
+        raise sch_exc.LockTimeoutException(
+            "Cannot acquire lock of namespace {0} source {1} within {2} "
+            "seconds.".format(namespace_name, source_name, timeout)
+        )
+    held_locks[lock_name] = connection
+
+
+def _release_locks(current_session, transaction):
+    # Only the end of the outermost transaction releases the locks; the
+    # savepoints and subtransactions end with their parent still in place.
+    if current_session.transaction is not None:
+        return
+    held_locks = current_session.info.pop(_HELD_LOCKS_INFO_KEY, None)
+    if not held_locks:
+        return
+    release_error = None
+    for lock_name, connection in held_locks.items():
+        try:
+            connection.execute(select([func.release_lock(lock_name)]))
+        except Exception as e:
+            log.exception('Failed to release source lock {}.'.format(
+                lock_name
+            ))
+            # MySQL releases the lock when the connection is closed.
+            connection.invalidate()
+            release_error = e
+        finally:
+            connection.close()
+    # The other locks are released before the error is raised.
+    if release_error is not None:
+        raise release_error
+
+
+event.listen(session, 'after_transaction_end', _release_locks)
@@ -23,10 +23,14 @@ from avro import schema
 from sqlalchemy import Column
 from sqlalchemy import ForeignKey
 from sqlalchemy import Integer
+from sqlalchemy import String
 from sqlalchemy import Text
 from sqlalchemy.orm import relationship
+from sqlalchemy.orm import validates
 from sqlalchemy.types import Enum
 
+from schematizer.helpers.avro_schema_cache import get_avro_schema_object
+from schematizer.helpers.avro_schema_cache import get_schema_fingerprint
 from schematizer.models.avro_schema_element import AvroSchemaElement
 from schematizer.models.base_model import BaseModel
 from schematizer.models.consumer import Consumer
@@ -45,6 +49,14 @@ class AvroSchemaStatus(object):
     DISABLED = 'Disabled'
 
 
+class _DecodedAvroSchema(object):
+
+    def __init__(self, avro_schema):
+        self.avro_schema = avro_schema
+        self.json = None
+        self.schema_object = None
+
+
 class AvroSchema(Base, BaseModel):
 
     __tablename__ = 'avro_schema'
@@ -54,6 +66,11 @@ class AvroSchema(Base, BaseModel):
     # The JSON string representation of the avro schema.
     avro_schema = Column('avro_schema', Text, nullable=False)
 
+    # The fingerprint of the canonical JSON representation of the avro schema.
+    # It is used to look up the schemas of the same content without decoding
+    # the JSON string of each schema, and is set whenever `avro_schema` is.
+    fingerprint = Column(String)
+
     # Id of the topic that the schema is associated to.
     # It is a foreign key to Topic table.
     topic_id = Column(
@@ -111,12 +128,53 @@ class AvroSchema(Base, BaseModel):
 
     @property
     def avro_schema_json(self):
-        return simplejson.loads(self.avro_schema)
+        """The decoded JSON object of the avro schema. It is decoded once and
+        cached on the instance until `avro_schema` changes, so the callers
+        must treat it as read-only.
+        """
+        decoded_schema = self._get_decoded_schema()
+        if decoded_schema.json is None:
+            decoded_schema.json = simplejson.loads(self.avro_schema)
+        return decoded_schema.json
 
     @avro_schema_json.setter
     def avro_schema_json(self, schema_json):
         self.avro_schema = simplejson.dumps(schema_json, sort_keys=True)
 
+    @validates('avro_schema')
+    def _set_fingerprint(self, key, avro_schema):
+        # The fingerprint is computed for every assignment of the schema,
+        # including the ones that do not go through `avro_schema_json`, so
+        # only the schemas registered before the column was added lack it.
+        self.fingerprint = get_schema_fingerprint(
+            simplejson.loads(avro_schema)
+        )
+        return avro_schema
+
+    @property
+    def avro_schema_object(self):
+        """The parsed Avro schema object of the avro schema. It is cached on
+        the instance until `avro_schema` changes, and is shared with the
+        process-wide parsed schema cache, so the callers must treat it as
+        read-only.
+        """
+        decoded_schema = self._get_decoded_schema()
+        if decoded_schema.schema_object is None:
+            decoded_schema.schema_object = get_avro_schema_object(
+                self.avro_schema_json
+            )
+        return decoded_schema.schema_object
+
+    def _get_decoded_schema(self):
+        # The cache is bound to the `avro_schema` string it is decoded from,
+        # so it is discarded when the column is set or reloaded.
+        decoded_schema = getattr(self, '_decoded_schema', None)
+        if (decoded_schema is None or
+                decoded_schema.avro_schema is not self.avro_schema):
+            decoded_schema = _DecodedAvroSchema(self.avro_schema)
+            self._decoded_schema = decoded_schema
+        return decoded_schema
+
     @property
     def avro_schema_with_doc(self):
         """Get the JSON representation of the Avro schema with the
@@ -125,6 +183,8 @@ class AvroSchema(Base, BaseModel):
         key_to_element_map = dict(
             (o.key, o) for o in self.avro_schema_elements
         )
+        # The docs are added to the parsed schema object, so it cannot use
+        # the shared parsed schema object from the cache.
         avro_schema_obj = schema.make_avsc_object(self.avro_schema_json)
 
         schema_elements = deque([(avro_schema_obj, None)])
@@ -174,7 +234,7 @@ class AvroSchema(Base, BaseModel):
 
     @classmethod
     def _create_schema_elements_from_json(cls, avro_schema_json):
-        avro_schema_obj = schema.make_avsc_object(avro_schema_json)
+        avro_schema_obj = get_avro_schema_object(avro_schema_json)
         schema_elements = []
         schema_elements_queue = deque([(avro_schema_obj, None)])
         while schema_elements_queue:
@@ -200,7 +260,7 @@ class AvroSchema(Base, BaseModel):
         second element is the error if it is not valid.
         """
         try:
-            schema.make_avsc_object(avro_schema_json)
+            get_avro_schema_object(avro_schema_json)
             return True, None
         except Exception as e:
             return False, repr(e)
@@ -38,16 +38,54 @@ class BaseModel(object):
         return result
 
     @classmethod
-    def get_all(cls, pagination=None):
-        qry = session.query(cls).order_by(cls.id)
+    def get_all(cls, pagination=None, batch_size=None):
+        """Get all the entities ordered by id. If `batch_size` is specified,
+        an iterator which loads `batch_size` entities at a time is returned
+        instead of a list, so that the entities can be processed without
+        loading all of them at once, see :meth:`iter_in_batches`.
+        """
+        qry = session.query(cls)
         # include `id` as part of `where` clause to avoid table scan
         # regardless whether the min_id is specified or not.
         min_id = pagination.min_id if pagination else 0
         qry = qry.filter(cls.id >= min_id)
-        if pagination and pagination.count > 0:
-            qry = qry.limit(pagination.count)
+        count = pagination.count if pagination else None
+        if batch_size:
+            return cls.iter_in_batches(qry, batch_size, count=count)
+        qry = qry.order_by(cls.id)
+        if count and count > 0:
+            qry = qry.limit(count)
         return qry.all()
 
+    @classmethod
+    def iter_in_batches(cls, qry, batch_size, count=None):
+        """Iterate over the entities of the given query, which must be neither
+        ordered nor limited, in the order of their ids. Each batch of at most
+        `batch_size` entities is loaded by its own query which continues from
+        the id of the last loaded entity, so the database driver, which
+        buffers the whole result of a query, never holds more than one batch.
+        At most `count` entities are returned if it is specified.
+        """
+        last_id = None
+        remaining_count = count if count and count > 0 else None
+        while True:
+            limit = batch_size
+            if remaining_count is not None:
+                limit = min(limit, remaining_count)
+                if limit <= 0:
+                    return
+            batch_qry = qry
+            if last_id is not None:
+                batch_qry = batch_qry.filter(cls.id > last_id)
+            entities = batch_qry.order_by(cls.id).limit(limit).all()
+            for entity in entities:
+                yield entity
+            if len(entities) < limit:
+                return
+            last_id = entities[-1].id
+            if remaining_count is not None:
+                remaining_count -= len(entities)
+
     @classmethod
     def create(cls, session, **kwargs):
         """Create this entity in the database.  Note this function will call
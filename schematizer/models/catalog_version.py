@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from sqlalchemy import BigInteger
+from sqlalchemy import Column
+from sqlalchemy import Integer
+
+from schematizer.models.base_model import BaseModel
+from schematizer.models.database import Base
+from schematizer.models.types.time import build_time_column
+
+
+class CatalogVersion(Base, BaseModel):
+    """This table has a single row whose version is increased by every write
+    that changes the topics, the schemas, or anything in their responses.
+    Processes compare the version with the one they last saw to find out
+    whether their local caches may be stale.
+    """
+
+    __tablename__ = 'catalog_version'
+
+    # Id of the single row of the table.
+    CATALOG_VERSION_ID = 1
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+
+    version = Column(BigInteger, nullable=False)
+
+    # Timestamp when the version is last increased
+    updated_at = build_time_column(
+        default_now=True,
+        onupdate_now=True,
+        nullable=False
+    )
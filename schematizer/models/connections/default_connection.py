@@ -16,22 +16,60 @@
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
+import random
+import threading
+import time
 from contextlib import contextmanager
 
 import yaml
 from sqlalchemy import create_engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm.scoping import ScopedSession
+from sqlalchemy.sql.expression import UpdateBase
 
+from schematizer.config import log
 
-def get_schematizer_session(topology_path, cluster_name):
+
+def get_schematizer_session(
+    topology_path,
+    cluster_name,
+    replica_name=None,
+    max_replica_lag_seconds=5,
+    replica_lag_check_interval_seconds=1
+):
+    """Create the scoped session of the master of the given cluster. If the
+    `replica_name` is specified, the entries of the cluster with that replica
+    in the topology are the read replicas of the session, see
+    :meth:_RoutingSession.use_replica.
+    """
     topology = _read_topology(topology_path)
     cluster_config = _get_cluster_config(
         topology,
         cluster_name
     )
     engine = _create_engine(cluster_config)
-    return _ScopedSession(sessionmaker(bind=engine))
+    replicas = []
+    if replica_name:
+        replicas = [
+            _Replica(_create_engine(replica_config), replica_config['host'])
+            for replica_config in _get_replica_configs(
+                topology,
+                cluster_name,
+                replica_name
+            )
+        ]
+    replica_pool = _ReplicaPool(
+        replicas,
+        max_lag_seconds=max_replica_lag_seconds,
+        lag_check_interval_seconds=replica_lag_check_interval_seconds
+    )
+    return _ScopedSession(sessionmaker(
+        class_=_RoutingSession,
+        bind=engine,
+        replica_pool=replica_pool
+    ))
 
 
 def _read_topology(topology_path):
@@ -52,21 +90,221 @@ def _create_engine(config):
 
 def _get_cluster_config(topology, cluster_name):
     for topo_item in topology.get('topology'):
-        if topo_item.get('cluster') == cluster_name:
+        if (topo_item.get('cluster') == cluster_name and
+                topo_item.get('replica', 'master') == 'master'):
             return topo_item['entries'][0]
 
 
+def _get_replica_configs(topology, cluster_name, replica_name):
+    return [
+        entry
+        for topo_item in topology.get('topology')
+        if (topo_item.get('cluster') == cluster_name and
+            topo_item.get('replica') == replica_name)
+        for entry in topo_item['entries']
+    ]
+
+
+class _Replica(object):
+    """A read replica of the master database, which keeps track of how far
+    its data is behind the master. The lag is read from `SHOW SLAVE STATUS`,
+    which requires the REPLICATION CLIENT privilege of the replica user.
+    """
+
+    def __init__(self, engine, name):
+        self.engine = engine
+        self.name = name
+        self._lock = threading.Lock()
+        self._checked_at = None
+        self._is_checking = False
+        self._replayed_until = None
+        self._is_available = True
+
+    def get_replayed_until(self, check_interval_seconds):
+        """Get the time until which the writes of the master have been
+        replayed on the replica, or None if it is unknown, e.g. the
+        replication is stopped or the replica is not reachable. The replica
+        lag is checked at most once per `check_interval_seconds`, and the
+        callers get the last known value while it is being checked.
+        """
+        with self._lock:
+            now = time.time()
+            if self._is_checking or (
+                self._checked_at is not None and
+                now - self._checked_at < check_interval_seconds
+            ):
+                return self._replayed_until
+            self._checked_at = now
+            self._is_checking = True
+
+        # The lock is not held during the check, so a slow replica does not
+        # block the other requests.
+        replayed_until = None
+        try:
+            replayed_until = self._check_replayed_until(now)
+        finally:
+            with self._lock:
+                self._replayed_until = replayed_until
+                self._is_checking = False
+        return replayed_until
+
+    def _check_replayed_until(self, now):
+        try:
+            with self.engine.connect() as conn:
+                status = conn.execute('SHOW SLAVE STATUS').first()
+        except SQLAlchemyError as e:
+            if _get_mysql_error_code(e) == _ER_SPECIFIC_ACCESS_DENIED_ERROR:
+                return self._mark_unavailable(
+                    "the replica user lacks the REPLICATION CLIENT "
+                    "privilege required to check the replica lag: "
+                    "{}".format(e)
+                )
+            return self._mark_unavailable(e)
+
+        if status is None:
+            # The database does not replicate from a master, e.g. the
+            # replica entry points to the master itself.
+            self._mark_available()
+            return now
+        lag_seconds = status['Seconds_Behind_Master']
+        if lag_seconds is None:
+            return self._mark_unavailable("replication is stopped")
+        self._mark_available()
+        # The lag is truncated to whole seconds.
+        return now - lag_seconds - 1
+
+    def _mark_available(self):
+        if not self._is_available:
+            log.info("Replica {} is available again.".format(self.name))
+        self._is_available = True
+
+    def _mark_unavailable(self, reason):
+        # Only the change is logged, since the lag is checked repeatedly.
+        if self._is_available:
+            log.error(
+                "Replica {} is disabled and reads go to the master until "
+                "it is available again: {}".format(self.name, reason)
+            )
+        self._is_available = False
+        return None
+
+
+# MySQL error returned when the user lacks a privilege the statement needs.
+_ER_SPECIFIC_ACCESS_DENIED_ERROR = 1227
+
+
+def _get_mysql_error_code(error):
+    args = getattr(getattr(error, 'orig', None), 'args', None)
+    return args[0] if args else None
+
+
+class _ReplicaPool(object):
+
+    def __init__(self, replicas, max_lag_seconds, lag_check_interval_seconds):
+        self.replicas = replicas
+        self.max_lag_seconds = max_lag_seconds
+        self.lag_check_interval_seconds = lag_check_interval_seconds
+
+    def choose_engine(self, written_at=None):
+        """Randomly choose the engine of a replica which is at most
+        `max_lag_seconds` behind the master and, if `written_at` is specified,
+        has replayed the writes of the master until that time.
+
+        :return: the engine of the chosen replica, or None if no replica is
+            up to date enough.
+        """
+        now = time.time()
+        engines = []
+        for replica in self.replicas:
+            replayed_until = replica.get_replayed_until(
+                self.lag_check_interval_seconds
+            )
+            if (replayed_until is not None and
+                    now - replayed_until <= self.max_lag_seconds and
+                    (written_at is None or written_at < replayed_until)):
+                engines.append(replica.engine)
+        return random.choice(engines) if engines else None
+
+
+class _RoutingSession(Session):
+    """Session which reads from a read replica once `use_replica` is called,
+    and keeps reading from the master otherwise. The writes always go to the
+    master, and once the session writes, it reads from the master again until
+    it is closed, so that it reads its own writes. `has_written` tells whether
+    the session has written since it was last closed.
+    """
+
+    def __init__(self, replica_pool=None, **kwargs):
+        super(_RoutingSession, self).__init__(**kwargs)
+        self.replica_pool = replica_pool
+        self._replica_bind = None
+        self._reading_from_master = 0
+        self.has_written = False
+
+    def use_replica(self, written_at=None):
+        """Read from a replica chosen by
+        :meth:_ReplicaPool.choose_engine until the session is closed or
+        writes. It keeps reading from the master if there is no replica up to
+        date enough.
+
+        Args:
+            written_at (Optional[float]): time of the last write of the
+                client, whose reads must see that write.
+
+        :return: whether the session reads from a replica.
+        """
+        if self.replica_pool is not None:
+            self._replica_bind = self.replica_pool.choose_engine(
+                written_at=written_at
+            )
+        return self.reads_from_replica
+
+    @property
+    def reads_from_replica(self):
+        return self._replica_bind is not None and not self._reading_from_master
+
+    @contextmanager
+    def reading_from_master(self):
+        """Read from the master within the context even if the session reads
+        from a replica otherwise.
+        """
+        self._reading_from_master += 1
+        try:
+            yield
+        finally:
+            self._reading_from_master -= 1
+
+    def get_bind(self, mapper=None, clause=None):
+        if self._flushing or isinstance(clause, UpdateBase):
+            self._replica_bind = None
+            self.has_written = True
+        elif self._replica_bind is not None and not self._reading_from_master:
+            return self._replica_bind
+        return super(_RoutingSession, self).get_bind(
+            mapper=mapper,
+            clause=clause
+        )
+
+    def close(self):
+        super(_RoutingSession, self).close()
+        self._replica_bind = None
+        self.has_written = False
+
+
 class _ScopedSession(ScopedSession):
     """ This is a wrapper over sqlalchamy ScopedSession that
     that does sql operations in a context manager. Commits
     happens on exit of context manager, rollback if there
     is an exception inside the context manager. Safely close the
-    session in the end.
+    session in the end. The session reads from a read replica
+    if `ro` is True.
     """
     @contextmanager
-    def connect_begin(self, *args, **kwargs):
+    def connect_begin(self, ro=False, *args, **kwargs):
         session = self()
         try:
+            if ro:
+                session.use_replica()
             yield session
             session.commit()
         except:
@@ -16,6 +16,8 @@
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
+from contextlib import contextmanager
+
 from schematizer.config import get_config
 from schematizer.environment_configs import FORCE_AVOID_INTERNAL_PACKAGES
 
@@ -35,9 +37,15 @@ def _get_schematizer_session(topology_path, cluster_name):
     except ImportError:
         from schematizer.models.connections.default_connection \
             import get_schematizer_session
+        config = get_config()
         return get_schematizer_session(
             topology_path=topology_path,
-            cluster_name=cluster_name
+            cluster_name=cluster_name,
+            replica_name=config.read_replica_name,
+            max_replica_lag_seconds=config.read_replica_max_lag_seconds,
+            replica_lag_check_interval_seconds=(
+                config.read_replica_lag_check_interval_seconds
+            )
         )
 
 
@@ -65,3 +73,19 @@ session = _get_schematizer_session(
     topology_path=get_config().topology_path,
     cluster_name=get_config().schematizer_cluster
 )
+
+
+@contextmanager
+def reading_from_master():
+    """Read from the master database within the context, even if the current
+    session reads from a read replica. The reads whose results outlive the
+    session, such as the ones that fill the caches, use it so that a lagging
+    replica does not put stale entities into the caches.
+    """
+    current_session = session()
+    if hasattr(current_session, 'reading_from_master'):
+        with current_session.reading_from_master():
+            yield
+    else:
+        # The sessions of yelp_conn choose the replica per connect_begin.
+        yield
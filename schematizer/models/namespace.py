@@ -70,7 +70,11 @@ class Namespace(Base, BaseModel):
                 entity_desc='{} name `{}`'.format(cls.__name__, name)
             )
 
-    def get_sources(self, page_info=None):
+    def get_sources(self, page_info=None, batch_size=None):
+        """Get the sources of this namespace ordered by id. If `batch_size` is
+        specified, an iterator which loads `batch_size` sources at a time is
+        returned instead of a list, see :meth:`BaseModel.iter_in_batches`.
+        """
         qry = session.query(
             Source
         ).filter(Source.namespace_id == self.id)
@@ -78,6 +82,12 @@ class Namespace(Base, BaseModel):
             qry = qry.filter(
                 Source.id >= page_info.min_id
             )
+        if batch_size:
+            return Source.iter_in_batches(
+                qry,
+                batch_size,
+                count=page_info.count if page_info else None
+            )
         qry = qry.order_by(Source.id)
         if page_info and page_info.count:
             qry = qry.limit(page_info.count)
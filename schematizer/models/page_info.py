@@ -24,8 +24,18 @@ class PageInfo(object):
         count (Optional[int]): maximum number of entries to return.
         min_id (Optional[int]): return entities of which the id is equal to or
             greater than this id.
+        priority (Optional[int]): for the entities sorted by descending
+            priority first, such as refreshes, return the entities of which
+            the priority is lower than this priority, or is equal to it and
+            the id is equal to or greater than min_id.
+        source_id (Optional[int]): for the entities sorted by source id first,
+            such as the refreshes of a namespace, return the entities of which
+            the source id is greater than this source id, or is equal to it
+            and the id is equal to or greater than min_id.
     """
 
-    def __init__(self, count=0, min_id=0):
+    def __init__(self, count=0, min_id=0, priority=None, source_id=None):
         self.count = count
         self.min_id = min_id
+        self.priority = priority
+        self.source_id = source_id
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from sqlalchemy import Column
+from sqlalchemy import Integer
+from sqlalchemy import String
+from sqlalchemy import UniqueConstraint
+
+from schematizer.models.base_model import BaseModel
+from schematizer.models.database import Base
+from schematizer.models.database import session
+from schematizer.models.types.time import build_time_column
+
+
+class SchemaCompatibilityVerdict(Base, BaseModel):
+    """This table stores whether the data serialized with the writer schema
+    can be deserialized with the reader schema. The schemas are identified by
+    the fingerprints of their canonical json, and since the schema json never
+    changes, a verdict stays valid once it is stored.
+    """
+
+    __tablename__ = 'schema_compatibility_verdict'
+    __table_args__ = (
+        UniqueConstraint(
+            'writer_fingerprint',
+            'reader_fingerprint',
+            name='writer_reader_fingerprint_unique_constraint'
+        ),
+    )
+
+    id = Column(Integer, primary_key=True)
+
+    # Fingerprint of the schema used to serialize the data.
+    writer_fingerprint = Column(String, nullable=False)
+
+    # Fingerprint of the schema used to deserialize the data.
+    reader_fingerprint = Column(String, nullable=False)
+
+    _is_compatible = Column('is_compatible', Integer, nullable=False)
+
+    @property
+    def is_compatible(self):
+        return bool(self._is_compatible)
+
+    @is_compatible.setter
+    def is_compatible(self, value):
+        if not isinstance(value, bool):
+            raise ValueError(
+                "Type of is_compatible should be bool."
+            )
+
+        self._is_compatible = int(value)
+
+    # Timestamp when the entry is created
+    created_at = build_time_column(
+        default_now=True,
+        nullable=False
+    )
+
+    @classmethod
+    def get_by_fingerprints(cls, writer_fingerprint, reader_fingerprint):
+        return session.query(
+            SchemaCompatibilityVerdict
+        ).filter(
+            cls.writer_fingerprint == writer_fingerprint,
+            cls.reader_fingerprint == reader_fingerprint
+        ).one_or_none()
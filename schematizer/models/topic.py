@@ -16,12 +16,14 @@
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
+import simplejson
 from data_pipeline_avro_util.data_pipeline.avro_meta_data \
     import AvroMetaDataKeys
 from sqlalchemy import Column
 from sqlalchemy import ForeignKey
 from sqlalchemy import Integer
 from sqlalchemy import String
+from sqlalchemy import Text
 from sqlalchemy import UniqueConstraint
 from sqlalchemy.orm import relationship
 
@@ -72,8 +74,18 @@ class Topic(Base, BaseModel):
 
     cluster_type = Column(String, nullable=False)
 
+    # JSON list of the primary keys of the topic, which are the primary keys
+    # of the first schema in the topic. It is set when the topic is created.
+    _primary_keys = Column('primary_keys', Text)
+
     @property
     def primary_keys(self):
+        if self._primary_keys is not None:
+            return simplejson.loads(self._primary_keys)
+
+        # The primary keys of the topics created before the primary_keys
+        # column was added are derived from their schemas until they are
+        # backfilled.
         if not self.avro_schemas:
             return []
 
@@ -82,6 +94,10 @@ class Topic(Base, BaseModel):
             []
         )
 
+    @primary_keys.setter
+    def primary_keys(self, value):
+        self._primary_keys = simplejson.dumps(value)
+
     # Timestamp when the entry is created
     created_at = build_time_column(
         default_now=True,
@@ -19,15 +19,25 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 import sys
+import time
 from collections import namedtuple
 
 import six
 from pyramid.interfaces import IExceptionResponse
 
 import schematizer.models.database
+from schematizer.config import get_config
+from schematizer.logic import catalog_version
 
 ExceptionInfo = namedtuple('ExceptionInfo', 'type exception traceback')
 
+# The requests of these methods do not write, and read from a read replica.
+READ_ONLY_METHODS = ('GET', 'HEAD')
+
+# The cookie which holds the time of the last write of the client, so that
+# the reads of the client only go to the replicas which have that write.
+WRITTEN_AT_COOKIE = 'schematizer_written_at'
+
 
 class AbortResponse(Exception):
     def __init__(self, response, exc_info):
@@ -41,6 +51,10 @@ def db_session_tween_factory(handler, registry):
     successfully this tween commits the session else it will rollback the
     session, finally it removes the session at the end of request.
     It also handles and reports appropriate request exceptions.
+
+    The read-only requests read from a read replica which has the last
+    write of the client, and the requests that write tell the client the
+    time of the write in the `WRITTEN_AT_COOKIE`.
     """
 
     session = schematizer.models.database.session
@@ -60,6 +74,8 @@ def db_session_tween_factory(handler, registry):
         response = None
         exc_info = None
         try:
+            if request.method in READ_ONLY_METHODS:
+                session().use_replica(written_at=_get_written_at(request))
             try:
                 response = handler(request)
             except Exception as e:
@@ -67,6 +83,8 @@ def db_session_tween_factory(handler, registry):
             if commit_veto(request, response, exc_info):
                 raise AbortResponse(response, exc_info)
             session.commit()
+            if response is not None and session().has_written:
+                _set_written_at(response, time.time())
             if exc_info:
                 six.reraise(
                     exc_info.type, exc_info.exception, exc_info.traceback)
@@ -83,3 +101,38 @@ def db_session_tween_factory(handler, registry):
         finally:
             session.remove()
     return session_tween
+
+
+def _get_written_at(request):
+    try:
+        return float(request.cookies[WRITTEN_AT_COOKIE])
+    except (KeyError, ValueError):
+        return None
+
+
+def _set_written_at(response, written_at):
+    # Once the replicas are within the max lag, they all have the write.
+    config = get_config()
+    response.set_cookie(
+        WRITTEN_AT_COOKIE,
+        value='{:.3f}'.format(written_at),
+        max_age=(
+            config.read_replica_max_lag_seconds +
+            config.read_replica_lag_check_interval_seconds
+        ),
+        httponly=True
+    )
+
+
+def catalog_version_tween_factory(handler, registry):
+    """This python tween clears the caches of the current process before
+    handling the request if the schema catalog has been changed by other
+    processes since it was last checked. The version is read on a separate
+    connection, so the transaction of the request does not start before the
+    view acquires its locks.
+    """
+
+    def catalog_version_tween(request):
+        catalog_version.sync_local_caches()
+        return handler(request)
+    return catalog_version_tween
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""This module backfills the `fingerprint` column of the existing Avro schemas
+which were registered before the column was added. The schemas are updated in
+batches, and each batch is committed in its own transaction, so the tool can
+be safely stopped and re-run. Once it is done, the
+`schema_fingerprint_fallback_enabled` config can be turned off, so that the
+re-registrations only look up the schemas by their fingerprints.
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+
+import simplejson
+
+from schematizer import models
+from schematizer.helpers.avro_schema_cache import get_schema_fingerprint
+from schematizer.models.database import session
+from schematizer.servlib.config_util import load_default_config
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Backfills the fingerprint of the Avro schemas whose '
+        'fingerprint has not been populated yet.'
+    )
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=500,
+        help='Number of schemas updated in each transaction. '
+             'Default is %(default)s.'
+    )
+    parser.add_argument(
+        '--dry-run',
+        action="store_true",
+        default=False,
+        required=False,
+        help="Instead of updating, this will print the number of schemas "
+             "to be backfilled"
+    )
+    return parser.parse_args()
+
+
+def get_schemas_without_fingerprint(min_id, batch_size):
+    return session.query(
+        models.AvroSchema.id,
+        models.AvroSchema.avro_schema
+    ).filter(
+        models.AvroSchema.id >= min_id,
+        models.AvroSchema.fingerprint.is_(None)
+    ).order_by(
+        models.AvroSchema.id
+    ).limit(
+        batch_size
+    ).all()
+
+
+def backfill_fingerprints(min_id, batch_size):
+    """Backfill the fingerprint of one batch of schemas with id greater than
+    or equal to min_id. It returns the id of the last schema in the batch, or
+    None if there are no more schemas to backfill.
+    """
+    schemas = get_schemas_without_fingerprint(min_id, batch_size)
+    for schema_id, avro_schema in schemas:
+        session.query(
+            models.AvroSchema
+        ).filter(
+            models.AvroSchema.id == schema_id
+        ).update(
+            {
+                models.AvroSchema.fingerprint: get_schema_fingerprint(
+                    simplejson.loads(avro_schema)
+                )
+            },
+            synchronize_session=False
+        )
+    return schemas[-1].id if schemas else None
+
+
+def count_schemas_without_fingerprint():
+    return session.query(
+        models.AvroSchema
+    ).filter(
+        models.AvroSchema.fingerprint.is_(None)
+    ).count()
+
+
+def run():
+    args = parse_args()
+    load_default_config("config.yaml")
+    if args.dry_run:
+        with session.connect_begin(ro=True):
+            print("{} schemas to be backfilled.".format(
+                count_schemas_without_fingerprint()
+            ))
+        return
+
+    min_id = 0
+    while True:
+        with session.connect_begin(ro=False):
+            last_schema_id = backfill_fingerprints(min_id, args.batch_size)
+        if last_schema_id is None:
+            break
+        min_id = last_schema_id + 1
+        print("Backfilled schemas up to id {}.".format(last_schema_id))
+    print("Done.")
+
+
+if __name__ == '__main__':
+    run()
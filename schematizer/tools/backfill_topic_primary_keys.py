@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""This module backfills the `primary_keys` column of the existing topics
+which were created before the column was added. The primary keys of a topic
+are the ones of its first schema. The topics are updated in batches, and each
+batch is committed in its own transaction, so the tool can be safely stopped
+and re-run.
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+
+import simplejson
+from data_pipeline_avro_util.data_pipeline.avro_meta_data \
+    import AvroMetaDataKeys
+
+from schematizer import models
+from schematizer.models.database import session
+from schematizer.servlib.config_util import load_default_config
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Backfills the primary keys of the topics whose '
+        'primary keys have not been populated yet.'
+    )
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=500,
+        help='Number of topics updated in each transaction. '
+             'Default is %(default)s.'
+    )
+    parser.add_argument(
+        '--dry-run',
+        action="store_true",
+        default=False,
+        required=False,
+        help="Instead of updating, this will print the number of topics "
+             "to be backfilled"
+    )
+    return parser.parse_args()
+
+
+def get_topic_ids_without_primary_keys(min_id, batch_size):
+    return [
+        topic_id for topic_id, in session.query(
+            models.Topic.id
+        ).filter(
+            models.Topic.id >= min_id,
+            models.Topic._primary_keys.is_(None)
+        ).order_by(
+            models.Topic.id
+        ).limit(
+            batch_size
+        )
+    ]
+
+
+def get_first_schema_json(topic_id):
+    avro_schema = session.query(
+        models.AvroSchema.avro_schema
+    ).filter(
+        models.AvroSchema.topic_id == topic_id
+    ).order_by(
+        models.AvroSchema.id
+    ).limit(
+        1
+    ).scalar()
+    return simplejson.loads(avro_schema) if avro_schema else {}
+
+
+def backfill_primary_keys(min_id, batch_size):
+    """Backfill the primary keys of one batch of topics with id greater than
+    or equal to min_id. It returns the id of the last topic in the batch, or
+    None if there are no more topics to backfill.
+    """
+    topic_ids = get_topic_ids_without_primary_keys(min_id, batch_size)
+    for topic_id in topic_ids:
+        primary_keys = get_first_schema_json(topic_id).get(
+            AvroMetaDataKeys.PRIMARY_KEY,
+            []
+        )
+        session.query(
+            models.Topic
+        ).filter(
+            models.Topic.id == topic_id
+        ).update(
+            {models.Topic._primary_keys: simplejson.dumps(primary_keys)},
+            synchronize_session=False
+        )
+    return topic_ids[-1] if topic_ids else None
+
+
+def count_topics_without_primary_keys():
+    return session.query(
+        models.Topic
+    ).filter(
+        models.Topic._primary_keys.is_(None)
+    ).count()
+
+
+def run():
+    args = parse_args()
+    load_default_config("config.yaml")
+    if args.dry_run:
+        with session.connect_begin(ro=True):
+            print("{} topics to be backfilled.".format(
+                count_topics_without_primary_keys()
+            ))
+        return
+
+    min_id = 0
+    while True:
+        with session.connect_begin(ro=False):
+            last_topic_id = backfill_primary_keys(min_id, args.batch_size)
+        if last_topic_id is None:
+            break
+        min_id = last_topic_id + 1
+        print("Backfilled topics up to id {}.".format(last_topic_id))
+    print("Done.")
+
+
+if __name__ == '__main__':
+    run()
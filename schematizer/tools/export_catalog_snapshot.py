@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""This module exports the schema catalog as a snapshot file for the clients
+to bootstrap from, see :mod:schematizer.logic.catalog_snapshot. Given the
+previous snapshot file as the base, only the entities created or updated
+since the base are queried, and the new snapshot is built by applying them
+to the base; or only the delta is written if `--delta` is specified.
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import itertools
+import os
+
+from schematizer.logic import catalog_snapshot
+from schematizer.models.database import session
+from schematizer.servlib.config_util import load_default_config
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Exports the schema catalog as a gzip-compressed json '
+        'lines snapshot file.'
+    )
+    parser.add_argument(
+        'output',
+        help='Path of the snapshot file to write.'
+    )
+    parser.add_argument(
+        '--base',
+        default=None,
+        help='Path of the previous snapshot file. The new snapshot is built '
+             'from it and the entities created or updated since it.'
+    )
+    parser.add_argument(
+        '--delta',
+        action="store_true",
+        default=False,
+        help='Only write the delta from the --base snapshot.'
+    )
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=1000,
+        help='Number of entities queried at a time. '
+             'Default is %(default)s.'
+    )
+    args = parser.parse_args()
+    if args.delta and not args.base:
+        parser.error('--delta requires --base.')
+    return args
+
+
+def export_snapshot(output_path, base_path=None, delta_only=False,
+                    batch_size=1000):
+    """Write the snapshot of the current catalog into the file of the given
+    path. The file is written under a temporary name and then renamed, so
+    that the readers never see a partial snapshot. It returns the header of
+    the written snapshot.
+    """
+    temp_path = output_path + '.tmp'
+    try:
+        with open(temp_path, 'wb') as output_file:
+            if base_path is None:
+                records = catalog_snapshot.iter_snapshot_records(
+                    batch_size=batch_size
+                )
+                header = _write_snapshot(output_file, records)
+            else:
+                with open(base_path, 'rb') as base_file:
+                    header = _write_snapshot_from_base(
+                        output_file,
+                        base_file,
+                        delta_only,
+                        batch_size
+                    )
+    except:
+        os.remove(temp_path)
+        raise
+    os.rename(temp_path, output_path)
+    return header
+
+
+def _write_snapshot_from_base(output_file, base_file, delta_only, batch_size):
+    base_records = catalog_snapshot.read_snapshot(base_file)
+    base_header = next(base_records)
+    records = catalog_snapshot.iter_snapshot_records(
+        since=base_header['position'],
+        batch_size=batch_size
+    )
+    if not delta_only:
+        records = catalog_snapshot.merge_snapshot(
+            itertools.chain([base_header], base_records),
+            records
+        )
+    return _write_snapshot(output_file, records)
+
+
+def _write_snapshot(output_file, records):
+    header = next(records)
+    catalog_snapshot.write_snapshot(
+        output_file,
+        itertools.chain([header], records)
+    )
+    return header
+
+
+def run():
+    args = parse_args()
+    load_default_config("config.yaml")
+    with session.connect_begin(ro=True):
+        header = export_snapshot(
+            args.output,
+            base_path=args.base,
+            delta_only=args.delta,
+            batch_size=args.batch_size
+        )
+    print("Exported the {} of catalog version {} to {}.".format(
+        'delta' if header['is_delta'] else 'snapshot',
+        header['catalog_version'],
+        args.output
+    ))
+
+
+if __name__ == '__main__':
+    run()
@@ -21,7 +21,6 @@ from avro import schema
 from pyramid.view import view_config
 
 from schematizer.api.decorators import log_api
-from schematizer.api.decorators import transform_api_response
 from schematizer.api.exceptions import exceptions_v1
 from schematizer.api.requests import requests_v1
 from schematizer.config import log
@@ -35,7 +34,6 @@ from schematizer.views import view_common
     request_method='POST',
     renderer='json'
 )
-@transform_api_response()
 @log_api()
 def is_avro_schema_compatible(request):
     try:
@@ -61,7 +59,6 @@ def is_avro_schema_compatible(request):
     request_method='POST',
     renderer='json'
 )
-@transform_api_response()
 @log_api()
 def is_mysql_schema_compatible(request):
     req = requests_v1.MysqlSchemaCompatibilityRequest(**request.json_body)
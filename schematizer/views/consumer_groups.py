@@ -20,23 +20,29 @@ from pyramid.view import view_config
 
 from schematizer import models
 from schematizer.api.decorators import log_api
-from schematizer.api.decorators import transform_api_response
 from schematizer.api.exceptions import exceptions_v1 as exc_v1
 from schematizer.api.requests import requests_v1
 from schematizer.api.responses import responses_v1 as resp_v1
 from schematizer.logic import registration_repository as reg_repo
 from schematizer.models import exceptions as sch_exc
+from schematizer.views.view_common import get_streaming_batch_size
+from schematizer.views.view_common import set_next_cursor
 
 
 @view_config(
     route_name='api.v1.get_consumer_groups',
     request_method='GET',
-    renderer='json'
+    renderer='streaming_json'
 )
-@transform_api_response()
 def get_consumer_groups(request):
-    return [resp_v1.get_consumer_group_response_from_consumer_group(group)
-            for group in models.ConsumerGroup.get_all()]
+    page_info = requests_v1.get_pagination_info(request.params)
+    groups = models.ConsumerGroup.get_all(
+        page_info,
+        batch_size=get_streaming_batch_size(page_info)
+    )
+    set_next_cursor(request, groups, page_info)
+    return (resp_v1.get_consumer_group_response_from_consumer_group(group)
+            for group in groups)
 
 
 @view_config(
@@ -44,7 +50,6 @@ def get_consumer_groups(request):
     request_method='GET',
     renderer='json'
 )
-@transform_api_response()
 def get_consumer_group_by_id(request):
     consumer_group_id = int(request.matchdict.get('consumer_group_id'))
     try:
@@ -59,7 +64,6 @@ def get_consumer_group_by_id(request):
     request_method='GET',
     renderer='json'
 )
-@transform_api_response()
 def get_data_sources_by_consumer_group_id(request):
     consumer_group_id = int(request.matchdict.get('consumer_group_id'))
     try:
@@ -79,7 +83,6 @@ def get_data_sources_by_consumer_group_id(request):
     request_method='POST',
     renderer='json'
 )
-@transform_api_response()
 @log_api()
 def create_consumer_group_data_source(request):
     consumer_group_id = int(request.matchdict.get('consumer_group_id'))
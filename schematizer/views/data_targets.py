@@ -20,23 +20,29 @@ from pyramid.view import view_config
 
 from schematizer import models
 from schematizer.api.decorators import log_api
-from schematizer.api.decorators import transform_api_response
 from schematizer.api.exceptions import exceptions_v1 as exc_v1
 from schematizer.api.requests import requests_v1
 from schematizer.api.responses import responses_v1 as resp_v1
 from schematizer.logic import registration_repository as reg_repo
 from schematizer.models import exceptions as sch_exc
+from schematizer.views.view_common import get_streaming_batch_size
+from schematizer.views.view_common import set_next_cursor
 
 
 @view_config(
     route_name='api.v1.get_data_targets',
     request_method='GET',
-    renderer='json'
+    renderer='streaming_json'
 )
-@transform_api_response()
 def get_data_targets(request):
-    return [resp_v1.get_data_target_response_from_data_target(data_target)
-            for data_target in models.DataTarget.get_all()]
+    page_info = requests_v1.get_pagination_info(request.params)
+    data_targets = models.DataTarget.get_all(
+        page_info,
+        batch_size=get_streaming_batch_size(page_info)
+    )
+    set_next_cursor(request, data_targets, page_info)
+    return (resp_v1.get_data_target_response_from_data_target(data_target)
+            for data_target in data_targets)
 
 
 @view_config(
@@ -44,7 +50,6 @@ def get_data_targets(request):
     request_method='POST',
     renderer='json'
 )
-@transform_api_response()
 @log_api()
 def create_data_target(request):
     try:
@@ -64,7 +69,6 @@ def create_data_target(request):
     request_method='GET',
     renderer='json'
 )
-@transform_api_response()
 def get_data_target_by_id(request):
     data_target_id = int(request.matchdict.get('data_target_id'))
     try:
@@ -79,7 +83,6 @@ def get_data_target_by_id(request):
     request_method='GET',
     renderer='json'
 )
-@transform_api_response()
 def get_data_target_by_name(request):
     data_target_name = request.matchdict.get('data_target_name')
     try:
@@ -94,7 +97,6 @@ def get_data_target_by_name(request):
     request_method='GET',
     renderer='json'
 )
-@transform_api_response()
 def get_consumer_groups_by_data_target_id(request):
     data_target_id = request.matchdict.get('data_target_id')
     try:
@@ -110,7 +112,6 @@ def get_consumer_groups_by_data_target_id(request):
     request_method='POST',
     renderer='json'
 )
-@transform_api_response()
 @log_api()
 def create_consumer_group(request):
     data_target_id = int(request.matchdict.get('data_target_id'))
@@ -129,7 +130,6 @@ def create_consumer_group(request):
     request_method='GET',
     renderer='json'
 )
-@transform_api_response()
 def get_topics_by_data_target_id(request):
     data_target_id = int(request.matchdict.get('data_target_id'))
     req = requests_v1.GetTopicsByDataTargetIdRequest(request.params)
@@ -18,7 +18,6 @@ from __future__ import unicode_literals
 
 from pyramid.view import view_config
 
-from schematizer.api.decorators import transform_api_response
 from schematizer.api.exceptions import exceptions_v1
 from schematizer.api.responses import responses_v1
 from schematizer.logic import meta_attribute_mappers as meta_attr_logic
@@ -72,7 +71,6 @@ def _delete_meta_attribute_mapping_for_entity(
     request_method='POST',
     renderer='json'
 )
-@transform_api_response()
 def register_namespace_meta_attribute_mapping(request):
     namespace_name = request.matchdict.get('namespace')
     meta_attr_schema_id = request.json_body['meta_attribute_schema_id']
@@ -92,7 +90,6 @@ def register_namespace_meta_attribute_mapping(request):
     request_method='DELETE',
     renderer='json'
 )
-@transform_api_response()
 def delete_namespace_meta_attribute_mapping(request):
     namespace_name = request.matchdict.get('namespace')
     meta_attr_schema_id = request.json_body['meta_attribute_schema_id']
@@ -112,7 +109,6 @@ def delete_namespace_meta_attribute_mapping(request):
     request_method='GET',
     renderer='json'
 )
-@transform_api_response()
 def get_namespace_meta_attribute_mappings(request):
     try:
         namespace_name = request.matchdict.get('namespace')
@@ -132,7 +128,6 @@ def get_namespace_meta_attribute_mappings(request):
     request_method='POST',
     renderer='json'
 )
-@transform_api_response()
 def register_source_meta_attribute_mapping(request):
     source_id = request.matchdict.get('source_id')
     meta_attr_schema_id = request.json_body['meta_attribute_schema_id']
@@ -148,7 +143,6 @@ def register_source_meta_attribute_mapping(request):
     request_method='DELETE',
     renderer='json'
 )
-@transform_api_response()
 def delete_source_meta_attribute_mapping(request):
     source_id = request.matchdict.get('source_id')
     meta_attr_schema_id = request.json_body['meta_attribute_schema_id']
@@ -164,7 +158,6 @@ def delete_source_meta_attribute_mapping(request):
     request_method='GET',
     renderer='json'
 )
-@transform_api_response()
 def get_source_meta_attribute_mappings(request):
     try:
         source_id = int(request.matchdict.get('source_id'))
@@ -18,59 +18,85 @@ from __future__ import unicode_literals
 
 from pyramid.view import view_config
 
-from schematizer.api.decorators import transform_api_response
 from schematizer.api.exceptions import exceptions_v1
 from schematizer.api.requests.requests_v1 import get_pagination_info
 from schematizer.api.responses import responses_v1
 from schematizer.logic import schema_repository
 from schematizer.models.exceptions import EntityNotFoundError
 from schematizer.models.namespace import Namespace
+from schematizer.views.view_common import get_streaming_batch_size
+from schematizer.views.view_common import set_next_cursor
 
 
 @view_config(
     route_name='api.v1.list_namespaces',
     request_method='GET',
-    renderer='json'
+    renderer='streaming_json'
 )
-@transform_api_response()
 def list_namespaces(request):
-    namespaces = Namespace.get_all()
-    return [responses_v1.get_namespace_response_from_namespace(namespace)
-            for namespace in namespaces]
+    page_info = get_pagination_info(request.params)
+    namespaces = Namespace.get_all(
+        page_info,
+        batch_size=get_streaming_batch_size(page_info)
+    )
+    set_next_cursor(request, namespaces, page_info)
+    return (responses_v1.get_namespace_response_from_namespace(namespace)
+            for namespace in namespaces)
 
 
 @view_config(
     route_name='api.v1.list_sources_by_namespace',
     request_method='GET',
-    renderer='json'
+    renderer='streaming_json'
 )
-@transform_api_response()
 def list_sources_by_namespace(request):
     namespace_name = request.matchdict.get('namespace')
     page_info = get_pagination_info(request.params)
     try:
-        sources = Namespace.get_by_name(namespace_name).get_sources(page_info)
-        return [responses_v1.get_source_response_from_source(source)
-                for source in sources]
+        namespace = Namespace.get_by_name(namespace_name)
     except EntityNotFoundError as e:
         raise exceptions_v1.entity_not_found_exception(e.message)
+    sources = namespace.get_sources(
+        page_info,
+        batch_size=get_streaming_batch_size(page_info)
+    )
+    set_next_cursor(request, sources, page_info)
+    return (responses_v1.get_source_response_from_source(source)
+            for source in sources)
 
 
 @view_config(
     route_name='api.v1.list_refreshes_by_namespace',
     request_method='GET',
-    renderer='json'
+    renderer='streaming_json'
 )
-@transform_api_response()
 def list_refreshes_by_namespace(request):
     namespace_name = request.matchdict.get('namespace')
+    page_info = get_pagination_info(request.params)
     try:
-        sources = Namespace.get_by_name(namespace_name).sources
+        refresh_rows = schema_repository.list_refreshes_by_namespace(
+            namespace_name,
+            page_info,
+            batch_size=get_streaming_batch_size(page_info)
+        )
     except EntityNotFoundError as e:
         raise exceptions_v1.entity_not_found_exception(e.message)
 
-    refreshes = []
-    for source in sources:
-        refreshes += schema_repository.list_refreshes_by_source_id(source.id)
-    return [responses_v1.get_refresh_response_from_refresh(refresh)
-            for refresh in refreshes]
+    # Refreshes are grouped by their sources, so the cursor has to carry the
+    # source id of the last refresh as well.
+    set_next_cursor(
+        request,
+        refresh_rows,
+        page_info,
+        get_position=lambda row: {
+            'source_id': row[0].source_id,
+            'min_id': row[0].id + 1
+        }
+    )
+    return (
+        responses_v1.get_refresh_response_from_refresh(
+            refresh,
+            source_name=src_name,
+            namespace_name=ns_name
+        ) for refresh, src_name, ns_name in refresh_rows
+    )
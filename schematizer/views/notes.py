@@ -19,7 +19,6 @@ from __future__ import unicode_literals
 from pyramid.view import view_config
 
 from schematizer.api.decorators import log_api
-from schematizer.api.decorators import transform_api_response
 from schematizer.api.exceptions import exceptions_v1
 from schematizer.api.requests import requests_v1
 from schematizer.api.responses import responses_v1
@@ -33,7 +32,6 @@ from schematizer.models.note import ReferenceTypeEnum
     request_method='POST',
     renderer='json'
 )
-@transform_api_response()
 @log_api()
 def create_note(request):
     req = requests_v1.CreateNoteRequest(**request.json_body)
@@ -68,7 +66,6 @@ def assert_reference_exists(reference_type, reference_id):
     request_method='POST',
     renderer='json'
 )
-@transform_api_response()
 @log_api()
 def update_note(request):
     req = requests_v1.UpdateNoteRequest(**request.json_body)
@@ -18,11 +18,12 @@ from __future__ import unicode_literals
 
 from pyramid.view import view_config
 
-from schematizer.api.decorators import transform_api_response
 from schematizer.api.exceptions import exceptions_v1
 from schematizer.api.requests import requests_v1
 from schematizer.api.responses import responses_v1
 from schematizer.logic import schema_repository
+from schematizer.views.view_common import get_streaming_batch_size
+from schematizer.views.view_common import set_next_cursor
 
 
 @view_config(
@@ -30,7 +31,6 @@ from schematizer.logic import schema_repository
     request_method='GET',
     renderer='json'
 )
-@transform_api_response()
 def get_refresh_by_id(request):
     refresh_id = request.matchdict.get('refresh_id')
     refresh = schema_repository.get_refresh_by_id(int(refresh_id))
@@ -44,7 +44,6 @@ def get_refresh_by_id(request):
     request_method='POST',
     renderer='json'
 )
-@transform_api_response()
 def update_refresh(request):
     refresh_id_str = request.matchdict.get('refresh_id')
     refresh_id = int(refresh_id_str)
@@ -63,9 +62,8 @@ def update_refresh(request):
 @view_config(
     route_name='api.v1.get_refreshes_by_criteria',
     request_method='GET',
-    renderer='json'
+    renderer='streaming_json'
 )
-@transform_api_response()
 def get_refreshes_by_criteria(request):
     criteria = requests_v1.GetRefreshesRequest(request.params)
 
@@ -73,7 +71,20 @@ def get_refreshes_by_criteria(request):
         namespace=criteria.namespace,
         status=criteria.status,
         created_after=criteria.created_after_datetime,
-        updated_after=criteria.updated_after_datetime
+        updated_after=criteria.updated_after_datetime,
+        page_info=criteria.page_info,
+        batch_size=get_streaming_batch_size(criteria.page_info)
+    )
+    # Refreshes are ordered by priority first, so the cursor has to carry
+    # the priority of the last refresh as well.
+    set_next_cursor(
+        request,
+        refreshes,
+        criteria.page_info,
+        get_position=lambda refresh: {
+            'priority': refresh.priority,
+            'min_id': refresh.id + 1
+        }
     )
-    return [responses_v1.get_refresh_response_from_refresh(refresh)
-            for refresh in refreshes]
+    return (responses_v1.get_refresh_response_from_refresh(refresh)
+            for refresh in refreshes)
@@ -19,7 +19,6 @@ from __future__ import unicode_literals
 import simplejson as json
 from pyramid.view import view_config
 
-from schematizer.api.decorators import transform_api_response
 from schematizer.api.exceptions import exceptions_v1
 from schematizer.components.converters.avro_to_redshift_converter \
     import AvroToRedshiftConverter
@@ -50,7 +49,6 @@ SCHEMA_MIGRATION_STRATEGY_MAP = {
     request_method='GET',
     renderer='json'
 )
-@transform_api_response()
 def get_schema_migration(request):
     new_schema_json = request.json_body.get('new_schema')
     old_schema_json = request.json_body.get('old_schema')
@@ -16,18 +16,29 @@
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
+import itertools
+from functools import partial
+
 import simplejson
+from pyramid.httpexceptions import HTTPError
 from pyramid.view import view_config
 
 from schematizer.api.decorators import log_api
-from schematizer.api.decorators import transform_api_response
 from schematizer.api.exceptions import exceptions_v1
 from schematizer.api.requests import requests_v1
 from schematizer.api.responses import responses_v1
 from schematizer.config import get_config
 from schematizer.config import log
+from schematizer.helpers.avro_schema_cache import get_schema_fingerprint
+from schematizer.helpers.single_flight import SingleFlight
+from schematizer.logic import doc_tool
+from schematizer.logic import exceptions as sch_exc
+from schematizer.logic import loading_profiles
 from schematizer.logic import registration_repository as reg_repo
 from schematizer.logic import schema_repository
+from schematizer.logic import schema_response_cache
+from schematizer.logic import schema_watcher
+from schematizer.models.database import session
 from schematizer.models.exceptions import EntityNotFoundError
 from schematizer.utils.utils import get_current_func_arg_name_values
 from schematizer.views import view_common
@@ -38,30 +49,106 @@ from schematizer.views import view_common
     request_method='GET',
     renderer='json'
 )
-@transform_api_response()
 def get_schema_by_id(request):
-    schema_id = request.matchdict.get('schema_id')
-    avro_schema = schema_repository.get_schema_by_id(int(schema_id))
-    if avro_schema is None:
+    schema_id = int(request.matchdict.get('schema_id'))
+    fields = requests_v1.get_field_selection(request.params)
+    cached_response = schema_response_cache.get_schema_response(
+        schema_id,
+        partial(_render_schema_response, schema_id)
+    )
+    if cached_response is None:
         raise exceptions_v1.schema_not_found_exception()
+
+    response, etag = cached_response
+    if fields is not None:
+        # The full response is cached, so the projection is applied to the
+        # cached response instead of loading only the selected fields.
+        response = fields.project(response)
+        etag = schema_response_cache.get_etag(response)
+
+    request.response.etag = etag
+    request.response.cache_control = 'public, max-age={}'.format(
+        get_config().schema_response_cache_ttl_seconds
+    )
+    if etag in request.if_none_match:
+        request.response.status_int = 304
+        return request.response
+    return response
+
+
+def _render_schema_response(schema_id):
+    avro_schema = schema_repository.get_schema_by_id(schema_id)
+    if avro_schema is None:
+        return None
     return responses_v1.get_schema_response_from_avro_schema(avro_schema)
 
 
 @view_config(
     route_name='api.v1.get_schemas_created_after',
     request_method='GET',
-    renderer='json'
+    renderer='streaming_json'
 )
-@transform_api_response()
 def get_schemas_created_after(request):
     req = requests_v1.GetSchemasRequest(request.params)
+    batch_size = get_config().streaming_response_batch_size
+    # Without a count, the request may cover the whole catalog, so the
+    # schemas are loaded and rendered batch by batch.
     schemas = schema_repository.get_schemas_created_after(
         created_after=req.created_after_datetime,
         page_info=req.page_info,
-        include_disabled=req.include_disabled
+        include_disabled=req.include_disabled,
+        loading_profile=loading_profiles.get_schema_response_profile(
+            req.fields
+        ),
+        batch_size=None if req.page_info.count else batch_size
     )
-    return [responses_v1.get_schema_response_from_avro_schema(avro_schema)
-            for avro_schema in schemas]
+    if req.page_info.count:
+        view_common.set_next_cursor(request, schemas, req.page_info)
+    return _get_schema_responses(schemas, batch_size, req.fields)
+
+
+@view_config(
+    route_name='api.v1.watch_schemas',
+    request_method='GET',
+    renderer='streaming_json'
+)
+def watch_schemas(request):
+    req = requests_v1.WatchSchemasRequest(request.params)
+    if not schema_watcher.wait_for_schemas_after(
+        req.after_id,
+        req.timeout_seconds
+    ):
+        return []
+    schemas = schema_repository.get_schemas_after_id(
+        req.after_id,
+        count=req.count,
+        loading_profile=loading_profiles.get_schema_response_profile(
+            req.fields
+        )
+    )
+    return _get_schema_responses(
+        schemas,
+        get_config().streaming_response_batch_size,
+        req.fields
+    )
+
+
+def _get_schema_responses(schemas, batch_size, fields=None):
+    """Generate the responses of the given schemas. The notes of the schemas
+    are fetched in one query for every `batch_size` schemas.
+    """
+    schemas = iter(schemas)
+    while True:
+        batch = list(itertools.islice(schemas, batch_size))
+        if not batch:
+            return
+        note_index = view_common.get_schema_note_index(batch, fields)
+        for avro_schema in batch:
+            yield responses_v1.get_schema_response_from_avro_schema(
+                avro_schema,
+                note_index=note_index,
+                fields=fields
+            )
 
 
 @view_config(
@@ -69,7 +156,6 @@ def get_schemas_created_after(request):
     request_method='POST',
     renderer='json'
 )
-@transform_api_response()
 @log_api()
 def register_schema(request):
     try:
@@ -100,12 +186,94 @@ def register_schema(request):
         )
 
 
+@view_config(
+    route_name='api.v1.register_schemas_in_batch',
+    request_method='POST',
+    renderer='json'
+)
+@log_api()
+def register_schemas_in_batch(request):
+    req = requests_v1.RegisterSchemasInBatchRequest(**request.json_body)
+    max_size = get_config().batch_registration_max_size
+    if len(req.schemas) > max_size:
+        raise exceptions_v1.invalid_request_exception(
+            'At most {} schemas can be registered in a batch.'.format(max_size)
+        )
+
+    # The requests that fail before reaching the schema repository are
+    # reported by their index, and the rest are registered together.
+    errors = {}
+    registrations = []
+    for index, item in enumerate(req.schemas):
+        try:
+            registrations.append(_get_registration(item))
+        except HTTPError as e:
+            errors[index] = e.detail
+
+    # The registrations are committed in chunks, and the ones that fail,
+    # e.g. because their sources cannot be locked, are reported by their
+    # results.
+    results = schema_repository.register_avro_schemas_from_avro_json_in_batch(
+        registrations,
+        chunk_size=get_config().batch_registration_chunk_size,
+        validation_workers=get_config().batch_registration_validation_workers
+    )
+
+    note_index = responses_v1.NoteIndex(
+        doc_tool.get_notes_by_schemas_and_elements(
+            [r.avro_schema for r in results if r.avro_schema is not None],
+            elements=[]
+        )
+    )
+    results = iter(results)
+    response = []
+    for index in range(len(req.schemas)):
+        if index in errors:
+            response.append(responses_v1.get_batch_registration_response(
+                index,
+                error=errors[index]
+            ))
+            continue
+        result = next(results)
+        response.append(responses_v1.get_batch_registration_response(
+            index,
+            avro_schema=result.avro_schema,
+            error=result.error,
+            note_index=note_index
+        ))
+    return response
+
+
+def _get_registration(req):
+    validate_names([req.namespace, req.source])
+    try:
+        schema_json = req.schema_json
+    except simplejson.JSONDecodeError as e:
+        raise exceptions_v1.invalid_schema_exception(
+            'Error "{error}" encountered decoding JSON: "{schema}"'.format(
+                error=str(e),
+                schema=req.schema
+            )
+        )
+    return {
+        'avro_schema_json': schema_json,
+        'namespace_name': req.namespace,
+        'source_name': req.source,
+        'source_owner_email': req.source_owner_email,
+        'contains_pii': req.contains_pii,
+        'cluster_type': req.cluster_type,
+        'base_schema_id': req.base_schema_id,
+        'docs_required': (
+            req.namespace not in get_config().namespace_no_doc_required
+        )
+    }
+
+
 @view_config(
     route_name='api.v1.register_schema_from_mysql_stmts',
     request_method='POST',
     renderer='json'
 )
-@transform_api_response()
 @log_api()
 def register_schema_from_mysql_stmts(request):
     req = requests_v1.RegisterSchemaFromMySqlRequest(**request.json_body)
@@ -126,6 +294,10 @@ def register_schema_from_mysql_stmts(request):
     )
 
 
+# Identical registrations in flight in this process are coalesced into one.
+_registration_flight = SingleFlight()
+
+
 def _register_avro_schema(
     schema_json,
     namespace,
@@ -135,6 +307,61 @@ def _register_avro_schema(
     cluster_type,
     base_schema_id=None,
     docs_required=True
+):
+    """Register the given schema and return the schema response. Identical
+    registrations that arrive while one is in flight in this process wait
+    for it and share its response instead of registering the schema again.
+
+    The coalescing is per process only. Identical registrations in other
+    processes are serialized by the source lock, and find the schema
+    registered by the first one.
+    """
+    registration = partial(
+        _register_avro_schema_and_get_response,
+        schema_json=schema_json,
+        namespace=namespace,
+        source=source,
+        source_owner_email=source_owner_email,
+        contains_pii=contains_pii,
+        cluster_type=cluster_type,
+        base_schema_id=base_schema_id,
+        docs_required=docs_required
+    )
+    if not get_config().registration_coalescing_enabled:
+        return registration()
+
+    registration_key = (
+        get_schema_fingerprint(schema_json),
+        namespace,
+        source,
+        source_owner_email,
+        contains_pii,
+        cluster_type,
+        base_schema_id,
+        docs_required
+    )
+    # The response is shared by the coalesced requests, and must not be
+    # modified. A shared registration is committed before its response is
+    # given to the coalesced requests, so that the schema is visible to
+    # their clients once they get the response. Otherwise the transaction
+    # ends with the request as usual.
+    return _registration_flight.do(
+        registration_key,
+        registration,
+        timeout=get_config().registration_coalescing_timeout_seconds,
+        before_share=lambda response: session.commit()
+    )
+
+
+def _register_avro_schema_and_get_response(
+    schema_json,
+    namespace,
+    source,
+    source_owner_email,
+    contains_pii,
+    cluster_type,
+    base_schema_id=None,
+    docs_required=True
 ):
     try:
         validate_names([namespace, source])
@@ -148,10 +375,15 @@ def _register_avro_schema(
             base_schema_id=base_schema_id,
             docs_required=docs_required
         )
-        return responses_v1.get_schema_response_from_avro_schema(avro_schema)
+        return responses_v1.get_schema_response_from_avro_schema(
+            avro_schema
+        )
     except ValueError as e:
         log.exception('{0}'.format(get_current_func_arg_name_values()))
         raise exceptions_v1.invalid_schema_exception(e.message)
+    except sch_exc.LockTimeoutException as e:
+        log.exception('{0}'.format(get_current_func_arg_name_values()))
+        raise exceptions_v1.lock_timeout_exception(e.message)
 
 
 @view_config(
@@ -159,7 +391,6 @@ def _register_avro_schema(
     request_method='GET',
     renderer='json'
 )
-@transform_api_response()
 def get_schema_elements_by_schema_id(request):
     schema_id = int(request.matchdict.get('schema_id'))
     # First check if schema exists
@@ -168,8 +399,19 @@ def get_schema_elements_by_schema_id(request):
         raise exceptions_v1.schema_not_found_exception()
     # Get schema elements
     elements = schema_repository.get_schema_elements_by_schema_id(schema_id)
-    return [responses_v1.get_element_response_from_element(element)
-            for element in elements]
+    note_index = responses_v1.NoteIndex(
+        doc_tool.get_notes_by_schemas_and_elements(
+            schemas=[],
+            elements=elements
+        )
+    )
+    return [
+        responses_v1.get_element_response_from_element(
+            element,
+            note_index=note_index
+        )
+        for element in elements
+    ]
 
 
 @view_config(
@@ -177,7 +419,6 @@ def get_schema_elements_by_schema_id(request):
     request_method='GET',
     renderer='json'
 )
-@transform_api_response()
 def get_meta_attributes_by_schema_id(request):
     try:
         schema_id = int(request.matchdict.get('schema_id'))
@@ -191,7 +432,6 @@ def get_meta_attributes_by_schema_id(request):
     request_method='GET',
     renderer='json'
 )
-@transform_api_response()
 def get_data_targets_by_schema_id(request):
     try:
         schema_id = int(request.matchdict.get('schema_id'))
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import itertools
+import tempfile
+
+from pyramid.response import FileIter
+from pyramid.view import view_config
+
+from schematizer.api import cursors
+from schematizer.api.requests import requests_v1
+from schematizer.config import get_config
+from schematizer.logic import catalog_snapshot
+
+
+# The response header of the catalog snapshots and deltas which holds the
+# position of the snapshot. Clients pass it back as the `since` query
+# parameter to get the delta from the snapshot.
+SNAPSHOT_POSITION_HEADER = 'X-Snapshot-Position'
+
+
+@view_config(
+    route_name='api.v1.get_catalog_snapshot',
+    request_method='GET'
+)
+def get_catalog_snapshot(request):
+    req = requests_v1.GetCatalogSnapshotRequest(request.params)
+    config = get_config()
+    records = catalog_snapshot.iter_snapshot_records(
+        since=req.since,
+        batch_size=config.streaming_response_batch_size
+    )
+    header = next(records)
+
+    # The snapshot is written into a temporary file within the transaction
+    # of the request, which spills to the disk for large catalogs.
+    body_file = tempfile.SpooledTemporaryFile(
+        max_size=config.streaming_response_spool_size
+    )
+    try:
+        catalog_snapshot.write_snapshot(
+            body_file,
+            itertools.chain([header], records)
+        )
+        content_length = body_file.tell()
+        body_file.seek(0)
+    except:
+        body_file.close()
+        raise
+
+    response = request.response
+    response.content_type = 'application/gzip'
+    response.content_disposition = 'attachment; filename="{}"'.format(
+        'catalog_delta.jsonl.gz' if req.since else 'catalog_snapshot.jsonl.gz'
+    )
+    response.headers[SNAPSHOT_POSITION_HEADER] = str(
+        cursors.encode_cursor(header['position'])
+    )
+    response.app_iter = FileIter(body_file)
+    response.content_length = content_length
+    return response
@@ -19,25 +19,31 @@ from __future__ import unicode_literals
 from pyramid.view import view_config
 
 from schematizer.api.decorators import log_api
-from schematizer.api.decorators import transform_api_response
 from schematizer.api.exceptions import exceptions_v1
 from schematizer.api.requests import requests_v1
 from schematizer.api.responses import responses_v1
 from schematizer.logic import doc_tool
+from schematizer.logic import loading_profiles
 from schematizer.logic import schema_repository
 from schematizer.models.source import Source
+from schematizer.views.view_common import get_streaming_batch_size
+from schematizer.views.view_common import set_next_cursor
 
 
 @view_config(
     route_name='api.v1.list_sources',
     request_method='GET',
-    renderer='json'
+    renderer='streaming_json'
 )
-@transform_api_response()
 def list_sources(request):
     req = requests_v1.GetSourcesRequest(request.params)
-    return [responses_v1.get_source_response_from_source(src)
-            for src in Source.get_all(req.page_info)]
+    sources = Source.get_all(
+        req.page_info,
+        batch_size=get_streaming_batch_size(req.page_info)
+    )
+    set_next_cursor(request, sources, req.page_info)
+    return (responses_v1.get_source_response_from_source(src)
+            for src in sources)
 
 
 @view_config(
@@ -45,7 +51,6 @@ def list_sources(request):
     request_method='GET',
     renderer='json'
 )
-@transform_api_response()
 def get_source_by_id(request):
     source_id = request.matchdict.get('source_id')
     source = schema_repository.get_source_by_id(int(source_id))
@@ -59,13 +64,17 @@ def get_source_by_id(request):
     request_method='GET',
     renderer='json'
 )
-@transform_api_response()
 def list_topics_by_source_id(request):
     source_id = int(request.matchdict.get('source_id'))
-    topics = schema_repository.get_topics_by_source_id(source_id)
+    fields = requests_v1.get_field_selection(request.params)
+    topics = schema_repository.get_topics_by_source_id(
+        source_id,
+        loading_profile=loading_profiles.get_topic_response_profile(fields)
+    )
     if not topics and not schema_repository.get_source_by_id(source_id):
         raise exceptions_v1.source_not_found_exception()
-    return [responses_v1.get_topic_response_from_topic(t) for t in topics]
+    return [responses_v1.get_topic_response_from_topic(t, fields=fields)
+            for t in topics]
 
 
 @view_config(
@@ -73,16 +82,19 @@ def list_topics_by_source_id(request):
     request_method='GET',
     renderer='json'
 )
-@transform_api_response()
 def get_latest_topic_by_source_id(request):
     source_id = int(request.matchdict.get('source_id'))
+    fields = requests_v1.get_field_selection(request.params)
     latest_topic = schema_repository.get_latest_topic_of_source_id(source_id)
     if not latest_topic:
         source = schema_repository.get_source_by_id(source_id)
         if not source:
             raise exceptions_v1.source_not_found_exception()
         raise exceptions_v1.latest_topic_not_found_exception()
-    return responses_v1.get_topic_response_from_topic(latest_topic)
+    return responses_v1.get_topic_response_from_topic(
+        latest_topic,
+        fields=fields
+    )
 
 
 @view_config(
@@ -90,7 +102,6 @@ def get_latest_topic_by_source_id(request):
     request_method='POST',
     renderer='json'
 )
-@transform_api_response()
 @log_api()
 def update_category(request):
     source_id = int(request.matchdict.get('source_id'))
@@ -116,7 +127,6 @@ def update_category(request):
     request_method='DELETE',
     renderer='json'
 )
-@transform_api_response()
 def delete_category(request):
     source_id = int(request.matchdict.get('source_id'))
     source = schema_repository.get_source_by_id(int(source_id))
@@ -136,7 +146,6 @@ def delete_category(request):
     request_method='POST',
     renderer='json'
 )
-@transform_api_response()
 def create_refresh(request):
     source_id = int(request.matchdict.get('source_id'))
     source = schema_repository.get_source_by_id(int(source_id))
@@ -159,7 +168,6 @@ def create_refresh(request):
     request_method='GET',
     renderer='json'
 )
-@transform_api_response()
 def list_refreshes_by_source_id(request):
     source_id = int(request.matchdict.get('source_id'))
     source = schema_repository.get_source_by_id(source_id)
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from pyramid.view import view_config
+
+from schematizer.helpers import avro_schema_cache
+from schematizer.logic import compatibility_verdict_store
+from schematizer.logic import lookup_cache
+from schematizer.logic import schema_response_cache
+
+
+@view_config(
+    route_name='status.caches',
+    request_method='GET',
+    renderer='json'
+)
+def get_cache_stats(request):
+    """Get the stats, including the hit ratio, of the caches of the current
+    process. The lookup cache may be shared with other processes, in which
+    case only the lookups of the current process are counted.
+    """
+    return {
+        name: _get_cache_stats_response(stats)
+        for name, stats in (
+            (
+                'parsed_avro_schema',
+                avro_schema_cache.get_parsed_schema_cache_stats()
+            ),
+            (
+                'compatibility_verdict',
+                compatibility_verdict_store.get_verdict_cache_stats()
+            ),
+            (
+                'schema_response',
+                schema_response_cache.get_schema_response_cache_stats()
+            ),
+            (
+                'lookup',
+                lookup_cache.get_lookup_cache_stats()
+            ),
+        )
+    }
+
+
+def _get_cache_stats_response(stats):
+    response = stats._asdict()
+    response['hit_ratio'] = stats.hit_ratio
+    return response
@@ -16,14 +16,21 @@
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
+from functools import partial
+
 from pyramid.view import view_config
 
-from schematizer.api.decorators import transform_api_response
+from schematizer.api import fields as api_fields
 from schematizer.api.exceptions import exceptions_v1
 from schematizer.api.requests import requests_v1
 from schematizer.api.responses import responses_v1
 from schematizer.logic import exceptions as sch_exc
+from schematizer.logic import loading_profiles
 from schematizer.logic import schema_repository
+from schematizer.logic import schema_response_cache
+from schematizer.views.view_common import get_schema_note_index
+from schematizer.views.view_common import get_streaming_batch_size
+from schematizer.views.view_common import set_next_cursor
 
 
 @view_config(
@@ -31,13 +38,13 @@ from schematizer.logic import schema_repository
     request_method='GET',
     renderer='json'
 )
-@transform_api_response()
 def get_topic_by_topic_name(request):
     topic_name = request.matchdict.get('topic_name')
+    fields = requests_v1.get_field_selection(request.params)
     topic = schema_repository.get_topic_by_name(topic_name)
     if topic is None:
         raise exceptions_v1.topic_not_found_exception()
-    return responses_v1.get_topic_response_from_topic(topic)
+    return responses_v1.get_topic_response_from_topic(topic, fields=fields)
 
 
 @view_config(
@@ -45,15 +52,27 @@ def get_topic_by_topic_name(request):
     request_method='GET',
     renderer='json'
 )
-@transform_api_response()
 def list_schemas_by_topic_name(request):
     topic_name = request.matchdict.get('topic_name')
+    fields = requests_v1.get_field_selection(request.params)
     try:
-        schemas = schema_repository.get_schemas_by_topic_name(topic_name)
+        schemas = schema_repository.get_schemas_by_topic_name(
+            topic_name,
+            loading_profile=loading_profiles.get_schema_response_profile(
+                fields
+            )
+        )
     except sch_exc.EntityNotFoundException:
         raise exceptions_v1.topic_not_found_exception()
-    return [responses_v1.get_schema_response_from_avro_schema(avro_schema)
-            for avro_schema in schemas]
+    note_index = get_schema_note_index(schemas, fields)
+    return [
+        responses_v1.get_schema_response_from_avro_schema(
+            avro_schema,
+            note_index=note_index,
+            fields=fields
+        )
+        for avro_schema in schemas
+    ]
 
 
 @view_config(
@@ -61,9 +80,9 @@ def list_schemas_by_topic_name(request):
     request_method='GET',
     renderer='json'
 )
-@transform_api_response()
 def get_latest_schema_by_topic_name(request):
     topic_name = request.matchdict.get('topic_name')
+    fields = requests_v1.get_field_selection(request.params)
     try:
         avro_schema = schema_repository.get_latest_schema_by_topic_name(
             topic_name
@@ -74,25 +93,33 @@ def get_latest_schema_by_topic_name(request):
     if avro_schema is None:
         raise exceptions_v1.latest_schema_not_found_exception()
 
-    return responses_v1.get_schema_response_from_avro_schema(avro_schema)
+    # The response of the schema is shared with `get_schema_by_id`.
+    cached_response = schema_response_cache.get_schema_response(
+        avro_schema.id,
+        partial(responses_v1.get_schema_response_from_avro_schema, avro_schema)
+    )
+    return api_fields.project(fields, cached_response.response)
 
 
 @view_config(
     route_name='api.v1.get_topics_by_criteria',
     request_method='GET',
-    renderer='json'
+    renderer='streaming_json'
 )
-@transform_api_response()
 def get_topics_by_criteria(request):
     # TODO [clin|DATAPIPE-1433] remove GetTopicRequest class
     criteria = requests_v1.GetTopicsRequest(request.params)
     pagination = requests_v1.get_pagination_info(request.params)
+    fields = requests_v1.get_field_selection(request.params)
 
     topics = schema_repository.get_topics_by_criteria(
         namespace=criteria.namespace,
         source=criteria.source,
         created_after=criteria.created_after_datetime,
-        page_info=pagination
+        page_info=pagination,
+        loading_profile=loading_profiles.get_topic_response_profile(fields),
+        batch_size=get_streaming_batch_size(pagination)
     )
-    return [responses_v1.get_topic_response_from_topic(topic)
-            for topic in topics]
+    set_next_cursor(request, topics, pagination)
+    return (responses_v1.get_topic_response_from_topic(topic, fields=fields)
+            for topic in topics)
@@ -17,14 +17,24 @@ from __future__ import absolute_import
 from __future__ import unicode_literals
 
 from schematizer import models
+from schematizer.api import cursors
+from schematizer.api import fields as api_fields
 from schematizer.api.exceptions import exceptions_v1
+from schematizer.api.responses import responses_v1
 from schematizer.components.converters import converter_base
 from schematizer.components.handlers import sql_handler
 from schematizer.components.handlers import sql_handler_base
+from schematizer.config import get_config
 from schematizer.config import log
+from schematizer.logic import doc_tool
 from schematizer.utils.utils import get_current_func_arg_name_values
 
 
+# The response header of the paginated list APIs which holds the cursor of
+# the next page. Clients pass it back as the `cursor` query parameter.
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+
+
 def convert_to_avro_from_mysql(
     schema_repo,
     new_create_table_stmt,
@@ -53,3 +63,52 @@ def convert_to_avro_from_mysql(
             converter_base.SchemaConversionException) as e:
         log.exception('{0}'.format(get_current_func_arg_name_values()))
         raise exceptions_v1.invalid_schema_exception(e.message)
+
+
+def set_next_cursor(request, entities, page_info, get_position=None):
+    """Set the cursor of the page after the given page of entities in the
+    response, if the page is full, i.e. there may be more entities.
+
+    Args:
+        entities (list): the entities of the current page, in order.
+        page_info (:class:schematizer.models.page_info.PageInfo): the page
+            info the entities are queried with.
+        get_position (Optional[function]): function that gets the position
+            the next page starts at from the last entity of the page. By
+            default the next page starts at the id after the last id.
+    """
+    if not page_info.count or len(entities) < page_info.count:
+        return
+    last_entity = entities[-1]
+    position = (
+        get_position(last_entity) if get_position
+        else {'min_id': last_entity.id + 1}
+    )
+    request.response.headers[NEXT_CURSOR_HEADER] = cursors.encode_cursor(
+        position
+    )
+
+
+def get_streaming_batch_size(page_info):
+    """Get the number of entities to load at a time for the given page info
+    of a list request, or None if the request asks for a bounded page.
+
+    A request without a count may cover the whole table, so its entities are
+    loaded and rendered batch by batch instead of in a single query.
+    """
+    if page_info.count:
+        return None
+    return get_config().streaming_response_batch_size
+
+
+def get_schema_note_index(schemas, fields=None):
+    """Get the :class:schematizer.api.responses.responses_v1.NoteIndex of the
+    notes of the given schemas, which are fetched with one query. No note is
+    fetched if the `note` field is not selected by the given
+    :class:schematizer.api.fields.FieldSelection.
+    """
+    if not api_fields.includes(fields, 'note'):
+        return responses_v1.NoteIndex([])
+    return responses_v1.NoteIndex(
+        doc_tool.get_notes_by_schemas_and_elements(schemas, elements=[])
+    )
@@ -21,6 +21,7 @@ import os
 import uwsgi_metrics
 from pyramid.config import Configurator
 from pyramid.tweens import EXCVIEW
+from pyramid.tweens import MAIN
 
 import schematizer.config
 import schematizer.models.database
@@ -110,6 +111,10 @@ def _create_application():
 
     # Add the service's custom configuration, routes, etc.
     config.include(schematizer.config.routes)
+    config.add_renderer(
+        'streaming_json',
+        'schematizer.api.renderers.StreamingJSONRenderer'
+    )
 
     try:
         # TODO(DATAPIPE-1506|abrar): Currently we have
@@ -141,6 +146,17 @@ def _create_application():
             under=EXCVIEW
         )
 
+    # Check the catalog version right before the views. The version is read
+    # on its own connection, outside the transaction of the request.
+    config.add_tween(
+        "schematizer.schematizer_tweens.catalog_version_tween_factory",
+        under=(
+            "schematizer.schematizer_tweens.db_session_tween_factory",
+            EXCVIEW
+        ),
+        over=MAIN
+    )
+
     # Include pyramid_swagger for REST endpoints (see ../api-docs/)
     config.include('pyramid_swagger')
 
@@ -18,6 +18,9 @@ from __future__ import unicode_literals
 
 from datetime import datetime
 
+from data_pipeline_avro_util.data_pipeline.avro_meta_data \
+    import AvroMetaDataKeys
+
 from schematizer import models
 from schematizer.models.avro_schema import AvroSchema
 from schematizer.models.database import session
@@ -135,6 +138,10 @@ def create_avro_schema(
         namespace_name=namespace,
         source_name=source
     )
+    # Same as the schema registration, the first schema of the topic decides
+    # the primary keys of the topic.
+    if not _topic_has_schema(topic.id):
+        topic.primary_keys = schema_json.get(AvroMetaDataKeys.PRIMARY_KEY, [])
 
     avro_schema = models.AvroSchema.create(
         session,
@@ -156,6 +163,14 @@ def create_avro_schema(
     return avro_schema
 
 
+def _topic_has_schema(topic_id):
+    return session.query(
+        models.AvroSchema.id
+    ).filter(
+        models.AvroSchema.topic_id == topic_id
+    ).first() is not None
+
+
 def create_note(reference_type, reference_id, note_text, last_updated_by):
     return models.Note.create(
         session,
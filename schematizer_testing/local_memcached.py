@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+A local stand-in of a memcached server for the tests. It serves the `get`,
+`set`, and `delete` commands of the memcached text protocol from memory,
+which is all the client of
+:class:schematizer.helpers.cache_backends.MemcacheBackend uses.
+"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import SocketServer
+import threading
+import time
+
+
+class LocalMemcachedServer(object):
+    """Memcached stand-in listening on a free local port. Use it as a context
+    manager, which starts the server and stops it on exit.
+    """
+
+    def __init__(self):
+        self.values = {}
+        self._lock = threading.Lock()
+        self._server = _ThreadingTCPServer(
+            ('127.0.0.1', 0),
+            _MemcachedRequestHandler
+        )
+        self._server.memcached = self
+        self._thread = None
+
+    @property
+    def host(self):
+        return self._server.server_address[0]
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def get(self, key):
+        with self._lock:
+            entry = self.values.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self.values[key]
+                return None
+            return value
+
+    def set(self, key, value, exptime):
+        expires_at = time.time() + exptime if exptime else None
+        with self._lock:
+            self.values[key] = (value, expires_at)
+
+    def delete(self, key):
+        with self._lock:
+            return self.values.pop(key, None) is not None
+
+
+class _ThreadingTCPServer(SocketServer.ThreadingTCPServer):
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _MemcachedRequestHandler(SocketServer.StreamRequestHandler):
+
+    def handle(self):
+        memcached = self.server.memcached
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            parts = line.split()
+            command = parts[0] if parts else b''
+            if command == b'get':
+                value = memcached.get(parts[1])
+                if value is not None:
+                    self.wfile.write(b'VALUE ' + parts[1] + b' 0 ' +
+                                     str(len(value)).encode('ascii') +
+                                     b'\r\n' + value + b'\r\n')
+                self.wfile.write(b'END\r\n')
+            elif command == b'set':
+                value = self.rfile.read(int(parts[4]) + 2)[:-2]
+                memcached.set(parts[1], value, int(parts[3]))
+                self.wfile.write(b'STORED\r\n')
+            elif command == b'delete':
+                deleted = memcached.delete(parts[1])
+                self.wfile.write(b'DELETED\r\n' if deleted
+                                 else b'NOT_FOUND\r\n')
+            else:
+                self.wfile.write(b'ERROR\r\n')
+            self.wfile.flush()
@@ -16,6 +16,10 @@
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
 from schematizer.models.database import session
 
 
@@ -30,3 +34,20 @@ def get_entity_by_kwargs(entity_cls, **filter_kwargs):
     for col in filter_kwargs:
         query.filter(getattr(entity_cls, col) == filter_kwargs[col])
     return query.all()
+
+
+@contextmanager
+def count_queries(engine):
+    """Collect the SQL statements executed on the given engine within the
+    context. It yields the list of the executed statements.
+    """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
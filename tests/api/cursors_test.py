@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import base64
+
+import pytest
+
+from schematizer.api import cursors
+
+
+class TestCursors(object):
+
+    @pytest.mark.parametrize('position', [
+        {'min_id': 1},
+        {'min_id': 101, 'priority': 50},
+    ])
+    def test_encode_and_decode(self, position):
+        cursor = cursors.encode_cursor(position)
+        assert cursors.decode_cursor(cursor) == position
+
+    def test_cursor_is_url_safe(self):
+        cursor = cursors.encode_cursor({'min_id': 2 ** 40 - 1})
+        assert all(c.isalnum() or c in '-_=' for c in cursor)
+
+    @pytest.mark.parametrize('cursor', [
+        'foo',
+        '',
+        base64.urlsafe_b64encode(b'[1]').decode('ascii'),
+        base64.urlsafe_b64encode(b'{"priority":1}').decode('ascii'),
+        base64.urlsafe_b64encode(b'{"min_id":"1"}').decode('ascii'),
+    ])
+    def test_invalid_cursor(self, cursor):
+        with pytest.raises(ValueError):
+            cursors.decode_cursor(cursor)
+
+    def test_decode_with_required_keys(self):
+        cursor = cursors.encode_cursor({'foo': 1})
+        assert cursors.decode_cursor(cursor, required_keys=('foo',)) == {
+            'foo': 1
+        }
+        with pytest.raises(ValueError):
+            cursors.decode_cursor(cursor)
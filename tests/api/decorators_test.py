@@ -16,8 +16,6 @@
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
-import copy
-
 import pytest
 from mock import call
 from mock import Mock
@@ -29,8 +27,6 @@ from sqlalchemy.orm.exc import NoResultFound
 
 from schematizer.api.decorators import handle_view_exception
 from schematizer.api.decorators import log_api
-from schematizer.api.decorators import transform_api_response
-from schematizer.helpers.formatting import _format_datetime
 from tests.models.testing_db import DBTestCase
 
 
@@ -65,70 +61,6 @@ class TestHandleViewExceptionDecorator(DBTestCase):
             assert str(e) == no_result_found_err_message
 
 
-class TestTransformResponseDecorator(DBTestCase):
-
-    @pytest.fixture
-    def source_response(self, biz_source):
-        return {
-            'source_id': biz_source.id,
-            'namespace': self._get_namespace_resp(biz_source.namespace),
-            'name': biz_source.name,
-            'owner_email': biz_source.owner_email,
-            'created_at': _format_datetime(biz_source.created_at),
-            'updated_at': _format_datetime(biz_source.updated_at)
-        }
-
-    def _get_namespace_resp(self, namespace):
-        return {
-            'namespace_id': namespace.id,
-            'name': namespace.name,
-            'created_at': _format_datetime(namespace.created_at),
-            'updated_at': _format_datetime(namespace.updated_at)
-        }
-
-    @pytest.fixture
-    def sources_response(self, source_response):
-        return [source_response]
-
-    def test_transform_api_response_of_object_list(self, sources_response):
-        request_mock = Mock()
-        expected_response = copy.deepcopy(sources_response)
-
-        @transform_api_response()
-        def _view_mock_return_list_of_sources(request):
-            return sources_response
-
-        actual_response = _view_mock_return_list_of_sources(request_mock)
-        for actual, expected in zip(actual_response, expected_response):
-            assert actual == expected
-
-    def test_transform_api_response_of_single_object(self, source_response):
-        request_mock = Mock()
-        expected = copy.deepcopy(source_response)
-
-        @transform_api_response()
-        def _view_mock_return_source(request):
-            return source_response
-
-        actual = _view_mock_return_source(request_mock)
-        assert actual == expected
-
-    @pytest.mark.parametrize("data, expected", [
-        ({'good': 1, 'bad': None}, {'good': 1}),
-        (
-            [{'good': 1, 'bad': None}, {'good': 2, 'bad': None}],
-            [{'good': 1}, {'good': 2}]
-        )
-    ])
-    def test_none_fields_removed_from_api_response(self, data, expected):
-        @transform_api_response()
-        def _mock_pass_request_as_response(pass_through_response):
-            return pass_through_response
-
-        actual = _mock_pass_request_as_response(data)
-        assert actual == expected
-
-
 class TestLogApiDecorator(object):
 
     @pytest.fixture
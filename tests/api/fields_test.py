@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import pytest
+
+from schematizer.api import fields
+from schematizer.api.fields import FieldSelection
+
+
+class TestFieldSelection(object):
+
+    @pytest.fixture
+    def response(self):
+        return {
+            'schema_id': 1,
+            'schema': '{}',
+            'topic': {
+                'name': 'foo',
+                'source': {'name': 'bar', 'namespace': {'name': 'baz'}}
+            }
+        }
+
+    @pytest.mark.parametrize('fields_param', [None, '', ',', ' . '])
+    def test_parse_no_fields(self, fields_param):
+        assert FieldSelection.parse(fields_param) is None
+
+    def test_parse_nested_fields(self):
+        selection = FieldSelection.parse('schema_id, topic.name')
+        assert selection.includes('schema_id')
+        assert selection.get('schema_id') is None
+        assert selection.includes('topic')
+        assert selection.get('topic').includes('name')
+        assert not selection.get('topic').includes('source')
+        assert not selection.includes('schema')
+
+    @pytest.mark.parametrize('fields_param', [
+        'topic,topic.name',
+        'topic.name,topic',
+    ])
+    def test_whole_object_overrides_its_fields(self, fields_param):
+        selection = FieldSelection.parse(fields_param)
+        assert selection.includes('topic')
+        assert selection.get('topic') is None
+
+    def test_project(self, response):
+        selection = FieldSelection.parse(
+            'schema_id,topic.source.namespace,unknown'
+        )
+        assert selection.project(response) == {
+            'schema_id': 1,
+            'topic': {'source': {'namespace': {'name': 'baz'}}}
+        }
+        assert response['topic']['name'] == 'foo'
+
+    def test_all_fields(self, response):
+        assert fields.includes(None, 'schema')
+        assert fields.get_subfields(None, 'topic') is None
+        assert fields.project(None, response) is response
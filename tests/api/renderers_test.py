@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import pytest
+import simplejson
+import staticconf.testing
+from pyramid.request import Request
+from pyramid.response import Response
+
+from schematizer.api.renderers import StreamingJSONRenderer
+
+
+class TestStreamingJSONRenderer(object):
+
+    @pytest.fixture
+    def pyramid_request(self):
+        pyramid_request = Request.blank('/')
+        pyramid_request.response = Response()
+        return pyramid_request
+
+    @pytest.fixture
+    def renderer(self):
+        return StreamingJSONRenderer(info=None)
+
+    def _render(self, renderer, pyramid_request, value):
+        result = renderer(value, {'request': pyramid_request})
+        assert result is None
+        return pyramid_request.response
+
+    @pytest.mark.parametrize('value', [
+        [],
+        [{'id': 1}],
+        [{'id': 1, 'name': 'foo'}, {'id': 2, 'name': 'é'}],
+    ])
+    def test_render_list(self, renderer, pyramid_request, value):
+        response = self._render(renderer, pyramid_request, value)
+        assert response.content_type == 'application/json'
+        assert response.content_length == len(response.body)
+        assert simplejson.loads(response.body) == value
+
+    def test_render_generator(self, renderer, pyramid_request):
+        items = ({'id': i} for i in range(3))
+        response = self._render(renderer, pyramid_request, items)
+        assert simplejson.loads(response.body) == [
+            {'id': 0}, {'id': 1}, {'id': 2}
+        ]
+
+    def test_spool_large_response_to_disk(self, renderer, pyramid_request):
+        value = [{'id': i, 'name': 'x' * 100} for i in range(100)]
+        with staticconf.testing.MockConfiguration(
+            {'streaming_response_spool_size': 1024}
+        ):
+            response = self._render(renderer, pyramid_request, value)
+        assert simplejson.loads(response.body) == value
+
+    def test_error_fails_rendering(self, renderer, pyramid_request):
+        def items():
+            yield {'id': 1}
+            raise ValueError()
+
+        with pytest.raises(ValueError):
+            self._render(renderer, pyramid_request, items())
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from datetime import datetime
+
+import pytest
+
+from schematizer import models
+from schematizer.api.fields import FieldSelection
+from schematizer.api.responses import responses_v1
+
+
+class TestResponsesV1(object):
+    """The responses are built from entities that are not added to the
+    session, so that the tests do not need a database.
+    """
+
+    @property
+    def now(self):
+        return datetime(2016, 1, 1, 12, 30, 15)
+
+    @property
+    def now_str(self):
+        return '2016-01-01T12:30:15Z'
+
+    @pytest.fixture
+    def namespace(self):
+        return models.Namespace(
+            id=1,
+            name='yelp',
+            created_at=self.now,
+            updated_at=self.now
+        )
+
+    @pytest.fixture
+    def source(self, namespace):
+        return models.Source(
+            id=2,
+            name='biz',
+            owner_email='test@yelp.com',
+            namespace=namespace,
+            created_at=self.now,
+            updated_at=self.now
+        )
+
+    @pytest.fixture
+    def topic(self, source):
+        return models.Topic(
+            id=3,
+            name='yelp.biz.1',
+            source=source,
+            contains_pii=False,
+            cluster_type='datapipe',
+            primary_keys=['id'],
+            created_at=self.now,
+            updated_at=self.now
+        )
+
+    @pytest.fixture
+    def avro_schema(self, topic):
+        return models.AvroSchema(
+            id=4,
+            avro_schema='{"type": "record", "name": "biz", "fields": []}',
+            status=models.AvroSchemaStatus.READ_AND_WRITE,
+            topic=topic,
+            created_at=self.now,
+            updated_at=self.now
+        )
+
+    @pytest.fixture
+    def schema_note(self, avro_schema):
+        return models.Note(
+            id=5,
+            reference_type=models.ReferenceTypeEnum.SCHEMA,
+            reference_id=avro_schema.id,
+            note='biz schema',
+            last_updated_by='test@yelp.com',
+            created_at=self.now,
+            updated_at=self.now
+        )
+
+    def test_source_without_category(self, source):
+        actual = responses_v1.get_source_response_from_source(source)
+        assert actual == {
+            'source_id': 2,
+            'name': 'biz',
+            'owner_email': 'test@yelp.com',
+            'namespace': {
+                'namespace_id': 1,
+                'name': 'yelp',
+                'created_at': self.now_str,
+                'updated_at': self.now_str
+            },
+            'created_at': self.now_str,
+            'updated_at': self.now_str
+        }
+
+    def test_source_with_category(self, source):
+        source.category = models.SourceCategory(category='business')
+        actual = responses_v1.get_source_response_from_source(source)
+        assert actual['category'] == 'business'
+
+    def test_schema_with_selected_fields(self, avro_schema):
+        # The topic has no source, so the response must not read the
+        # relationships of the fields that are not selected.
+        avro_schema.topic.source = None
+        actual = responses_v1.get_schema_response_from_avro_schema(
+            avro_schema,
+            fields=FieldSelection.parse('schema_id,schema,topic.name')
+        )
+        assert actual == {
+            'schema_id': 4,
+            'schema': '{"type": "record", "name": "biz", "fields": []}',
+            'topic': {'name': 'yelp.biz.1'}
+        }
+
+    def test_schema_with_selected_nested_fields(self, avro_schema):
+        actual = responses_v1.get_schema_response_from_avro_schema(
+            avro_schema,
+            fields=FieldSelection.parse('schema_id,topic.source')
+        )
+        assert actual == {
+            'schema_id': 4,
+            'topic': {
+                'source': responses_v1.get_source_response_from_source(
+                    avro_schema.topic.source
+                )
+            }
+        }
+
+    def test_topic_with_selected_fields(self, topic):
+        topic.source.namespace = None
+        actual = responses_v1.get_topic_response_from_topic(
+            topic,
+            fields=FieldSelection.parse('topic_id,source.name')
+        )
+        assert actual == {'topic_id': 3, 'source': {'name': 'biz'}}
+
+    def test_schema_without_optional_fields(self, avro_schema):
+        actual = responses_v1.get_schema_response_from_avro_schema(
+            avro_schema,
+            note_index=responses_v1.NoteIndex([])
+        )
+        assert actual == {
+            'schema_id': 4,
+            'schema': avro_schema.avro_schema,
+            'status': models.AvroSchemaStatus.READ_AND_WRITE,
+            'topic': responses_v1.get_topic_response_from_topic(
+                avro_schema.topic
+            ),
+            'primary_keys': [],
+            'created_at': self.now_str,
+            'updated_at': self.now_str
+        }
+
+    def test_schema_with_optional_fields(self, avro_schema, schema_note):
+        avro_schema.base_schema_id = 1
+        actual = responses_v1.get_schema_response_from_avro_schema(
+            avro_schema,
+            note_index=responses_v1.NoteIndex([schema_note])
+        )
+        assert actual['base_schema_id'] == 1
+        assert actual['note'] == {
+            'id': 5,
+            'reference_type': models.ReferenceTypeEnum.SCHEMA,
+            'reference_id': 4,
+            'note': 'biz schema',
+            'last_updated_by': 'test@yelp.com',
+            'created_at': self.now_str,
+            'updated_at': self.now_str
+        }
+
+    def test_element_without_doc(self, avro_schema):
+        element = models.AvroSchemaElement(
+            id=6,
+            avro_schema_id=avro_schema.id,
+            key='biz|id',
+            element_type='int',
+            created_at=self.now,
+            updated_at=self.now
+        )
+        actual = responses_v1.get_element_response_from_element(
+            element,
+            note_index=responses_v1.NoteIndex([])
+        )
+        assert actual == {
+            'id': 6,
+            'schema_id': 4,
+            'element_type': 'int',
+            'key': 'biz|id',
+            'created_at': self.now_str,
+            'updated_at': self.now_str
+        }
+
+    def test_failed_batch_registration(self):
+        actual = responses_v1.get_batch_registration_response(
+            1,
+            error='invalid schema'
+        )
+        assert actual == {'index': 1, 'error': 'invalid schema'}
+
+    def test_refresh_without_optional_fields(self, source):
+        refresh = models.Refresh(
+            id=7,
+            source=source,
+            status=models.RefreshStatus.NOT_STARTED.value,
+            offset=0,
+            batch_size=500,
+            priority=models.Priority.MEDIUM.value,
+            created_at=self.now,
+            updated_at=self.now
+        )
+        actual = responses_v1.get_refresh_response_from_refresh(refresh)
+        assert 'filter_condition' not in actual
+        assert 'avg_rows_per_second_cap' not in actual
+
+    def test_refresh_with_given_names(self):
+        # No source is attached, so the response must not read the
+        # relationships of the refresh.
+        refresh = models.Refresh(
+            id=7,
+            source_id=3,
+            status=models.RefreshStatus.NOT_STARTED.value,
+            offset=0,
+            batch_size=500,
+            priority=models.Priority.MEDIUM.value,
+            created_at=self.now,
+            updated_at=self.now
+        )
+        actual = responses_v1.get_refresh_response_from_refresh(
+            refresh,
+            source_name='biz',
+            namespace_name='yelp'
+        )
+        assert actual['source_name'] == 'biz'
+        assert actual['namespace_name'] == 'yelp'
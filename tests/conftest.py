@@ -20,6 +20,9 @@ import pytest
 import staticconf.testing
 
 from schematizer import models
+from schematizer.logic import compatibility_verdict_store
+from schematizer.logic import lookup_cache
+from schematizer.logic import schema_response_cache
 from schematizer_testing import factories
 
 
@@ -253,6 +256,30 @@ def mock_namespace_whitelist():
         yield
 
 
+@pytest.yield_fixture(autouse=True)
+def clear_compatibility_verdict_cache():
+    # Compatibility checks are mocked in some tests, so the cached verdicts
+    # must not leak into the other tests.
+    yield
+    compatibility_verdict_store.clear_verdict_cache()
+
+
+@pytest.yield_fixture(autouse=True)
+def clear_schema_response_cache():
+    # Schema ids are reused across the tests, so the cached responses must
+    # not leak into the other tests.
+    yield
+    schema_response_cache.clear_schema_response_cache()
+
+
+@pytest.yield_fixture(autouse=True)
+def clear_lookup_cache():
+    # Topic and schema ids are reused across the tests, so the cached
+    # lookups must not leak into the other tests.
+    yield
+    lookup_cache.clear_lookup_cache()
+
+
 @pytest.fixture
 def meta_attr_namespace():
     return factories.create_namespace('yelp_meta')
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import pytest
+from avro import schema
+
+from schematizer.helpers import avro_schema_cache
+
+
+class TestAvroSchemaCache(object):
+
+    @pytest.yield_fixture(autouse=True)
+    def clean_cache(self):
+        avro_schema_cache.clear_parsed_schema_cache()
+        yield
+        avro_schema_cache.clear_parsed_schema_cache()
+
+    @pytest.fixture
+    def schema_json(self):
+        return {
+            "type": "record",
+            "name": "foo",
+            "doc": "foo table",
+            "fields": [{"name": "id", "type": "int", "doc": "id"}]
+        }
+
+    def test_fingerprint_ignores_key_order(self, schema_json):
+        reordered_json = {
+            "fields": [{"doc": "id", "type": "int", "name": "id"}],
+            "doc": "foo table",
+            "name": "foo",
+            "type": "record"
+        }
+        assert (avro_schema_cache.get_schema_fingerprint(schema_json) ==
+                avro_schema_cache.get_schema_fingerprint(reordered_json))
+
+    def test_fingerprint_of_different_schemas(self, schema_json):
+        new_schema_json = dict(schema_json, doc='new doc')
+        assert (avro_schema_cache.get_schema_fingerprint(schema_json) !=
+                avro_schema_cache.get_schema_fingerprint(new_schema_json))
+
+    def test_get_avro_schema_object(self, schema_json):
+        actual = avro_schema_cache.get_avro_schema_object(schema_json)
+        assert actual == schema.make_avsc_object(schema_json)
+
+    def test_parsed_schema_object_is_reused(self, schema_json):
+        stats_before = avro_schema_cache.get_parsed_schema_cache_stats()
+        first = avro_schema_cache.get_avro_schema_object(schema_json)
+        second = avro_schema_cache.get_avro_schema_object(dict(schema_json))
+
+        assert first is second
+        stats = avro_schema_cache.get_parsed_schema_cache_stats()
+        assert stats.hits - stats_before.hits == 1
+        assert stats.misses - stats_before.misses == 1
+
+    def test_invalid_schema_is_not_cached(self):
+        invalid_json = {"type": "record", "name": "foo"}
+        with pytest.raises(schema.SchemaParseException):
+            avro_schema_cache.get_avro_schema_object(invalid_json)
+        assert avro_schema_cache.get_parsed_schema_cache_stats().size == 0
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import pytest
+
+from schematizer.helpers.cache_backends import LRUCacheBackend
+from schematizer.helpers.cache_backends import MemcacheBackend
+from schematizer_testing.local_memcached import LocalMemcachedServer
+
+
+class TestLRUCacheBackend(object):
+
+    @pytest.fixture
+    def backend(self):
+        return LRUCacheBackend(max_size=2)
+
+    def test_set_get_and_delete(self, backend):
+        assert backend.get('foo') is None
+        backend.set('foo', b'bar')
+        assert backend.get('foo') == b'bar'
+        backend.delete('foo')
+        assert backend.get('foo') is None
+        assert backend.stats.hits == 1
+        assert backend.stats.misses == 2
+
+
+class TestMemcacheBackend(object):
+
+    @pytest.yield_fixture
+    def server(self):
+        with LocalMemcachedServer() as server:
+            yield server
+
+    @pytest.yield_fixture
+    def backend(self, server):
+        backend = MemcacheBackend(server.host, server.port, ttl_seconds=60)
+        yield backend
+        backend.close()
+
+    def test_get_missing_key(self, backend):
+        assert backend.get('foo') is None
+        assert backend.stats.misses == 1
+
+    def test_set_and_get(self, backend):
+        value = b'line 1\r\nline 2\x00\xff'
+        backend.set('foo', value)
+        assert backend.get('foo') == value
+        assert backend.stats.hits == 1
+
+    def test_key_with_whitespace(self, backend, server):
+        key = 'topic:{}'.format('a b ' * 100)
+        backend.set(key, b'bar')
+        assert backend.get(key) == b'bar'
+        [memcache_key] = server.values.keys()
+        assert memcache_key.startswith(b'schematizer:')
+        assert len(memcache_key) < 250
+
+    def test_set_with_ttl(self, backend, server):
+        backend.set('foo', b'bar')
+        _, expires_at = server.values.values()[0]
+        assert expires_at is not None
+
+    def test_delete(self, backend):
+        backend.set('foo', b'bar')
+        backend.delete('foo')
+        backend.delete('foo')
+        assert backend.get('foo') is None
+
+    def test_reconnect_after_server_closes_connection(self, server):
+        backend = MemcacheBackend(server.host, server.port)
+        backend.set('foo', b'bar')
+        backend._client.sock.close()
+        assert backend.get('foo') is None
+        assert backend.get('foo') == b'bar'
+        backend.close()
+
+    def test_unreachable_server_is_cache_miss(self):
+        backend = MemcacheBackend('127.0.0.1', 1)
+        backend.set('foo', b'bar')
+        backend.delete('foo')
+        assert backend.get('foo') is None
+        backend.close()
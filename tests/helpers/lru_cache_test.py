@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import threading
+
+import mock
+import pytest
+
+from schematizer.helpers.lru_cache import CacheStats
+from schematizer.helpers.lru_cache import LRUCache
+
+
+class TestLRUCache(object):
+
+    @pytest.fixture
+    def cache(self):
+        return LRUCache(max_size=2)
+
+    def test_get_missing_key(self, cache):
+        assert cache.get('foo') is None
+        assert cache.get('foo', 'bar') == 'bar'
+        assert cache.stats == CacheStats(
+            hits=0, misses=2, evictions=0, size=0, max_size=2
+        )
+
+    def test_set_and_get(self, cache):
+        cache.set('foo', 1)
+        assert cache.get('foo') == 1
+        assert 'foo' in cache
+        assert cache.stats == CacheStats(
+            hits=1, misses=0, evictions=0, size=1, max_size=2
+        )
+
+    def test_evict_least_recently_used_entry(self, cache):
+        cache.set('foo', 1)
+        cache.set('bar', 2)
+        cache.get('foo')
+        cache.set('baz', 3)
+
+        assert 'bar' not in cache
+        assert cache.get('foo') == 1
+        assert cache.get('baz') == 3
+        assert cache.stats.evictions == 1
+        assert len(cache) == 2
+
+    def test_get_or_create(self, cache):
+        calls = []
+
+        def create_value():
+            calls.append(1)
+            return 'value'
+
+        assert cache.get_or_create('foo', create_value) == 'value'
+        assert cache.get_or_create('foo', create_value) == 'value'
+        assert len(calls) == 1
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+
+    def test_get_or_create_does_not_cache_failure(self, cache):
+        def create_value():
+            raise ValueError()
+
+        with pytest.raises(ValueError):
+            cache.get_or_create('foo', create_value)
+        assert 'foo' not in cache
+
+    def test_delete_and_clear(self, cache):
+        cache.set('foo', 1)
+        cache.set('bar', 2)
+        cache.delete('foo')
+        assert 'foo' not in cache
+
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_invalid_max_size(self):
+        with pytest.raises(ValueError):
+            LRUCache(max_size=0)
+
+    def test_invalid_ttl_seconds(self):
+        with pytest.raises(ValueError):
+            LRUCache(max_size=2, ttl_seconds=0)
+
+    def test_expired_entry_is_a_miss(self):
+        cache = LRUCache(max_size=2, ttl_seconds=10)
+        with mock.patch('time.time', return_value=100.0) as mock_time:
+            cache.set('foo', 1)
+            mock_time.return_value = 109.0
+            assert cache.get('foo') == 1
+
+            mock_time.return_value = 110.0
+            assert cache.get('foo') is None
+            assert 'foo' not in cache
+            assert cache.stats == CacheStats(
+                hits=1, misses=1, evictions=0, size=0, max_size=2
+            )
+
+    def test_hit_ratio(self, cache):
+        assert cache.stats.hit_ratio == 0.0
+
+        cache.set('foo', 1)
+        cache.get('foo')
+        cache.get('foo')
+        cache.get('bar')
+        cache.get('baz')
+        assert cache.stats.hit_ratio == 0.5
+
+    def test_concurrent_access_is_bounded(self):
+        cache = LRUCache(max_size=10)
+
+        def populate(offset):
+            for i in range(100):
+                cache.get_or_create(offset + i, lambda: i)
+
+        threads = [
+            threading.Thread(target=populate, args=(n * 100,))
+            for n in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = cache.stats
+        assert stats.size == 10
+        assert stats.misses == 500
+        assert stats.evictions == 490
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import threading
+
+import mock
+import pytest
+
+from schematizer.helpers.shared_poller import SharedPoller
+
+
+class TestSharedPoller(object):
+
+    @pytest.fixture
+    def poll_func(self):
+        return mock.Mock(return_value=10)
+
+    @pytest.fixture
+    def poller(self, poll_func):
+        return SharedPoller(poll_func, poll_interval_seconds=0.01)
+
+    def test_value_above_threshold(self, poller, poll_func):
+        assert poller.wait_for_value_above(9, timeout_seconds=1) == 10
+        assert poller.wait_for_value_above(9, timeout_seconds=1) == 10
+        assert poll_func.call_count == 1
+
+    def test_wait_times_out(self, poller, poll_func):
+        assert poller.wait_for_value_above(10, timeout_seconds=0.05) == 10
+        assert 1 < poll_func.call_count < 10
+
+    def test_wait_with_zero_timeout_polls_once(self, poller, poll_func):
+        assert poller.wait_for_value_above(10, timeout_seconds=0) == 10
+        assert poll_func.call_count == 1
+
+    def test_value_never_decreases(self, poller, poll_func):
+        poller.wait_for_value_above(9, timeout_seconds=0)
+        poll_func.return_value = 5
+        assert poller.wait_for_value_above(10, timeout_seconds=0.05) == 10
+
+    def test_wait_until_value_increases(self, poller, poll_func):
+        poll_func.side_effect = [10, 10, 11]
+        assert poller.wait_for_value_above(10, timeout_seconds=1) == 11
+        assert poll_func.call_count == 3
+
+    def test_waiters_share_polls(self):
+        values = iter(xrange(100))
+        poll_func = mock.Mock(side_effect=lambda: next(values))
+        poller = SharedPoller(poll_func, poll_interval_seconds=0.05)
+        results = []
+
+        def wait():
+            results.append(
+                poller.wait_for_value_above(2, timeout_seconds=5)
+            )
+
+        threads = [threading.Thread(target=wait) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == [3] * 20
+        assert poll_func.call_count == 4
+
+    def test_poll_failure(self, poller, poll_func):
+        poll_func.side_effect = [ValueError(), 11]
+        with pytest.raises(ValueError):
+            poller.wait_for_value_above(10, timeout_seconds=1)
+        assert poller.wait_for_value_above(10, timeout_seconds=1) == 11
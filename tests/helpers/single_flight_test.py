@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import threading
+import time
+
+import pytest
+
+from schematizer.helpers.single_flight import SingleFlight
+from schematizer.helpers.single_flight import SingleFlightStats
+
+
+class TestSingleFlight(object):
+
+    @pytest.fixture
+    def single_flight(self):
+        return SingleFlight()
+
+    @pytest.fixture
+    def leader_started(self):
+        return threading.Event()
+
+    @pytest.fixture
+    def leader_release(self):
+        return threading.Event()
+
+    def start_leader(self, single_flight, leader_started, leader_release,
+                     leader_func=None, before_share=None):
+        results = []
+
+        def blocking_func():
+            leader_started.set()
+            leader_release.wait()
+            if leader_func:
+                return leader_func()
+            return 'leader'
+
+        def run():
+            try:
+                results.append(single_flight.do(
+                    'foo',
+                    blocking_func,
+                    before_share=before_share
+                ))
+            except ValueError as e:
+                results.append(e)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        leader_started.wait()
+        return thread, results
+
+    def start_follower(self, single_flight, func, timeout=None):
+        results = []
+        thread = threading.Thread(
+            target=lambda: results.append(
+                single_flight.do('foo', func, timeout=timeout)
+            )
+        )
+        thread.start()
+        return thread, results
+
+    def wait_for_coalesced_calls(self, single_flight, count):
+        while single_flight.stats.coalesced_calls < count:
+            time.sleep(0.001)
+
+    def test_run_func_without_in_flight_call(self, single_flight):
+        assert single_flight.do('foo', lambda: 'bar') == 'bar'
+        assert single_flight.do('foo', lambda: 'baz') == 'baz'
+        assert single_flight.stats == SingleFlightStats(
+            leader_calls=2,
+            coalesced_calls=0,
+            in_flight=0
+        )
+
+    def test_coalesce_in_flight_calls(
+        self,
+        single_flight,
+        leader_started,
+        leader_release
+    ):
+        leader, leader_results = self.start_leader(
+            single_flight,
+            leader_started,
+            leader_release
+        )
+        followers = [
+            self.start_follower(single_flight, lambda: 'follower')
+            for _ in range(3)
+        ]
+        self.wait_for_coalesced_calls(single_flight, 3)
+        assert single_flight.stats.in_flight == 1
+
+        leader_release.set()
+        leader.join()
+        for thread, _ in followers:
+            thread.join()
+
+        assert leader_results == ['leader']
+        assert [results for _, results in followers] == [['leader']] * 3
+        assert single_flight.stats == SingleFlightStats(
+            leader_calls=1,
+            coalesced_calls=3,
+            in_flight=0
+        )
+
+    def test_call_before_share_only_with_waiting_callers(
+        self,
+        single_flight,
+        leader_started,
+        leader_release
+    ):
+        shared_results = []
+        assert single_flight.do(
+            'foo',
+            lambda: 'bar',
+            before_share=shared_results.append
+        ) == 'bar'
+        assert shared_results == []
+
+        leader, leader_results = self.start_leader(
+            single_flight,
+            leader_started,
+            leader_release,
+            before_share=shared_results.append
+        )
+        follower, follower_results = self.start_follower(
+            single_flight,
+            lambda: 'follower'
+        )
+        self.wait_for_coalesced_calls(single_flight, 1)
+
+        leader_release.set()
+        leader.join()
+        follower.join()
+
+        assert shared_results == ['leader']
+        assert leader_results == ['leader']
+        assert follower_results == ['leader']
+
+    def test_followers_run_func_if_before_share_fails(
+        self,
+        single_flight,
+        leader_started,
+        leader_release
+    ):
+        def fail(result):
+            raise ValueError()
+
+        leader, leader_results = self.start_leader(
+            single_flight,
+            leader_started,
+            leader_release,
+            before_share=fail
+        )
+        follower, follower_results = self.start_follower(
+            single_flight,
+            lambda: 'follower'
+        )
+        self.wait_for_coalesced_calls(single_flight, 1)
+
+        leader_release.set()
+        leader.join()
+        follower.join()
+
+        assert isinstance(leader_results[0], ValueError)
+        assert follower_results == ['follower']
+
+    def test_followers_run_func_if_leader_fails(
+        self,
+        single_flight,
+        leader_started,
+        leader_release
+    ):
+        def fail():
+            raise ValueError()
+
+        leader, leader_results = self.start_leader(
+            single_flight,
+            leader_started,
+            leader_release,
+            leader_func=fail
+        )
+        follower, follower_results = self.start_follower(
+            single_flight,
+            lambda: 'follower'
+        )
+        self.wait_for_coalesced_calls(single_flight, 1)
+
+        leader_release.set()
+        leader.join()
+        follower.join()
+
+        assert isinstance(leader_results[0], ValueError)
+        assert follower_results == ['follower']
+
+    def test_follower_runs_func_after_timeout(
+        self,
+        single_flight,
+        leader_started,
+        leader_release
+    ):
+        leader, _ = self.start_leader(
+            single_flight,
+            leader_started,
+            leader_release
+        )
+        follower, follower_results = self.start_follower(
+            single_flight,
+            lambda: 'follower',
+            timeout=0
+        )
+        follower.join()
+        leader_release.set()
+        leader.join()
+
+        assert follower_results == ['follower']
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import datetime
+import io
+
+import mock
+import pytest
+
+from schematizer import models
+from schematizer.logic import catalog_snapshot
+from schematizer.logic import doc_tool
+from schematizer.logic import schema_repository
+from schematizer.models.database import session
+from schematizer_testing import factories
+from tests.models.testing_db import DBTestCase
+
+
+class TestCatalogSnapshot(DBTestCase):
+
+    @pytest.yield_fixture(autouse=True)
+    def no_update_margin(self):
+        # The entities of the tests are created within the same second, so
+        # the updates are told apart by mocking the time of the snapshots.
+        with mock.patch.object(catalog_snapshot, 'UPDATE_MARGIN_SECONDS', 0):
+            yield
+
+    def create_schema(self, name, topic_name):
+        return factories.create_avro_schema(
+            {
+                "type": "record",
+                "name": name,
+                "namespace": "foo_namespace",
+                "fields": [{"name": "bar", "type": "int", "doc": "bar"}],
+                "doc": "table {}".format(name)
+            },
+            topic_name=topic_name,
+            namespace='foo_namespace',
+            source='foo_source'
+        )
+
+    @pytest.fixture
+    def schema(self):
+        return self.create_schema('foo', 'foo_topic')
+
+    @pytest.fixture
+    def meta_attr_mapping(self, schema):
+        return factories.create_meta_attribute_mapping(
+            schema.id,
+            models.Namespace.__name__,
+            schema.topic.source.namespace_id
+        )
+
+    def get_snapshot(self, since=None):
+        return list(catalog_snapshot.iter_snapshot_records(since=since))
+
+    def get_snapshot_at(self, timestamp, since=None):
+        with mock.patch.object(
+            catalog_snapshot.time,
+            'time',
+            return_value=timestamp
+        ):
+            return self.get_snapshot(since=since)
+
+    def get_record_ids(self, records):
+        return [
+            (record['type'], catalog_snapshot._get_record_key(record)[1])
+            for record in records
+        ]
+
+    def test_snapshot(self, schema, meta_attr_mapping):
+        header, namespace, source, topic, schema_record, mapping = (
+            self.get_snapshot()
+        )
+
+        assert header['type'] == 'header'
+        assert header['format_version'] == catalog_snapshot.FORMAT_VERSION
+        assert not header['is_delta']
+        assert header['position']['schema'] == schema.id
+        assert header['complete_types'] == list(
+            catalog_snapshot.RECORD_TYPES
+        )
+        assert namespace['name'] == 'foo_namespace'
+        assert source['namespace_id'] == namespace['namespace_id']
+        assert topic['source_id'] == source['source_id']
+        assert schema_record['topic_id'] == topic['topic_id']
+        assert schema_record['schema'] == schema.avro_schema
+        assert mapping['id'] == meta_attr_mapping.id
+
+    def test_snapshot_in_batches(self, schema):
+        other_schema = self.create_schema('bar', 'bar_topic')
+        records = list(catalog_snapshot.iter_snapshot_records(batch_size=1))
+        schema_ids = [
+            record['schema_id'] for record in records
+            if record['type'] == 'schema'
+        ]
+        assert schema_ids == [schema.id, other_schema.id]
+
+    def test_delta(self, schema, meta_attr_mapping):
+        base_header = self.get_snapshot_at(0)[0]
+        new_schema = self.create_schema('bar', 'bar_topic')
+        base_header['position']['updated_since'] = 2 ** 31 - 1
+
+        delta = self.get_snapshot(since=base_header['position'])
+
+        assert delta[0]['is_delta']
+        assert delta[0]['base_position'] == base_header['position']
+        assert delta[0]['complete_types'] == ['meta_attribute_mapping']
+        assert self.get_record_ids(delta[1:]) == [
+            ('topic', new_schema.topic_id),
+            ('schema', new_schema.id),
+            ('meta_attribute_mapping', meta_attr_mapping.id),
+        ]
+
+    def test_delta_includes_updated_entities(self, schema):
+        # Move the existing entities out of the update window of the base.
+        an_hour_ago = datetime.datetime.utcnow() - datetime.timedelta(hours=1)
+        for model in (models.Namespace, models.Source, models.Topic,
+                      models.AvroSchema):
+            session.query(model).update(
+                {'updated_at': an_hour_ago},
+                synchronize_session=False
+            )
+        base_header = self.get_snapshot()[0]
+
+        schema_repository.mark_schema_disabled(schema.id)
+        doc_tool.create_source_category(schema.topic.source_id, 'foo')
+        delta = self.get_snapshot(since=base_header['position'])
+
+        records = dict((record['type'], record) for record in delta[1:])
+        assert set(records) == {'source', 'schema'}
+        assert records['schema']['status'] == (
+            models.AvroSchemaStatus.DISABLED
+        )
+        assert records['source']['category'] == 'foo'
+
+    def test_merge_snapshot(self, schema, meta_attr_mapping):
+        base = self.get_snapshot_at(0)
+        self.create_schema('bar', 'bar_topic')
+        schema_repository.mark_schema_disabled(schema.id)
+        delta = self.get_snapshot(since=base[0]['position'])
+
+        actual = list(catalog_snapshot.merge_snapshot(base, delta))
+
+        assert not actual[0]['is_delta']
+        assert actual[0]['position'] == delta[0]['position']
+        assert actual[1:] == self.get_snapshot()[1:]
+
+    def test_merge_snapshot_with_wrong_base(self, schema):
+        base = self.get_snapshot()
+        delta = self.get_snapshot(since=dict(base[0]['position'], schema=0))
+        with pytest.raises(ValueError):
+            list(catalog_snapshot.merge_snapshot(base, delta))
+
+    def test_write_and_read_snapshot(self, schema):
+        records = self.get_snapshot()
+        snapshot_file = io.BytesIO()
+        catalog_snapshot.write_snapshot(snapshot_file, records)
+        snapshot_file.seek(0)
+        assert list(catalog_snapshot.read_snapshot(snapshot_file)) == records
+
+    def test_read_unsupported_snapshot(self):
+        snapshot_file = io.BytesIO()
+        catalog_snapshot.write_snapshot(
+            snapshot_file,
+            [{'type': 'header', 'format_version': 0}]
+        )
+        snapshot_file.seek(0)
+        with pytest.raises(ValueError):
+            list(catalog_snapshot.read_snapshot(snapshot_file))
+
+    @pytest.mark.parametrize('position', [
+        None,
+        {'schema': 1},
+        dict.fromkeys(catalog_snapshot.RECORD_TYPES + ('updated_since',), 'a'),
+    ])
+    def test_invalid_position(self, position):
+        with pytest.raises(ValueError):
+            catalog_snapshot.validate_position(position)
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import mock
+import pytest
+
+from schematizer import models
+from schematizer.logic import catalog_version
+from schematizer.logic import doc_tool
+from schematizer.logic import meta_attribute_mappers
+from schematizer.logic import schema_repository as schema_repo
+from schematizer.logic import schema_response_cache
+from schematizer.models.database import session
+from schematizer_testing import factories
+from tests.models.testing_db import DBTestCase
+
+
+class TestCatalogVersion(DBTestCase):
+
+    @property
+    def schema_json(self):
+        return {
+            "type": "record",
+            "name": "foo",
+            "namespace": "foo_namespace",
+            "fields": [{"name": "bar", "type": "int", "doc": "bar"}],
+            "doc": "table foo"
+        }
+
+    @pytest.fixture
+    def schema(self):
+        return factories.create_avro_schema(
+            self.schema_json,
+            topic_name='foo_topic',
+            namespace='foo_namespace',
+            source='foo_source'
+        )
+
+    @pytest.fixture
+    def tracker(self):
+        tracker = catalog_version.CatalogVersionTracker(
+            check_interval_seconds=0
+        )
+        # Commit the writes of the other fixtures first.
+        session.commit()
+        tracker.check()
+        return tracker
+
+    def test_get_catalog_version_without_writes(self):
+        assert catalog_version.get_catalog_version() == 0
+
+    def bump_and_commit(self):
+        catalog_version.bump_catalog_version()
+        session.commit()
+
+    def test_bump_catalog_version(self):
+        self.bump_and_commit()
+        self.bump_and_commit()
+        assert catalog_version.get_catalog_version() == 2
+
+    def test_bump_catalog_version_once_per_transaction(self):
+        catalog_version.bump_catalog_version()
+        catalog_version.bump_catalog_version()
+        session.commit()
+        assert catalog_version.get_catalog_version() == 1
+
+    def test_bump_catalog_version_waits_for_commit(self, tracker):
+        catalog_version.bump_catalog_version()
+        with session.begin_nested():
+            pass
+        assert not tracker.check()
+        session.commit()
+        assert tracker.check()
+
+    def test_bump_catalog_version_discarded_on_rollback(self, tracker):
+        catalog_version.bump_catalog_version()
+        session.rollback()
+        assert not tracker.check()
+
+    def test_tracker_detects_changes(self, tracker):
+        assert not tracker.check()
+        self.bump_and_commit()
+        assert tracker.check()
+        assert tracker.version == 1
+        assert not tracker.check()
+
+    def test_tracker_skips_checks_within_interval(self):
+        tracker = catalog_version.CatalogVersionTracker(
+            check_interval_seconds=60
+        )
+        tracker.check()
+        self.bump_and_commit()
+        assert not tracker.check()
+        assert tracker.version == 0
+
+    def test_sync_local_caches(self, tracker):
+        schema_response_cache.get_schema_response(1, lambda: {'id': 1})
+        self.bump_and_commit()
+        with mock.patch.object(
+            catalog_version,
+            '_get_tracker',
+            return_value=tracker
+        ):
+            catalog_version.sync_local_caches()
+        assert schema_response_cache.get_schema_response_cache_stats(
+        ).size == 0
+
+    def test_schema_registration_bumps_version(self, tracker):
+        schema_repo.register_avro_schema_from_avro_json(
+            self.schema_json,
+            'foo_namespace',
+            'foo_source',
+            'user@yelp.com',
+            contains_pii=False,
+            cluster_type='datapipe'
+        )
+        session.commit()
+        assert tracker.check()
+
+    def test_schema_status_change_bumps_version(self, schema, tracker):
+        schema_repo.mark_schema_disabled(schema.id)
+        session.commit()
+        assert tracker.check()
+
+    def test_note_change_bumps_version(self, schema, tracker):
+        note = doc_tool.create_note(
+            models.ReferenceTypeEnum.SCHEMA,
+            schema.id,
+            'foo',
+            'user@yelp.com'
+        )
+        session.commit()
+        assert tracker.check()
+        doc_tool.update_note(note.id, 'bar', 'user@yelp.com')
+        session.commit()
+        assert tracker.check()
+
+    def test_meta_attribute_mapping_change_bumps_version(
+        self,
+        schema,
+        tracker
+    ):
+        meta_attribute_mappers.register_meta_attribute_for_entity(
+            models.Namespace,
+            schema.topic.source.namespace_id,
+            schema.id
+        )
+        session.commit()
+        assert tracker.check()
+        meta_attribute_mappers.delete_meta_attribute_mapping_for_entity(
+            models.Namespace,
+            schema.topic.source.namespace_id,
+            schema.id
+        )
+        session.commit()
+        assert tracker.check()
+
+    def test_source_category_change_bumps_version(self, schema, tracker):
+        doc_tool.create_source_category(schema.topic.source_id, 'foo')
+        session.commit()
+        assert tracker.check()
+        doc_tool.update_source_category(schema.topic.source_id, 'bar')
+        session.commit()
+        assert tracker.check()
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import mock
+import pytest
+from avro import schema
+
+from schematizer.helpers.avro_schema_cache import get_schema_fingerprint
+from schematizer.logic import compatibility_verdict_store as verdict_store
+from schematizer.models.database import session
+from schematizer.models.schema_compatibility_verdict import (
+    SchemaCompatibilityVerdict
+)
+from tests.models.testing_db import DBTestCase
+
+
+class TestCompatibilityVerdictStore(DBTestCase):
+
+    @property
+    def writer_schema_json(self):
+        return {
+            "type": "record",
+            "name": "foo",
+            "fields": [{"name": "bar", "type": "int"}]
+        }
+
+    @property
+    def reader_schema_json(self):
+        return {
+            "type": "record",
+            "name": "foo",
+            "fields": [
+                {"name": "bar", "type": "int"},
+                {"name": "baz", "type": "string", "default": ""}
+            ]
+        }
+
+    @property
+    def incompatible_reader_schema_json(self):
+        return {
+            "type": "record",
+            "name": "foo",
+            "fields": [{"name": "bar", "type": "string"}]
+        }
+
+    @pytest.yield_fixture
+    def spy_validator(self):
+        with mock.patch(
+            'schematizer.logic.compatibility_verdict_store.'
+            'SchemaCompatibilityValidator.is_backward_compatible',
+            wraps=verdict_store.SchemaCompatibilityValidator
+            .is_backward_compatible
+        ) as mock_func:
+            yield mock_func
+
+    @pytest.yield_fixture
+    def replica_session(self):
+        current_session = session()
+        replica_pool = mock.Mock()
+        replica_pool.choose_engine.return_value = self.engine
+        with mock.patch.object(current_session, 'replica_pool', replica_pool):
+            assert current_session.use_replica()
+            yield current_session
+        current_session.close()
+
+    def get_stored_verdict(self, writer_schema_json, reader_schema_json):
+        return SchemaCompatibilityVerdict.get_by_fingerprints(
+            get_schema_fingerprint(writer_schema_json),
+            get_schema_fingerprint(reader_schema_json)
+        )
+
+    def test_compatible_schemas(self):
+        assert verdict_store.is_backward_compatible(
+            self.writer_schema_json,
+            self.reader_schema_json,
+            store_verdict=True
+        )
+        verdict = self.get_stored_verdict(
+            self.writer_schema_json,
+            self.reader_schema_json
+        )
+        assert verdict.is_compatible
+
+    def test_incompatible_schemas(self):
+        assert not verdict_store.is_backward_compatible(
+            self.writer_schema_json,
+            self.incompatible_reader_schema_json,
+            store_verdict=True
+        )
+        verdict = self.get_stored_verdict(
+            self.writer_schema_json,
+            self.incompatible_reader_schema_json
+        )
+        assert not verdict.is_compatible
+
+    def test_verdict_is_directional(self):
+        verdict_store.is_backward_compatible(
+            self.writer_schema_json,
+            self.reader_schema_json,
+            store_verdict=True
+        )
+        assert self.get_stored_verdict(
+            self.reader_schema_json,
+            self.writer_schema_json
+        ) is None
+
+    def test_repeated_check_uses_cached_verdict(self, spy_validator):
+        for _ in range(3):
+            assert verdict_store.is_backward_compatible(
+                self.writer_schema_json,
+                self.reader_schema_json
+            )
+        assert spy_validator.call_count == 1
+
+    def test_check_uses_stored_verdict(self, spy_validator):
+        verdict_store.is_backward_compatible(
+            self.writer_schema_json,
+            self.incompatible_reader_schema_json,
+            store_verdict=True
+        )
+        verdict_store.clear_verdict_cache()
+
+        assert not verdict_store.is_backward_compatible(
+            self.writer_schema_json,
+            self.incompatible_reader_schema_json
+        )
+        assert spy_validator.call_count == 1
+
+    def test_invalid_schema_verdict_is_not_stored(self):
+        with pytest.raises(schema.SchemaParseException):
+            verdict_store.is_backward_compatible(
+                self.writer_schema_json,
+                {"type": "record", "name": "foo"},
+                store_verdict=True
+            )
+        assert self.get_stored_verdict(
+            self.writer_schema_json,
+            {"type": "record", "name": "foo"}
+        ) is None
+
+    def test_verdict_is_not_stored_by_default(self):
+        assert verdict_store.is_backward_compatible(
+            self.writer_schema_json,
+            self.reader_schema_json
+        )
+        assert self.get_stored_verdict(
+            self.writer_schema_json,
+            self.reader_schema_json
+        ) is None
+
+    def test_check_on_replica_does_not_write(self, replica_session):
+        assert verdict_store.is_backward_compatible(
+            self.writer_schema_json,
+            self.reader_schema_json
+        )
+        assert not replica_session.has_written
+        assert replica_session.reads_from_replica
+
+    def test_store_verdict_computed_by_previous_check(self, spy_validator):
+        verdict_store.is_backward_compatible(
+            self.writer_schema_json,
+            self.incompatible_reader_schema_json
+        )
+        assert not verdict_store.is_backward_compatible(
+            self.writer_schema_json,
+            self.incompatible_reader_schema_json,
+            store_verdict=True
+        )
+        verdict = self.get_stored_verdict(
+            self.writer_schema_json,
+            self.incompatible_reader_schema_json
+        )
+        assert not verdict.is_compatible
+        assert spy_validator.call_count == 1
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import mock
+import pytest
+import simplejson
+
+from schematizer import models
+from schematizer.helpers.cache_backends import MemcacheBackend
+from schematizer.logic import lookup_cache
+from schematizer.models.database import session
+from schematizer_testing import factories
+from schematizer_testing.local_memcached import LocalMemcachedServer
+from tests.models.testing_db import DBTestCase
+
+
+class TestLookupCache(DBTestCase):
+
+    @pytest.fixture
+    def topic(self):
+        return factories.create_topic(
+            topic_name='foo_topic',
+            namespace_name='foo_namespace',
+            source_name='foo_source'
+        )
+
+    @property
+    def key(self):
+        return lookup_cache.get_topic_key('foo_topic')
+
+    def test_entity_is_loaded_once(self, topic):
+        load_func = mock.Mock(return_value=topic)
+        lookup_cache.get_or_load(self.key, load_func)
+        session.expunge_all()
+
+        actual = lookup_cache.get_or_load(self.key, load_func)
+
+        assert load_func.call_count == 1
+        assert isinstance(actual, models.Topic)
+        assert actual.id == topic.id
+        assert actual.name == topic.name
+        assert actual in session
+        assert actual.source.name == 'foo_source'
+
+    def test_entity_in_session_is_returned(self, topic):
+        lookup_cache.get_or_load(self.key, lambda: topic)
+        actual = lookup_cache.get_or_load(self.key, mock.Mock())
+        assert actual is topic
+
+    def test_none_is_not_cached(self):
+        load_func = mock.Mock(return_value=None)
+        assert lookup_cache.get_or_load(self.key, load_func) is None
+        assert lookup_cache.get_or_load(self.key, load_func) is None
+        assert load_func.call_count == 2
+
+    def test_invalidate(self, topic):
+        load_func = mock.Mock(return_value=topic)
+        lookup_cache.get_or_load(self.key, load_func)
+        lookup_cache.invalidate(self.key)
+        lookup_cache.get_or_load(self.key, load_func)
+        assert load_func.call_count == 2
+
+    def test_invalidate_again_after_commit(self, topic):
+        backend = lookup_cache._get_backend()
+        lookup_cache.invalidate(self.key)
+        # A concurrent read fills the cache with the entity as it was before
+        # the write is committed.
+        backend.set(self.key, lookup_cache._serialize(topic))
+
+        session.commit()
+
+        assert backend.get(self.key) is None
+
+    def test_invalidated_key_is_not_cached_until_commit(self, topic):
+        backend = lookup_cache._get_backend()
+        load_func = mock.Mock(return_value=topic)
+        lookup_cache.invalidate(self.key)
+
+        lookup_cache.get_or_load(self.key, load_func)
+        lookup_cache.get_or_load(self.key, load_func)
+        assert load_func.call_count == 2
+        assert backend.get(self.key) is None
+
+        session.commit()
+        lookup_cache.get_or_load(self.key, load_func)
+        assert backend.get(self.key) is not None
+
+    def test_invalidation_is_discarded_on_rollback(self):
+        lookup_cache.invalidate(self.key)
+        session.rollback()
+        assert lookup_cache._INVALIDATED_KEYS_INFO_KEY not in session.info
+
+    def test_cached_entity_keeps_column_values(self, topic):
+        lookup_cache.get_or_load(self.key, lambda: topic)
+        session.expunge_all()
+
+        actual = lookup_cache.get_or_load(self.key, mock.Mock())
+
+        assert actual.contains_pii == topic.contains_pii
+        assert actual.primary_keys == topic.primary_keys
+        assert actual.created_at == topic.created_at
+
+    def test_unknown_cached_model_is_cache_miss(self, topic):
+        lookup_cache._get_backend().set(
+            self.key,
+            simplejson.dumps({'model': 'os.system', 'values': {}})
+        )
+        load_func = mock.Mock(return_value=topic)
+        assert lookup_cache.get_or_load(self.key, load_func) is topic
+        assert load_func.call_count == 1
+
+    def test_malformed_cached_data_is_cache_miss(self, topic):
+        lookup_cache._get_backend().set(self.key, b'\x80\x02cos\nsystem\n')
+        load_func = mock.Mock(return_value=topic)
+        assert lookup_cache.get_or_load(self.key, load_func) is topic
+        assert load_func.call_count == 1
+
+    def test_entity_of_uncacheable_model(self):
+        namespace = factories.create_namespace('foo_namespace')
+        with pytest.raises(ValueError):
+            lookup_cache.get_or_load(self.key, lambda: namespace)
+
+    def test_memcache_backend(self, topic):
+        with LocalMemcachedServer() as server:
+            backend = MemcacheBackend(server.host, server.port)
+            with mock.patch.object(
+                lookup_cache,
+                '_get_backend',
+                return_value=backend
+            ):
+                load_func = mock.Mock(return_value=topic)
+                lookup_cache.get_or_load(self.key, load_func)
+                session.expunge_all()
+                actual = lookup_cache.get_or_load(self.key, load_func)
+
+                assert load_func.call_count == 1
+                assert actual.id == topic.id
+
+                lookup_cache.invalidate(self.key)
+                lookup_cache.get_or_load(self.key, load_func)
+                assert load_func.call_count == 2
+            backend.close()
@@ -23,19 +23,26 @@ from collections import defaultdict
 
 import mock
 import pytest
+import staticconf.testing
 
 from schematizer import models
 from schematizer.components import converters
+from schematizer.helpers.avro_schema_cache import get_schema_fingerprint
 from schematizer.logic import exceptions as sch_exc
+from schematizer.logic import loading_profiles
 from schematizer.logic import schema_repository as schema_repo
 from schematizer.models import Namespace
 from schematizer.models.database import session
 from schematizer.models.exceptions import EntityNotFoundError
 from schematizer.models.page_info import PageInfo
+from schematizer.models.schema_compatibility_verdict import (
+    SchemaCompatibilityVerdict
+)
 from schematizer.models.schema_meta_attribute_mapping import (
     SchemaMetaAttributeMapping)
 from schematizer_testing import asserts
 from schematizer_testing import factories
+from schematizer_testing import utils
 from tests.logic.meta_attribute_mappers_test import GetMetaAttributeBaseTest
 from tests.models.testing_db import DBTestCase
 
@@ -467,7 +474,7 @@ class TestSchemaRepository(DBTestCase):
     @pytest.yield_fixture
     def mock_compatible_func(self):
         with mock.patch(
-            'schematizer.logic.schema_repository.'
+            'schematizer.logic.compatibility_verdict_store.'
             'SchemaCompatibilityValidator.is_backward_compatible'
         ) as mock_func:
             yield mock_func
@@ -608,6 +615,21 @@ class TestSchemaRepository(DBTestCase):
                 base_schema_id=expected_base_schema_id
             )
 
+    def test_registering_from_avro_json_sets_topic_primary_keys(self):
+        schema_json = dict(
+            self.pkey_schema_json,
+            pkey=['field_1', 'field_2']
+        )
+        actual = schema_repo.register_avro_schema_from_avro_json(
+            schema_json,
+            self.namespace_name,
+            self.source_name,
+            self.source_owner_email,
+            contains_pii=False,
+            cluster_type=self.cluster_type
+        )
+        assert actual.topic.primary_keys == ['field_1', 'field_2']
+
     def test_registering_from_avro_json_with_pkey_added(self):
         actual_schema1 = schema_repo.register_avro_schema_from_avro_json(
             self.pkey_schema_json,
@@ -974,6 +996,269 @@ class TestSchemaRepository(DBTestCase):
         self.assert_equal_avro_schema_partial(expected, result_a)
         self.assert_equal_avro_schema_partial(expected, result_b)
 
+    def test_registered_schema_has_fingerprint(self, rw_schema):
+        assert rw_schema.fingerprint == get_schema_fingerprint(
+            self.rw_schema_json
+        )
+
+    def test_registered_schema_elements_have_timestamps(self):
+        new_schema = schema_repo.register_avro_schema_from_avro_json(
+            self.rw_schema_json,
+            self.namespace_name,
+            self.source_name,
+            self.source_owner_email,
+            contains_pii=False,
+            cluster_type=self.cluster_type
+        )
+
+        elements = session.query(models.AvroSchemaElement).filter(
+            models.AvroSchemaElement.avro_schema_id == new_schema.id
+        ).all()
+
+        assert len(elements) == len(self.rw_schema_elements)
+        for element in elements:
+            assert element.created_at is not None
+            assert element.updated_at is not None
+
+    def test_registered_schema_meta_attr_mappings_have_timestamps(
+        self,
+        namespace,
+        meta_attr_schema
+    ):
+        factories.create_meta_attribute_mapping(
+            meta_attr_schema.id,
+            models.Namespace.__name__,
+            namespace.id
+        )
+        new_schema = schema_repo.register_avro_schema_from_avro_json(
+            self.rw_schema_json,
+            self.namespace_name,
+            self.source_name,
+            self.source_owner_email,
+            contains_pii=False,
+            cluster_type=self.cluster_type
+        )
+
+        mapping = session.query(SchemaMetaAttributeMapping).filter(
+            SchemaMetaAttributeMapping.schema_id == new_schema.id
+        ).one()
+        assert mapping.meta_attr_schema_id == meta_attr_schema.id
+        assert mapping.created_at is not None
+        assert mapping.updated_at is not None
+
+    def test_registering_same_schema_without_fingerprint(self, rw_schema):
+        # Schemas registered before the fingerprint column was added have
+        # no fingerprint until they are backfilled.
+        session.query(models.AvroSchema).filter(
+            models.AvroSchema.id == rw_schema.id
+        ).update({models.AvroSchema.fingerprint: None})
+        session.expire(rw_schema)
+
+        actual = self._register_avro_schema(rw_schema)
+        assert rw_schema.id == actual.id
+
+    def test_registering_same_schema_without_fingerprint_fallback(
+        self,
+        rw_schema
+    ):
+        session.query(models.AvroSchema).filter(
+            models.AvroSchema.id == rw_schema.id
+        ).update({models.AvroSchema.fingerprint: None})
+        session.expire(rw_schema)
+
+        with staticconf.testing.MockConfiguration(
+            {'schema_fingerprint_fallback_enabled': False}
+        ):
+            actual = self._register_avro_schema(rw_schema)
+        assert actual.id != rw_schema.id
+
+    def test_registering_same_schema_after_newer_schema(
+        self,
+        rw_schema,
+        mock_compatible_func
+    ):
+        mock_compatible_func.return_value = True
+        self._register_avro_schema(rw_schema)
+        newer_schema = schema_repo.register_avro_schema_from_avro_json(
+            self.another_rw_schema_json,
+            self.namespace_name,
+            self.source_name,
+            self.source_owner_email,
+            contains_pii=False,
+            cluster_type=self.cluster_type
+        )
+
+        # Only the latest schema of the topic is considered as the same
+        # schema, so a new schema is created.
+        actual = self._register_avro_schema(rw_schema)
+        assert actual.id not in (rw_schema.id, newer_schema.id)
+        assert actual.fingerprint == rw_schema.fingerprint
+
+    def _get_batch_registration(self, avro_schema_json, source_name):
+        return {
+            'avro_schema_json': avro_schema_json,
+            'namespace_name': self.namespace_name,
+            'source_name': source_name,
+            'source_owner_email': self.source_owner_email,
+            'contains_pii': False,
+            'cluster_type': self.cluster_type
+        }
+
+    @pytest.mark.parametrize("validation_workers", [1, 4])
+    def test_register_schemas_in_batch(self, validation_workers):
+        registrations = [
+            self._get_batch_registration(self.rw_schema_json, source_name)
+            for source_name in (self.source_name, self.another_source_name)
+        ]
+        results = schema_repo.register_avro_schemas_from_avro_json_in_batch(
+            registrations,
+            chunk_size=10,
+            validation_workers=validation_workers
+        )
+
+        assert [result.error for result in results] == [None, None]
+        for registration, result in zip(registrations, results):
+            actual = result.avro_schema
+            assert actual.avro_schema_json == self.rw_schema_json
+            assert actual.topic.source.name == registration['source_name']
+            assert actual.topic.source.namespace.name == self.namespace_name
+
+    def test_register_schemas_in_batch_with_invalid_schemas(self):
+        registrations = [
+            self._get_batch_registration(
+                {"type": "record", "name": "A"},
+                self.source_name
+            ),
+            self._get_batch_registration(
+                self.rw_schema_json,
+                self.source_name
+            ),
+            self._get_batch_registration(self.rw_schema_json, ' '),
+        ]
+        results = schema_repo.register_avro_schemas_from_avro_json_in_batch(
+            registrations,
+            chunk_size=10
+        )
+
+        assert results[0].avro_schema is None
+        assert 'Invalid Avro schema JSON.' in results[0].error
+        assert results[1].error is None
+        assert results[1].avro_schema.avro_schema_json == self.rw_schema_json
+        assert results[2].avro_schema is None
+        assert results[2].error == 'Source name must be non-empty.'
+
+    def test_register_same_schemas_in_batch(self):
+        registrations = [
+            self._get_batch_registration(self.rw_schema_json, self.source_name)
+            for _ in range(2)
+        ]
+        results = schema_repo.register_avro_schemas_from_avro_json_in_batch(
+            registrations,
+            chunk_size=10
+        )
+        assert results[0].avro_schema.id == results[1].avro_schema.id
+
+    def test_register_schemas_in_batch_commits_in_chunks(self):
+        registrations = [
+            self._get_batch_registration(self.rw_schema_json, self.source_name)
+            for _ in range(5)
+        ]
+        with mock.patch.object(session, 'commit') as mock_commit:
+            schema_repo.register_avro_schemas_from_avro_json_in_batch(
+                registrations,
+                chunk_size=2
+            )
+            assert mock_commit.call_count == 3
+
+    def test_register_schemas_in_batch_commits_per_source(self):
+        registrations = [
+            self._get_batch_registration(self.rw_schema_json, source_name)
+            for source_name in ('biz_0', 'biz_1', 'biz_0', 'biz_2')
+        ]
+        with mock.patch.object(session, 'commit') as mock_commit:
+            with mock.patch.object(
+                schema_repo.source_lock,
+                'lock_source'
+            ) as mock_lock_source:
+                results = (
+                    schema_repo.register_avro_schemas_from_avro_json_in_batch(
+                        registrations,
+                        chunk_size=10
+                    )
+                )
+        # The session is committed before the next source is locked.
+        assert mock_commit.call_count == 3
+        assert mock_lock_source.call_args_list == [
+            mock.call(self.namespace_name, source_name)
+            for source_name in ('biz_0', 'biz_1', 'biz_2')
+        ]
+        assert results[0].avro_schema.id == results[2].avro_schema.id
+        assert [
+            result.avro_schema.topic.source.name for result in results
+        ] == ['biz_0', 'biz_1', 'biz_0', 'biz_2']
+
+    def test_register_schemas_in_batch_with_lock_timeout(self):
+        registrations = [
+            self._get_batch_registration(self.rw_schema_json, source_name)
+            for source_name in (self.source_name, self.another_source_name)
+        ]
+        lock_source = schema_repo.source_lock.lock_source
+
+        def mock_lock_source(namespace_name, source_name):
+            if source_name == self.source_name:
+                raise sch_exc.LockTimeoutException('lock timeout')
+            lock_source(namespace_name, source_name)
+
+        with mock.patch.object(
+            schema_repo.source_lock,
+            'lock_source',
+            side_effect=mock_lock_source
+        ):
+            results = (
+                schema_repo.register_avro_schemas_from_avro_json_in_batch(
+                    registrations,
+                    chunk_size=10
+                )
+            )
+
+        assert results[0].avro_schema is None
+        assert results[0].error == 'lock timeout'
+        assert results[1].error is None
+        assert results[1].avro_schema.topic.source.name == (
+            self.another_source_name
+        )
+
+    def test_register_schemas_in_batch_with_unexpected_error(self):
+        registrations = [
+            self._get_batch_registration(self.rw_schema_json, source_name)
+            for source_name in (self.source_name, self.another_source_name)
+        ]
+        create_avro_schema = schema_repo._create_avro_schema
+
+        def mock_create_avro_schema(source_id, **kwargs):
+            source = models.Source.get_by_id(source_id)
+            if source.name == self.source_name:
+                raise RuntimeError('unexpected')
+            return create_avro_schema(source_id=source_id, **kwargs)
+
+        with mock.patch.object(
+            schema_repo,
+            '_create_avro_schema',
+            side_effect=mock_create_avro_schema
+        ):
+            results = (
+                schema_repo.register_avro_schemas_from_avro_json_in_batch(
+                    registrations,
+                    chunk_size=10
+                )
+            )
+
+        assert results[0].avro_schema is None
+        assert results[0].error == (
+            'Failed to register the schema due to an unexpected RuntimeError.'
+        )
+        assert results[1].error is None
+
     def test_registering_from_avro_json_with_diff_base_schema(
         self,
         topic,
@@ -1058,7 +1343,7 @@ class TestSchemaRepository(DBTestCase):
         actual = schema_repo.get_latest_topic_of_source_id(0)
         assert actual is None
 
-    @pytest.mark.usefixtures('source', 'rw_schema', 'disabled_schema')
+    @pytest.mark.usefixtures('source', 'disabled_schema')
     @pytest.mark.parametrize(
         "is_compatible, meta_attributes_for_schema_id, "
         "meta_attributes_for_source, expected_output", [
@@ -1070,6 +1355,7 @@ class TestSchemaRepository(DBTestCase):
     def test_is_schema_compatible_in_topic(
         self,
         topic,
+        rw_schema,
         mock_compatible_func,
         is_compatible,
         meta_attributes_for_schema_id,
@@ -1082,8 +1368,8 @@ class TestSchemaRepository(DBTestCase):
             return_value=meta_attributes_for_source
         ), mock.patch(
             'schematizer.logic.schema_repository.'
-            'get_meta_attributes_by_schema_id',
-            return_value=meta_attributes_for_schema_id
+            'get_meta_attributes_by_schema_ids',
+            return_value={rw_schema.id: set(meta_attributes_for_schema_id)}
         ):
             mock_compatible_func.return_value = is_compatible
 
@@ -1093,6 +1379,29 @@ class TestSchemaRepository(DBTestCase):
             )
             assert actual == expected_output
 
+    def test_get_meta_attributes_by_schema_ids(
+        self,
+        rw_schema,
+        disabled_schema,
+        meta_attr_schema
+    ):
+        session.add(SchemaMetaAttributeMapping(
+            schema_id=rw_schema.id,
+            meta_attr_schema_id=meta_attr_schema.id
+        ))
+        session.flush()
+
+        actual = schema_repo.get_meta_attributes_by_schema_ids(
+            [rw_schema.id, disabled_schema.id]
+        )
+        assert actual == {
+            rw_schema.id: {meta_attr_schema.id},
+            disabled_schema.id: set()
+        }
+
+    def test_get_meta_attributes_by_empty_schema_ids(self):
+        assert schema_repo.get_meta_attributes_by_schema_ids([]) == {}
+
     @pytest.mark.usefixtures('disabled_schema')
     def test_is_schema_compatible_in_topic_with_no_enabled_schema(self, topic):
         actual = schema_repo.is_schema_compatible_in_topic('int', topic)
@@ -1106,6 +1415,14 @@ class TestSchemaRepository(DBTestCase):
         actual = schema_repo.get_topic_by_name('foo')
         assert actual is None
 
+    def test_get_topic_by_name_is_cached(self, topic):
+        schema_repo.get_topic_by_name(self.topic_name)
+        session.expunge_all()
+        with utils.count_queries(self.engine) as statements:
+            actual = schema_repo.get_topic_by_name(self.topic_name)
+        assert statements == []
+        self.assert_equal_topic(topic, actual)
+
     def test_get_source_by_fullname(self, source):
         actual = schema_repo.get_source_by_fullname(
             self.namespace_name,
@@ -1125,6 +1442,25 @@ class TestSchemaRepository(DBTestCase):
         actual = schema_repo.get_schema_by_id(0)
         assert actual is None
 
+    def test_get_schemas_after_id(self, rw_schema, disabled_schema):
+        actual = schema_repo.get_schemas_after_id(0)
+        assert [schema.id for schema in actual] == sorted(
+            [rw_schema.id, disabled_schema.id]
+        )
+
+        actual = schema_repo.get_schemas_after_id(0, count=1)
+        assert len(actual) == 1
+
+        last_id = max(rw_schema.id, disabled_schema.id)
+        assert schema_repo.get_schemas_after_id(last_id) == []
+
+    def test_get_max_schema_id(self, rw_schema, disabled_schema):
+        actual = schema_repo.get_max_schema_id()
+        assert actual == max(rw_schema.id, disabled_schema.id)
+
+    def test_get_max_schema_id_without_schemas(self):
+        assert schema_repo.get_max_schema_id() is None
+
     def test_get_latest_schema_by_topic_id(self, topic, rw_schema):
         actual = schema_repo.get_latest_schema_by_topic_id(topic.id)
         self.assert_equal_avro_schema(rw_schema, actual)
@@ -1154,6 +1490,47 @@ class TestSchemaRepository(DBTestCase):
         with pytest.raises(sch_exc.EntityNotFoundException):
             schema_repo.get_latest_schema_by_topic_name('_bad.topic')
 
+    def test_get_latest_schema_by_topic_name_is_cached(self, topic, rw_schema):
+        schema_repo.get_latest_schema_by_topic_name(topic.name)
+        session.expunge_all()
+        with utils.count_queries(self.engine) as statements:
+            actual = schema_repo.get_latest_schema_by_topic_name(topic.name)
+        assert statements == []
+        self.assert_equal_avro_schema(rw_schema, actual)
+
+    def test_get_latest_schema_by_topic_name_after_registration(
+        self,
+        topic,
+        rw_schema
+    ):
+        schema_repo.get_latest_schema_by_topic_name(topic.name)
+        new_schema_json = copy.deepcopy(self.rw_schema_json)
+        new_schema_json['fields'].append(
+            {"name": "baz", "type": "int", "doc": "baz", "default": 0}
+        )
+        new_schema = schema_repo.register_avro_schema_from_avro_json(
+            new_schema_json,
+            self.namespace_name,
+            self.source_name,
+            self.source_owner_email,
+            contains_pii=False,
+            cluster_type=self.cluster_type
+        )
+        actual = schema_repo.get_latest_schema_by_topic_name(topic.name)
+        assert new_schema.topic.id == topic.id
+        assert actual.id == new_schema.id
+        assert actual.id != rw_schema.id
+
+    def test_get_latest_schema_by_topic_name_after_disabled(
+        self,
+        topic,
+        rw_schema
+    ):
+        schema_repo.get_latest_schema_by_topic_name(topic.name)
+        schema_repo.mark_schema_disabled(rw_schema.id)
+        actual = schema_repo.get_latest_schema_by_topic_name(topic.name)
+        assert actual is None
+
     @pytest.mark.usefixtures('rw_schema', 'disabled_schema')
     @pytest.mark.parametrize("is_compatible", [True, False])
     def test_is_schema_compatible(self, mock_compatible_func, is_compatible):
@@ -1167,6 +1544,44 @@ class TestSchemaRepository(DBTestCase):
         expected = mock_compatible_func.return_value
         assert expected == actual
 
+    @pytest.mark.usefixtures('rw_schema')
+    def test_is_schema_compatible_on_replica(self):
+        # The replica reads through its own connection, which only sees the
+        # committed rows.
+        session.commit()
+        current_session = session()
+        replica_pool = mock.Mock()
+        replica_pool.choose_engine.return_value = self.engine
+        with mock.patch.object(current_session, 'replica_pool', replica_pool):
+            assert current_session.use_replica()
+            try:
+                assert schema_repo.is_schema_compatible(
+                    self.rw_schema_json,
+                    self.namespace_name,
+                    self.source_name
+                )
+                assert not current_session.has_written
+                assert current_session.reads_from_replica
+            finally:
+                current_session.close()
+        assert session.query(SchemaCompatibilityVerdict).count() == 0
+
+    @pytest.mark.usefixtures('rw_schema')
+    def test_registration_stores_verdicts(self):
+        new_schema_json = copy.deepcopy(self.rw_schema_json)
+        new_schema_json['fields'].append(
+            {"name": "baz", "type": "int", "doc": "baz", "default": 0}
+        )
+        schema_repo.register_avro_schema_from_avro_json(
+            new_schema_json,
+            self.namespace_name,
+            self.source_name,
+            self.source_owner_email,
+            contains_pii=False,
+            cluster_type=self.cluster_type
+        )
+        assert session.query(SchemaCompatibilityVerdict).count() == 2
+
     def test_is_schema_compatible_with_nonexistent_source(self):
         with pytest.raises(sch_exc.EntityNotFoundException):
             schema_repo.is_schema_compatible('avro schema', 'foo', 'bar')
@@ -1189,6 +1604,50 @@ class TestSchemaRepository(DBTestCase):
             assert_func=self.assert_equal_avro_schema
         )
 
+    def access_schema_response_graph(self, avro_schemas):
+        for avro_schema in avro_schemas:
+            source = avro_schema.topic.source
+            assert source.namespace.name
+            assert source.category is None or source.category.category
+            assert avro_schema.topic.primary_keys is not None
+
+    def test_get_schemas_by_topic_name_with_loading_profile(
+        self,
+        topic,
+        rw_schema,
+        another_rw_schema
+    ):
+        topic_name = topic.name
+        session.expunge_all()
+        with utils.count_queries(self.engine) as statements:
+            actual = schema_repo.get_schemas_by_topic_name(
+                topic_name,
+                loading_profile=loading_profiles.SCHEMA_RESPONSE
+            )
+            self.access_schema_response_graph(actual)
+
+        assert len(actual) == 2
+        # One query for the topic, and one for the schemas with their topic,
+        # source, namespace, and category.
+        assert len(statements) == 2
+
+    def test_get_schemas_created_after_with_loading_profile(
+        self,
+        sorted_schemas
+    ):
+        created_after = sorted_schemas[0].created_at
+        session.expunge_all()
+        with utils.count_queries(self.engine) as statements:
+            actual = schema_repo.get_schemas_created_after(
+                created_after=created_after,
+                loading_profile=loading_profiles.SCHEMA_RESPONSE
+            )
+            self.access_schema_response_graph(actual)
+
+        assert len(actual) == len(sorted_schemas)
+        # The number of queries does not depend on the number of schemas.
+        assert len(statements) == 1
+
     def test_get_schemas_by_topic_name_with_nonexistent_topic(self):
         with pytest.raises(sch_exc.EntityNotFoundException):
             schema_repo.get_schemas_by_topic_name('foo')
@@ -1470,6 +1929,103 @@ class TestSchemaRepository(DBTestCase):
         assert 1 == len(actual)
         self.assert_equal_refresh(actual[0], refresh)
 
+    def test_list_refreshes_by_namespace(self, source, user_source, refresh):
+        user_refresh = factories.create_refresh(source_id=user_source.id)
+        with utils.count_queries(self.engine) as statements:
+            actual = schema_repo.list_refreshes_by_namespace(
+                self.namespace_name
+            )
+        assert actual == [
+            (refresh, self.source_name, self.namespace_name),
+            (user_refresh, self.user_source_name, self.namespace_name)
+        ]
+        assert len(statements) == 1
+
+    def test_list_refreshes_by_namespace_with_page_info(
+        self,
+        source,
+        user_source,
+        refresh
+    ):
+        user_refresh = factories.create_refresh(source_id=user_source.id)
+        actual = schema_repo.list_refreshes_by_namespace(
+            self.namespace_name,
+            PageInfo(count=1, min_id=refresh.id + 1)
+        )
+        assert actual == [
+            (user_refresh, self.user_source_name, self.namespace_name)
+        ]
+
+    def test_list_refreshes_by_namespace_grouped_by_source(
+        self,
+        source,
+        user_source,
+        refresh
+    ):
+        user_refresh = factories.create_refresh(source_id=user_source.id)
+        another_refresh = factories.create_refresh(source_id=source.id)
+        expected = sorted(
+            [refresh, user_refresh, another_refresh],
+            key=lambda r: (r.source_id, r.id)
+        )
+        actual = schema_repo.list_refreshes_by_namespace(self.namespace_name)
+        assert [row[0] for row in actual] == expected
+
+    def test_list_refreshes_by_namespace_with_source_id_page_info(
+        self,
+        source,
+        user_source,
+        refresh
+    ):
+        user_refresh = factories.create_refresh(source_id=user_source.id)
+        another_refresh = factories.create_refresh(source_id=source.id)
+        expected = sorted(
+            [refresh, user_refresh, another_refresh],
+            key=lambda r: (r.source_id, r.id)
+        )
+        first = expected[0]
+        actual = schema_repo.list_refreshes_by_namespace(
+            self.namespace_name,
+            PageInfo(count=2, min_id=first.id + 1, source_id=first.source_id)
+        )
+        assert [row[0] for row in actual] == expected[1:]
+
+    def test_list_refreshes_by_namespace_in_batches(
+        self,
+        source,
+        user_source,
+        refresh
+    ):
+        refreshes = [
+            refresh,
+            factories.create_refresh(source_id=user_source.id),
+            factories.create_refresh(source_id=source.id)
+        ]
+        expected = [
+            (r, r.source.name, self.namespace_name)
+            for r in sorted(refreshes, key=lambda r: (r.source_id, r.id))
+        ]
+        with utils.count_queries(self.engine) as statements:
+            actual = list(schema_repo.list_refreshes_by_namespace(
+                self.namespace_name,
+                batch_size=2
+            ))
+        assert actual == expected
+        assert len(statements) == 2
+        assert all('LIMIT' in statement for statement in statements)
+
+    def test_list_refreshes_by_non_existing_namespace_in_batches(self):
+        with pytest.raises(EntityNotFoundError):
+            schema_repo.list_refreshes_by_namespace('missing', batch_size=2)
+
+    def test_list_refreshes_by_empty_namespace(self, namespace):
+        actual = schema_repo.list_refreshes_by_namespace(self.namespace_name)
+        assert actual == []
+
+    def test_list_refreshes_by_non_existing_namespace(self):
+        with pytest.raises(EntityNotFoundError):
+            schema_repo.list_refreshes_by_namespace('missing')
+
     def test_get_meta_attr_by_new_schema_id(
         self,
         setup_meta_attr_mapping,
@@ -22,8 +22,10 @@ import mock
 import pytest
 from avro import schema
 
+from schematizer.logic.schema_resolution import ReaderSchemaPlan
 from schematizer.logic.schema_resolution import SchemaCompatibilityValidator
 from schematizer.logic.schema_resolution import SchemaResolution
+from schematizer.logic.schema_resolution import get_schema_object_fingerprint
 
 
 class AvroSchemaFactory(object):
@@ -669,22 +671,76 @@ class TestSchemaResolution(object):
             assert resolver.resolve_schema(w_schema_copy, r_schema)
             assert 0 == mock_record_resolver.call_count
 
-    def test_freeze_object(self, resolver):
-        obj1 = {
-            'foo': 100,
-            'bar': set(['beer', 'cocktail', 'wine']),
-            'zoo':
-            {'dog': 'bark', 'cat': 'meow', 'cow': 'moo'}
+    def test_schema_fingerprint_ignores_key_order(self):
+        schema_json = {
+            'type': 'record',
+            'name': 'foo',
+            'namespace': 'bar',
+            'fields': [
+                {'name': 'a', 'type': ['null', 'int'], 'default': None},
+                {'name': 'b', 'type': {'type': 'map', 'values': 'string'}}
+            ]
         }
-        obj2 = {
-            'foo': 100,
-            'zoo': {'cow': 'moo', 'dog': 'bark', 'cat': 'meow'},
-            'bar': set(['wine', 'beer', 'cocktail'])
+        reordered_schema_json = {
+            'fields': [
+                {'default': None, 'type': ['null', 'int'], 'name': 'a'},
+                {'type': {'values': 'string', 'type': 'map'}, 'name': 'b'}
+            ],
+            'namespace': 'bar',
+            'name': 'foo',
+            'type': 'record'
         }
-        frozen_obj1 = resolver.freeze_object(obj1)
-        frozen_obj2 = resolver.freeze_object(obj2)
-        test_dict = {frozen_obj1: 'good'}
-        assert 'good' == test_dict[frozen_obj2]
+        assert get_schema_object_fingerprint(
+            schema.make_avsc_object(schema_json)
+        ) == get_schema_object_fingerprint(
+            schema.make_avsc_object(reordered_schema_json)
+        )
+
+    def test_schema_fingerprint_of_different_schemas(self):
+        schemas = [
+            self.schema_factory.create_primitive_schema('int'),
+            self.schema_factory.create_primitive_schema('long'),
+            self.schema_factory.create_array_schema(
+                self.schema_factory.create_primitive_schema('int')
+            ),
+            self.schema_factory.create_map_schema(
+                self.schema_factory.create_primitive_schema('int')
+            ),
+            self.schema_factory.create_union_schema(
+                self.schema_factory.create_primitive_schema('int'),
+                self.schema_factory.create_primitive_schema('null')
+            ),
+            self.schema_factory.create_union_schema(
+                self.schema_factory.create_primitive_schema('null'),
+                self.schema_factory.create_primitive_schema('int')
+            ),
+            self.schema_factory.create_enum_schema('foo', ['a']),
+            self.schema_factory.create_enum_schema('foo', ['a', 'b']),
+            self.schema_factory.create_record_schema('bar', [self.field1]),
+            self.schema_factory.create_record_schema('bar', [self.field2]),
+            self.schema_factory.create_bytes_decimal_schema(4, 2),
+            self.schema_factory.create_bytes_decimal_schema(4, 3),
+        ]
+        fingerprints = set(
+            get_schema_object_fingerprint(avro_schema)
+            for avro_schema in schemas
+        )
+        assert len(schemas) == len(fingerprints)
+
+    def test_recursive_schema_fingerprint(self):
+        schema_json = {
+            'type': 'record',
+            'name': 'node',
+            'fields': [
+                {'name': 'value', 'type': 'int'},
+                {'name': 'next', 'type': ['null', 'node']}
+            ]
+        }
+        w_schema = schema.make_avsc_object(schema_json)
+        r_schema = schema.make_avsc_object(schema_json)
+        assert get_schema_object_fingerprint(
+            w_schema
+        ) == get_schema_object_fingerprint(r_schema)
 
     @property
     def logical_types(self):
@@ -761,3 +817,56 @@ class TestSchemaCompatibilityValidator(object):
                 w_schema,
                 r_schema
             )
+
+    def create_foo_table_schema(self, field_type):
+        return self.schema_factory.create_record_schema(
+            'foo_table',
+            [self.schema_factory.create_field_schema(
+                'field',
+                self.schema_factory.create_primitive_schema(field_type)
+            )]
+        )
+
+    def test_compile_reader_schema(self, validator):
+        r_schema_json = self.create_foo_table_schema('long').to_json()
+        reader_plan = validator.compile_reader_schema(r_schema_json)
+        assert reader_plan.reader_schema == schema.make_avsc_object(
+            r_schema_json
+        )
+        assert reader_plan is validator.compile_reader_schema(
+            copy.deepcopy(r_schema_json)
+        )
+
+    def test_reader_plan_with_many_writers(self, validator):
+        reader_plan = validator.compile_reader_schema(
+            self.create_foo_table_schema('double').to_json()
+        )
+        for field_type in ('int', 'long', 'float', 'double'):
+            assert reader_plan.can_read(
+                self.create_foo_table_schema(field_type)
+            )
+        for field_type in ('string', 'bytes', 'boolean'):
+            assert not reader_plan.can_read(
+                self.create_foo_table_schema(field_type)
+            )
+
+    def test_reader_plan_reuses_resolved_pairs(self):
+        reader_plan = ReaderSchemaPlan(self.create_foo_table_schema('long'))
+        assert reader_plan.can_read(self.create_foo_table_schema('int'))
+        with mock.patch.object(
+            SchemaResolution,
+            'resolve_record_schema'
+        ) as mock_record_resolver:
+            assert reader_plan.can_read(self.create_foo_table_schema('int'))
+            assert 0 == mock_record_resolver.call_count
+
+    def test_reader_plan_discards_resolved_pairs(self):
+        reader_plan = ReaderSchemaPlan(
+            self.create_foo_table_schema('long'),
+            max_resolved_pairs=2
+        )
+        assert reader_plan.can_read(self.create_foo_table_schema('int'))
+        assert not reader_plan.can_read(
+            self.create_foo_table_schema('string')
+        )
+        assert reader_plan._resolution.resolved_pairs_count == 2
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from collections import OrderedDict
+
+import mock
+import pytest
+
+from schematizer.logic import schema_response_cache
+
+
+class TestSchemaResponseCache(object):
+
+    @pytest.yield_fixture(autouse=True)
+    def clean_cache(self):
+        schema_response_cache.clear_schema_response_cache()
+        yield
+        schema_response_cache.clear_schema_response_cache()
+
+    @pytest.fixture
+    def response(self):
+        return {'schema_id': 1, 'status': 'RW', 'note': None}
+
+    def test_response_is_rendered_once(self, response):
+        render_func = mock.Mock(return_value=response)
+        first = schema_response_cache.get_schema_response(1, render_func)
+        second = schema_response_cache.get_schema_response(1, render_func)
+
+        assert first.response == response
+        assert first is second
+        assert render_func.call_count == 1
+        stats = schema_response_cache.get_schema_response_cache_stats()
+        assert stats.hits == 1
+        assert stats.misses == 1
+
+    def test_non_existing_schema_is_not_cached(self):
+        render_func = mock.Mock(return_value=None)
+        for _ in range(2):
+            actual = schema_response_cache.get_schema_response(1, render_func)
+            assert actual is None
+        assert render_func.call_count == 2
+
+    def test_etag_changes_with_response(self, response):
+        first = schema_response_cache.get_schema_response(
+            1,
+            lambda: response
+        )
+        schema_response_cache.invalidate_schema_response(1)
+        second = schema_response_cache.get_schema_response(
+            1,
+            lambda: dict(response, status='R')
+        )
+        assert second.response['status'] == 'R'
+        assert first.etag != second.etag
+
+    def test_etag_ignores_key_order(self, response):
+        first = schema_response_cache.get_schema_response(
+            1,
+            lambda: response
+        )
+        second = schema_response_cache.get_schema_response(
+            2,
+            lambda: OrderedDict(sorted(response.items(), reverse=True))
+        )
+        assert first.etag == second.etag
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import pytest
+
+from schematizer.logic import exceptions as sch_exc
+from schematizer.logic import source_lock
+from schematizer.models.database import session
+from tests.models.testing_db import DBTestCase
+
+
+class TestSourceLock(DBTestCase):
+
+    @property
+    def namespace_name(self):
+        return 'foo'
+
+    @property
+    def source_name(self):
+        return 'bar'
+
+    @property
+    def lock_name(self):
+        return source_lock.get_source_lock_name(
+            self.namespace_name,
+            self.source_name
+        )
+
+    @pytest.yield_fixture
+    def other_connection(self):
+        connection = self.engine.connect()
+        yield connection
+        connection.close()
+
+    def is_lock_free(self, connection, lock_name):
+        return connection.execute(
+            'select is_free_lock(%s)', lock_name
+        ).scalar() == 1
+
+    def test_lock_name_is_unique_per_source(self):
+        assert self.lock_name != source_lock.get_source_lock_name(
+            self.namespace_name,
+            'baz'
+        )
+        assert self.lock_name != source_lock.get_source_lock_name(
+            self.namespace_name + '|' + self.source_name,
+            ''
+        )
+        assert len(self.lock_name) <= 64
+
+    def test_lock_source(self, other_connection):
+        source_lock.lock_source(self.namespace_name, self.source_name)
+        assert not self.is_lock_free(other_connection, self.lock_name)
+
+    def test_lock_source_twice(self, other_connection):
+        source_lock.lock_source(self.namespace_name, self.source_name)
+        source_lock.lock_source(self.namespace_name, self.source_name)
+        session.commit()
+        assert self.is_lock_free(other_connection, self.lock_name)
+
+    @pytest.mark.parametrize('end_transaction', [
+        lambda: session.commit(),
+        lambda: session.rollback(),
+    ])
+    def test_lock_is_released_at_end_of_transaction(
+        self,
+        other_connection,
+        end_transaction
+    ):
+        source_lock.lock_source(self.namespace_name, self.source_name)
+        end_transaction()
+        assert self.is_lock_free(other_connection, self.lock_name)
+
+    def test_lock_is_held_after_savepoint(self, other_connection):
+        with session.begin_nested():
+            source_lock.lock_source(self.namespace_name, self.source_name)
+        assert not self.is_lock_free(other_connection, self.lock_name)
+
+    def test_lock_source_timeout(self, other_connection):
+        other_connection.execute('select get_lock(%s, 0)', self.lock_name)
+        with pytest.raises(sch_exc.LockTimeoutException):
+            source_lock.lock_source(
+                self.namespace_name,
+                self.source_name,
+                timeout=0
+            )
+
+    def test_lock_multiple_sources(self, other_connection):
+        # Each lock is held on its own connection, so acquiring the lock of
+        # another source does not release the previous one.
+        other_lock_name = source_lock.get_source_lock_name(
+            self.namespace_name,
+            'baz'
+        )
+        source_lock.lock_source(self.namespace_name, self.source_name)
+        source_lock.lock_source(self.namespace_name, 'baz')
+        assert not self.is_lock_free(other_connection, self.lock_name)
+        assert not self.is_lock_free(other_connection, other_lock_name)
+        session.commit()
+        assert self.is_lock_free(other_connection, self.lock_name)
+        assert self.is_lock_free(other_connection, other_lock_name)
@@ -20,6 +20,7 @@ import pytest
 import simplejson
 
 from schematizer import models
+from schematizer.helpers.avro_schema_cache import get_schema_fingerprint
 from schematizer.models.avro_schema import AvroSchema
 from schematizer_testing import factories
 from tests.models.base_model_test import GetAllModelTestBase
@@ -49,6 +50,75 @@ class TestGetAllAvroSchemas(GetAllModelTestBase):
     assert_func_name = 'assert_equal_avro_schema'
 
 
+class TestDecodedAvroSchema(object):
+
+    @property
+    def schema_json(self):
+        return {
+            'type': 'record',
+            'name': 'foo',
+            'fields': [{'name': 'bar', 'type': 'int'}]
+        }
+
+    @property
+    def another_schema_json(self):
+        return {
+            'type': 'record',
+            'name': 'foo',
+            'fields': [{'name': 'baz', 'type': 'string'}]
+        }
+
+    @pytest.fixture
+    def avro_schema(self):
+        return AvroSchema(avro_schema_json=self.schema_json)
+
+    def test_avro_schema_json_is_decoded_once(self, avro_schema):
+        actual = avro_schema.avro_schema_json
+        assert actual == self.schema_json
+        assert avro_schema.avro_schema_json is actual
+
+    def test_avro_schema_json_after_schema_json_is_set(self, avro_schema):
+        avro_schema.avro_schema_json
+        avro_schema.avro_schema_json = self.another_schema_json
+        assert avro_schema.avro_schema_json == self.another_schema_json
+
+    def test_avro_schema_json_after_schema_is_set(self, avro_schema):
+        avro_schema.avro_schema_json
+        avro_schema.avro_schema = simplejson.dumps(self.another_schema_json)
+        assert avro_schema.avro_schema_json == self.another_schema_json
+
+    def test_fingerprint_after_schema_json_is_set(self, avro_schema):
+        avro_schema.avro_schema_json = self.another_schema_json
+        assert avro_schema.fingerprint == get_schema_fingerprint(
+            self.another_schema_json
+        )
+
+    def test_fingerprint_after_schema_is_set(self):
+        avro_schema = AvroSchema(
+            avro_schema=simplejson.dumps(self.another_schema_json)
+        )
+        assert avro_schema.fingerprint == get_schema_fingerprint(
+            self.another_schema_json
+        )
+
+    def test_avro_schema_object(self, avro_schema):
+        actual = avro_schema.avro_schema_object
+        assert actual.to_json() == self.schema_json
+        assert avro_schema.avro_schema_object is actual
+
+    def test_avro_schema_object_after_schema_is_set(self, avro_schema):
+        avro_schema.avro_schema_object
+        avro_schema.avro_schema = simplejson.dumps(self.another_schema_json)
+        assert (avro_schema.avro_schema_object.to_json() ==
+                self.another_schema_json)
+
+    def test_avro_schema_object_after_schema_json_is_set(self, avro_schema):
+        avro_schema.avro_schema_object
+        avro_schema.avro_schema_json = self.another_schema_json
+        assert (avro_schema.avro_schema_object.to_json() ==
+                self.another_schema_json)
+
+
 class TestAvroSchemaModel(DBTestCase):
 
     @property
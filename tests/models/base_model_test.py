@@ -57,6 +57,30 @@ class GetAllModelTestBase(DBTestCase):
             assert_func=self.assert_func
         )
 
+    def test_get_all_entities_in_batches(self, entity_1, entity_2, entity_3):
+        actual = self.entity_model.get_all(batch_size=2)
+        asserts.assert_equal_entity_list(
+            actual_list=list(actual),
+            expected_list=[entity_1, entity_2, entity_3],
+            assert_func=self.assert_func
+        )
+
+    def test_get_entities_in_batches_with_count(
+        self,
+        entity_1,
+        entity_2,
+        entity_3
+    ):
+        actual = self.entity_model.get_all(
+            PageInfo(count=2, min_id=entity_1.id),
+            batch_size=1
+        )
+        asserts.assert_equal_entity_list(
+            actual_list=list(actual),
+            expected_list=[entity_1, entity_2],
+            assert_func=self.assert_func
+        )
+
     def test_when_no_entity_exists(self):
         actual = self.entity_model.get_all()
         assert actual == []
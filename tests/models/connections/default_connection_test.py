@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import mock
+import pytest
+from sqlalchemy import Column
+from sqlalchemy import create_engine
+from sqlalchemy import Integer
+from sqlalchemy import String
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.declarative import declarative_base
+
+from schematizer.models.connections import default_connection
+
+
+Base = declarative_base()
+
+
+class Foo(Base):
+
+    __tablename__ = 'foo'
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(32))
+
+
+class TestTopology(object):
+
+    @pytest.fixture
+    def topology(self):
+        return {'topology': [
+            {'cluster': 'other', 'replica': 'master', 'entries': [{'id': 0}]},
+            {'cluster': 'foo', 'replica': 'slave', 'entries': [{'id': 1}]},
+            {'cluster': 'foo', 'replica': 'master', 'entries': [{'id': 2}]},
+            {'cluster': 'foo', 'replica': 'slave', 'entries': [{'id': 3}]},
+            {'cluster': 'foo', 'replica': 'reporting', 'entries': [{'id': 4}]},
+        ]}
+
+    def test_get_cluster_config(self, topology):
+        actual = default_connection._get_cluster_config(topology, 'foo')
+        assert actual == {'id': 2}
+
+    def test_get_cluster_config_without_replica(self):
+        topology = {'topology': [{'cluster': 'foo', 'entries': [{'id': 1}]}]}
+        actual = default_connection._get_cluster_config(topology, 'foo')
+        assert actual == {'id': 1}
+
+    def test_get_replica_configs(self, topology):
+        actual = default_connection._get_replica_configs(
+            topology,
+            'foo',
+            'slave'
+        )
+        assert actual == [{'id': 1}, {'id': 3}]
+
+
+class TestReplica(object):
+
+    @pytest.fixture
+    def engine(self):
+        return mock.MagicMock()
+
+    @pytest.fixture
+    def slave_status(self, engine):
+        conn = engine.connect.return_value.__enter__.return_value
+        return conn.execute.return_value.first
+
+    @pytest.fixture
+    def replica(self, engine):
+        return default_connection._Replica(engine, 'foo')
+
+    @pytest.yield_fixture(autouse=True)
+    def mock_time(self):
+        with mock.patch.object(
+            default_connection.time,
+            'time',
+            return_value=100.0
+        ) as mock_time:
+            yield mock_time
+
+    def test_replica_with_lag(self, replica, slave_status):
+        slave_status.return_value = {'Seconds_Behind_Master': 3}
+        assert replica.get_replayed_until(check_interval_seconds=1) == 96.0
+
+    def test_database_not_replicating(self, replica, slave_status):
+        slave_status.return_value = None
+        assert replica.get_replayed_until(check_interval_seconds=1) == 100.0
+
+    def test_replication_stopped(self, replica, slave_status):
+        slave_status.return_value = {'Seconds_Behind_Master': None}
+        assert replica.get_replayed_until(check_interval_seconds=1) is None
+
+    def test_replica_not_reachable(self, replica, engine):
+        engine.connect.side_effect = OperationalError('foo', {}, None)
+        assert replica.get_replayed_until(check_interval_seconds=1) is None
+
+    def test_replica_without_replication_client_privilege(
+        self,
+        replica,
+        engine
+    ):
+        engine.connect.side_effect = OperationalError(
+            'SHOW SLAVE STATUS',
+            {},
+            Exception(1227, 'Access denied; you need the REPLICATION CLIENT '
+                            'privilege for this operation')
+        )
+        with mock.patch.object(default_connection, 'log') as mock_log:
+            assert replica.get_replayed_until(check_interval_seconds=1) is None
+            replica.get_replayed_until(check_interval_seconds=0)
+        assert mock_log.error.call_count == 1
+        assert 'REPLICATION CLIENT' in mock_log.error.call_args[0][0]
+
+    def test_replica_available_again(self, replica, engine, slave_status):
+        engine.connect.side_effect = OperationalError('foo', {}, None)
+        replica.get_replayed_until(check_interval_seconds=0)
+        engine.connect.side_effect = None
+        slave_status.return_value = {'Seconds_Behind_Master': 0}
+        with mock.patch.object(default_connection, 'log') as mock_log:
+            assert replica.get_replayed_until(check_interval_seconds=0) == 99.0
+        assert mock_log.info.call_count == 1
+
+    def test_lag_check_does_not_block_other_callers(
+        self,
+        replica,
+        slave_status
+    ):
+        def check_during_lag_check():
+            # The lag is being checked, so the last known value is returned
+            # without waiting for the check.
+            assert replica.get_replayed_until(check_interval_seconds=0) is None
+            return {'Seconds_Behind_Master': 0}
+
+        slave_status.side_effect = check_during_lag_check
+        assert replica.get_replayed_until(check_interval_seconds=0) == 99.0
+        assert slave_status.call_count == 1
+
+    def test_lag_checked_once_per_interval(
+        self,
+        replica,
+        slave_status,
+        mock_time
+    ):
+        slave_status.return_value = {'Seconds_Behind_Master': 0}
+        replica.get_replayed_until(check_interval_seconds=1)
+        mock_time.return_value = 100.5
+        assert replica.get_replayed_until(check_interval_seconds=1) == 99.0
+        assert slave_status.call_count == 1
+
+        mock_time.return_value = 101.0
+        assert replica.get_replayed_until(check_interval_seconds=1) == 100.0
+        assert slave_status.call_count == 2
+
+
+class TestReplicaPool(object):
+
+    def create_replica(self, replayed_until):
+        replica = mock.Mock()
+        replica.get_replayed_until.return_value = replayed_until
+        return replica
+
+    @pytest.fixture
+    def up_to_date_replica(self):
+        return self.create_replica(replayed_until=99.0)
+
+    @pytest.fixture
+    def lagging_replica(self):
+        return self.create_replica(replayed_until=90.0)
+
+    @pytest.fixture
+    def stopped_replica(self):
+        return self.create_replica(replayed_until=None)
+
+    @pytest.yield_fixture(autouse=True)
+    def mock_time(self):
+        with mock.patch.object(
+            default_connection.time,
+            'time',
+            return_value=100.0
+        ):
+            yield
+
+    def create_pool(self, *replicas):
+        return default_connection._ReplicaPool(
+            list(replicas),
+            max_lag_seconds=5,
+            lag_check_interval_seconds=1
+        )
+
+    def test_choose_replica_within_max_lag(
+        self,
+        up_to_date_replica,
+        lagging_replica,
+        stopped_replica
+    ):
+        pool = self.create_pool(
+            lagging_replica,
+            up_to_date_replica,
+            stopped_replica
+        )
+        assert pool.choose_engine() == up_to_date_replica.engine
+
+    def test_no_replica_within_max_lag(self, lagging_replica, stopped_replica):
+        pool = self.create_pool(lagging_replica, stopped_replica)
+        assert pool.choose_engine() is None
+
+    def test_choose_replica_having_write(self, up_to_date_replica):
+        pool = self.create_pool(up_to_date_replica)
+        assert pool.choose_engine(written_at=98.5) == up_to_date_replica.engine
+        assert pool.choose_engine(written_at=99.5) is None
+
+
+class TestRoutingSession(object):
+
+    def create_engine(self, name):
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(engine)
+        engine.execute(Foo.__table__.insert(), {'id': 1, 'name': name})
+        return engine
+
+    @pytest.fixture
+    def master(self):
+        return self.create_engine('master')
+
+    @pytest.fixture
+    def replica(self):
+        return self.create_engine('replica')
+
+    @pytest.fixture
+    def replica_pool(self, replica):
+        replica_pool = mock.Mock()
+        replica_pool.choose_engine.return_value = replica
+        return replica_pool
+
+    @pytest.yield_fixture
+    def session(self, master, replica_pool):
+        session = default_connection._RoutingSession(
+            bind=master,
+            replica_pool=replica_pool
+        )
+        yield session
+        session.close()
+
+    def get_name(self, session):
+        return session.query(Foo.name).filter(Foo.id == 1).scalar()
+
+    def test_read_from_master(self, session):
+        assert self.get_name(session) == 'master'
+        assert not session.reads_from_replica
+
+    def test_read_from_replica(self, session, replica_pool):
+        assert session.use_replica(written_at=10.0)
+        assert self.get_name(session) == 'replica'
+        replica_pool.choose_engine.assert_called_once_with(written_at=10.0)
+
+    def test_no_replica_up_to_date(self, session, replica_pool):
+        replica_pool.choose_engine.return_value = None
+        assert not session.use_replica()
+        assert self.get_name(session) == 'master'
+
+    def test_reading_from_master(self, session):
+        session.use_replica()
+        with session.reading_from_master():
+            assert self.get_name(session) == 'master'
+        assert self.get_name(session) == 'replica'
+
+    def test_read_from_master_after_write(self, session):
+        session.use_replica()
+        session.add(Foo(id=2, name='bar'))
+        session.flush()
+
+        assert session.has_written
+        assert not session.reads_from_replica
+        assert self.get_name(session) == 'master'
+        assert session.query(Foo.name).filter(Foo.id == 2).scalar() == 'bar'
+
+    def test_update_goes_to_master(self, session, master):
+        session.use_replica()
+        session.query(Foo).filter(Foo.id == 1).update({'name': 'bar'})
+        session.commit()
+
+        assert session.has_written
+        assert master.execute('SELECT name FROM foo').scalar() == 'bar'
+
+    def test_close_resets_routing(self, session):
+        session.use_replica()
+        session.add(Foo(id=2, name='bar'))
+        session.flush()
+        session.close()
+
+        assert not session.has_written
+        assert not session.reads_from_replica
@@ -19,6 +19,9 @@ from __future__ import unicode_literals
 import pytest
 from sqlalchemy.exc import IntegrityError
 
+from schematizer.models.avro_schema import AvroSchema
+from schematizer.models.avro_schema import AvroSchemaStatus
+from schematizer.models.database import session
 from schematizer.models.source import Topic
 from schematizer_testing import factories
 from tests.models.base_model_test import GetAllModelTestBase
@@ -64,3 +67,34 @@ class TestTopicModel(DBTestCase):
                 source_name=biz_source.name,
                 cluster_type=None
             )
+
+    def test_primary_keys(self, biz_source):
+        topic = factories.create_topic(
+            topic_name='yelp.biz_test.1',
+            namespace_name=biz_source.namespace.name,
+            source_name=biz_source.name,
+            primary_keys=['id']
+        )
+        assert topic.primary_keys == ['id']
+
+    def test_primary_keys_of_topic_not_backfilled(self, biz_source):
+        topic = factories.create_topic(
+            topic_name='yelp.biz_test.1',
+            namespace_name=biz_source.namespace.name,
+            source_name=biz_source.name
+        )
+        assert topic.primary_keys == []
+
+        AvroSchema.create(
+            session,
+            avro_schema_json={
+                'type': 'record',
+                'name': 'foo',
+                'fields': [],
+                'pkey': ['id']
+            },
+            topic_id=topic.id,
+            status=AvroSchemaStatus.READ_AND_WRITE
+        )
+        session.expire(topic, ['avro_schemas'])
+        assert topic.primary_keys == ['id']
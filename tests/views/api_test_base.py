@@ -19,6 +19,7 @@ from __future__ import unicode_literals
 import mock
 import pytest
 from pyramid import httpexceptions
+from pyramid.response import Response
 
 from schematizer import models
 from schematizer.helpers.formatting import _format_datetime
@@ -33,6 +34,8 @@ class ApiTestBase(DBTestCase):
     @pytest.yield_fixture
     def mock_request(self):
         with mock.patch('pyramid.request.Request', autospec=True) as mock_req:
+            mock_req.params = {}
+            mock_req.response = Response()
             yield mock_req
 
     def get_expected_namespace_resp(self, namespace_id):
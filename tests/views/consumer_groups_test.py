@@ -28,7 +28,7 @@ from tests.views.api_test_base import ApiTestBase
 class TestGetConsumerGroups(ApiTestBase):
 
     def test_no_consumer_group(self, mock_request):
-        actual = con_group_views.get_consumer_groups(mock_request)
+        actual = list(con_group_views.get_consumer_groups(mock_request))
         assert actual == []
 
     def test_one_consumer_group(
@@ -41,7 +41,7 @@ class TestGetConsumerGroups(ApiTestBase):
             'another_consumer_group',
             data_target=dw_data_target
         )
-        actual = con_group_views.get_consumer_groups(mock_request)
+        actual = list(con_group_views.get_consumer_groups(mock_request))
         expected = [
             self.get_expected_consumer_group_resp(dw_consumer_group.id),
             self.get_expected_consumer_group_resp(another_consumer_group.id)
@@ -28,11 +28,11 @@ from tests.views.api_test_base import ApiTestBase
 class TestGetDataTargets(ApiTestBase):
 
     def test_no_data_targets(self, mock_request):
-        actual = data_target_views.get_data_targets(mock_request)
+        actual = list(data_target_views.get_data_targets(mock_request))
         assert actual == []
 
     def test_one_data_target(self, mock_request, dw_data_target):
-        actual = data_target_views.get_data_targets(mock_request)
+        actual = list(data_target_views.get_data_targets(mock_request))
         expected = [self.get_expected_data_target_resp(dw_data_target.id)]
         assert actual == expected
 
@@ -17,8 +17,12 @@ from __future__ import absolute_import
 from __future__ import unicode_literals
 
 import pytest
+import staticconf.testing
 
 from schematizer.views import namespaces as namespace_views
+from schematizer.views.view_common import NEXT_CURSOR_HEADER
+from schematizer_testing import factories
+from schematizer_testing import utils
 from tests.views.api_test_base import ApiTestBase
 
 
@@ -37,14 +41,14 @@ class TestListSourcesByNamespace(ApiTestBase):
     def test_happy_case(self, mock_request, yelp_namespace, biz_source):
         mock_request.matchdict = {'namespace': yelp_namespace.name}
         mock_request.params = {}
-        actual = namespace_views.list_sources_by_namespace(mock_request)
+        actual = list(namespace_views.list_sources_by_namespace(mock_request))
         expected = [self.get_expected_src_resp(biz_source.id)]
         assert actual == expected
 
     def test_with_min_id(self, mock_request, yelp_namespace, biz_source):
         mock_request.matchdict = {'namespace': yelp_namespace.name}
         mock_request.params = {'min_id': biz_source.id + 1}
-        actual = namespace_views.list_sources_by_namespace(mock_request)
+        actual = list(namespace_views.list_sources_by_namespace(mock_request))
         assert actual == []
 
     def test_with_count(
@@ -56,21 +60,101 @@ class TestListSourcesByNamespace(ApiTestBase):
     ):
         mock_request.matchdict = {'namespace': yelp_namespace.name}
         mock_request.params = {'count': 1}
-        actual = namespace_views.list_sources_by_namespace(mock_request)
+        actual = list(namespace_views.list_sources_by_namespace(mock_request))
         expected = [self.get_expected_src_resp(biz_source.id)]
         assert actual == expected
+        assert NEXT_CURSOR_HEADER in mock_request.response.headers
+
+    def test_with_cursor(
+            self,
+            mock_request,
+            yelp_namespace,
+            biz_source,
+            another_biz_source
+    ):
+        mock_request.matchdict = {'namespace': yelp_namespace.name}
+        mock_request.params = {'count': 1}
+        namespace_views.list_sources_by_namespace(mock_request)
+        cursor = mock_request.response.headers[NEXT_CURSOR_HEADER]
+
+        mock_request.params = {'count': 1, 'cursor': cursor}
+        actual = list(namespace_views.list_sources_by_namespace(mock_request))
+        expected = [self.get_expected_src_resp(another_biz_source.id)]
+        assert actual == expected
 
 
 class TestListNamespaces(ApiTestBase):
 
     def test_no_namespaces(self, mock_request):
-        actual = namespace_views.list_namespaces(mock_request)
+        actual = list(namespace_views.list_namespaces(mock_request))
         assert actual == []
 
     def test_happy_case(self, mock_request, yelp_namespace):
-        actual = namespace_views.list_namespaces(mock_request)
+        actual = list(namespace_views.list_namespaces(mock_request))
         expected = [self.get_expected_namespace_resp(yelp_namespace.id)]
         assert actual == expected
+        assert NEXT_CURSOR_HEADER not in mock_request.response.headers
+
+    def test_paginate_with_cursor(self, mock_request):
+        namespaces = [factories.create_namespace('namespace_{}'.format(i))
+                      for i in range(5)]
+        expected = [self.get_expected_namespace_resp(namespace.id)
+                    for namespace in namespaces]
+
+        actual = []
+        with staticconf.testing.MockConfiguration(
+            {'default_page_size': 2}
+        ), utils.count_queries(self.engine) as statements:
+            while True:
+                page = list(namespace_views.list_namespaces(mock_request))
+                actual += page
+                assert len(page) <= 2
+                cursor = mock_request.response.headers.get(NEXT_CURSOR_HEADER)
+                if not cursor:
+                    break
+                mock_request.params = {'cursor': cursor}
+                del mock_request.response.headers[NEXT_CURSOR_HEADER]
+
+        assert actual == expected
+        # Every page is a single bounded query, and the whole table is never
+        # loaded at once.
+        assert len(statements) == 3
+        assert all('LIMIT' in statement for statement in statements)
+
+    def test_all_namespaces_without_count(self, mock_request):
+        namespaces = [factories.create_namespace('namespace_{}'.format(i))
+                      for i in range(5)]
+        expected = [self.get_expected_namespace_resp(namespace.id)
+                    for namespace in namespaces]
+
+        with staticconf.testing.MockConfiguration(
+            {'streaming_response_batch_size': 2}
+        ), utils.count_queries(self.engine) as statements:
+            actual = list(namespace_views.list_namespaces(mock_request))
+
+        assert actual == expected
+        assert NEXT_CURSOR_HEADER not in mock_request.response.headers
+        # All the namespaces are returned, but they are read in bounded
+        # batches rather than loaded at once.
+        assert len(statements) == 3
+        assert all('LIMIT' in statement for statement in statements)
+
+    @pytest.mark.parametrize('params', [
+        {'count': 'foo'},
+        {'count': '-1'},
+        {'min_id': 'foo'},
+    ])
+    def test_invalid_pagination_params(self, mock_request, params):
+        mock_request.params = params
+        expected_exception = self.get_http_exception(400)
+        with pytest.raises(expected_exception):
+            namespace_views.list_namespaces(mock_request)
+
+    def test_invalid_cursor(self, mock_request):
+        mock_request.params = {'cursor': 'foo'}
+        expected_exception = self.get_http_exception(400)
+        with pytest.raises(expected_exception):
+            namespace_views.list_namespaces(mock_request)
 
 
 class TestListRefreshesByNamespace(ApiTestBase):
@@ -86,6 +170,86 @@ class TestListRefreshesByNamespace(ApiTestBase):
 
     def test_happy_case(self, mock_request, yelp_namespace, biz_src_refresh):
         mock_request.matchdict = {'namespace': yelp_namespace.name}
-        actual = namespace_views.list_refreshes_by_namespace(mock_request)
+        actual = list(
+            namespace_views.list_refreshes_by_namespace(mock_request)
+        )
         expected = [self.get_expected_src_refresh_resp(biz_src_refresh.id)]
         assert actual == expected
+
+    def test_multiple_sources(
+        self,
+        mock_request,
+        yelp_namespace,
+        biz_source,
+        another_biz_source,
+        biz_src_refresh
+    ):
+        another_refresh = factories.create_refresh(another_biz_source.id)
+        expected = [
+            self.get_expected_src_refresh_resp(biz_src_refresh.id),
+            self.get_expected_src_refresh_resp(another_refresh.id)
+        ]
+        mock_request.matchdict = {'namespace': yelp_namespace.name}
+        with utils.count_queries(self.engine) as statements:
+            actual = list(
+                namespace_views.list_refreshes_by_namespace(mock_request)
+            )
+        assert actual == expected
+        assert len(statements) == 1
+
+    def test_paginate_with_cursor(
+        self,
+        mock_request,
+        yelp_namespace,
+        another_biz_source,
+        biz_src_refresh
+    ):
+        another_refresh = factories.create_refresh(another_biz_source.id)
+        mock_request.matchdict = {'namespace': yelp_namespace.name}
+        mock_request.params = {'count': 1}
+        actual = list(
+            namespace_views.list_refreshes_by_namespace(mock_request)
+        )
+        assert actual == [
+            self.get_expected_src_refresh_resp(biz_src_refresh.id)
+        ]
+
+        cursor = mock_request.response.headers[NEXT_CURSOR_HEADER]
+        mock_request.params = {'count': 1, 'cursor': cursor}
+        actual = list(
+            namespace_views.list_refreshes_by_namespace(mock_request)
+        )
+        assert actual == [
+            self.get_expected_src_refresh_resp(another_refresh.id)
+        ]
+
+    def test_paginate_grouped_by_source(
+        self,
+        mock_request,
+        yelp_namespace,
+        biz_source,
+        another_biz_source,
+        biz_src_refresh
+    ):
+        refreshes = [
+            biz_src_refresh,
+            factories.create_refresh(another_biz_source.id),
+            factories.create_refresh(biz_source.id)
+        ]
+        expected = [
+            self.get_expected_src_refresh_resp(refresh.id)
+            for refresh in sorted(refreshes, key=lambda r: (r.source_id, r.id))
+        ]
+        mock_request.matchdict = {'namespace': yelp_namespace.name}
+        mock_request.params = {'count': 2}
+        actual = []
+        while True:
+            actual += list(
+                namespace_views.list_refreshes_by_namespace(mock_request)
+            )
+            headers = mock_request.response.headers
+            cursor = headers.pop(NEXT_CURSOR_HEADER, None)
+            if not cursor:
+                break
+            mock_request.params = {'count': 2, 'cursor': cursor}
+        assert actual == expected
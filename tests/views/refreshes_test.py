@@ -20,9 +20,14 @@ import time
 from datetime import datetime
 
 import pytest
+import staticconf.testing
 
 from schematizer.api.exceptions import exceptions_v1
+from schematizer.models.refresh import Priority
 from schematizer.views import refreshes as refresh_views
+from schematizer.views.view_common import NEXT_CURSOR_HEADER
+from schematizer_testing import factories
+from schematizer_testing import utils
 from tests.views.api_test_base import ApiTestBase
 
 
@@ -87,7 +92,7 @@ class TestGetRefreshesByCriteria(ApiTestBase):
 
     def test_non_existing_namespace(self, mock_request):
         mock_request.params = {'namespace': 'missing'}
-        actual = refresh_views.get_refreshes_by_criteria(mock_request)
+        actual = list(refresh_views.get_refreshes_by_criteria(mock_request))
         assert actual == []
 
     def test_no_matching_refreshes(self, mock_request, yelp_namespace):
@@ -95,7 +100,7 @@ class TestGetRefreshesByCriteria(ApiTestBase):
             'namespace': yelp_namespace.name,
             'status': 'FAILED'
         }
-        actual = refresh_views.get_refreshes_by_criteria(mock_request)
+        actual = list(refresh_views.get_refreshes_by_criteria(mock_request))
         assert actual == []
 
     def test_filter_by_namespace(
@@ -108,7 +113,7 @@ class TestGetRefreshesByCriteria(ApiTestBase):
             'namespace': yelp_namespace.name,
             'status': 'NOT_STARTED'
         }
-        actual = refresh_views.get_refreshes_by_criteria(mock_request)
+        actual = list(refresh_views.get_refreshes_by_criteria(mock_request))
         expected = [self.get_expected_src_refresh_resp(biz_src_refresh.id)]
         assert actual == expected
 
@@ -129,6 +134,62 @@ class TestGetRefreshesByCriteria(ApiTestBase):
             'updated_after': updated_timestamp,
             'status': 'FAILED'
         }
-        actual = refresh_views.get_refreshes_by_criteria(mock_request)
+        actual = list(refresh_views.get_refreshes_by_criteria(mock_request))
         expected = [self.get_expected_src_refresh_resp(biz_src_refresh.id)]
         assert actual == expected
+
+    def test_paginate_with_cursor(self, mock_request, biz_source):
+        priorities = [Priority.LOW, Priority.HIGH, Priority.MEDIUM,
+                      Priority.HIGH, Priority.LOW]
+        refreshes = [
+            factories.create_refresh(biz_source.id, priority=priority.value)
+            for priority in priorities
+        ]
+        expected = [
+            self.get_expected_src_refresh_resp(refresh.id)
+            for refresh in sorted(refreshes, key=lambda r: (-r.priority, r.id))
+        ]
+
+        actual = []
+        mock_request.params = {'count': 2}
+        while True:
+            actual += list(
+                refresh_views.get_refreshes_by_criteria(mock_request)
+            )
+            headers = mock_request.response.headers
+            cursor = headers.pop(NEXT_CURSOR_HEADER, None)
+            if not cursor:
+                break
+            mock_request.params = {'count': 2, 'cursor': cursor}
+
+        assert actual == expected
+
+    def test_all_refreshes_without_count(self, mock_request, biz_source):
+        priorities = [Priority.LOW, Priority.HIGH, Priority.MEDIUM,
+                      Priority.HIGH, Priority.LOW]
+        refreshes = [
+            factories.create_refresh(biz_source.id, priority=priority.value)
+            for priority in priorities
+        ]
+        expected = [
+            self.get_expected_src_refresh_resp(refresh.id)
+            for refresh in sorted(refreshes, key=lambda r: (-r.priority, r.id))
+        ]
+
+        with staticconf.testing.MockConfiguration(
+            {'streaming_response_batch_size': 2}
+        ), utils.count_queries(self.engine) as statements:
+            actual = list(
+                refresh_views.get_refreshes_by_criteria(mock_request)
+            )
+
+        assert actual == expected
+        assert NEXT_CURSOR_HEADER not in mock_request.response.headers
+        # All the refreshes are returned, but they are read in bounded
+        # batches rather than loaded at once.
+        refresh_statements = [
+            statement for statement in statements
+            if statement.startswith('SELECT refresh.')
+        ]
+        assert len(refresh_statements) == 3
+        assert all('LIMIT' in statement for statement in refresh_statements)
@@ -22,12 +22,21 @@ from datetime import timedelta
 import mock
 import pytest
 import simplejson
+import staticconf.testing
+from pyramid.request import Request
+from pyramid.response import Response
 
 from schematizer import models
 from schematizer.api.exceptions import exceptions_v1
 from schematizer.helpers.formatting import _format_datetime
+from schematizer.helpers.shared_poller import SharedPoller
+from schematizer.logic import doc_tool
+from schematizer.logic import schema_repository
+from schematizer.logic import schema_watcher
+from schematizer.models.database import session
 from schematizer.views import schemas as schema_views
 from schematizer_testing import factories
+from schematizer_testing import utils
 from tests.views.api_test_base import ApiTestBase
 
 
@@ -66,6 +75,99 @@ class TestGetSchemaByID(ApiTestBase):
         assert actual == expected
 
 
+class TestGetSchemaByIDCache(ApiTestBase):
+
+    @pytest.fixture
+    def schema_request(self, biz_schema):
+        def create_request(if_none_match=None):
+            request = Request.blank(
+                '/v1/schemas/{}'.format(biz_schema.id),
+                if_none_match=if_none_match
+            )
+            request.matchdict = {'schema_id': str(biz_schema.id)}
+            request.response = Response()
+            return request
+        return create_request
+
+    def test_response_has_cache_headers(self, schema_request, biz_schema):
+        request = schema_request()
+        actual = schema_views.get_schema_by_id(request)
+
+        assert actual == self.get_expected_schema_resp(biz_schema.id)
+        assert request.response.etag
+        assert request.response.cache_control.public
+        assert request.response.cache_control.max_age == 60
+
+    def test_not_modified(self, schema_request):
+        first_request = schema_request()
+        schema_views.get_schema_by_id(first_request)
+        etag = first_request.response.etag
+
+        request = schema_request(if_none_match='"{}"'.format(etag))
+        actual = schema_views.get_schema_by_id(request)
+
+        assert actual is request.response
+        assert actual.status_int == 304
+        assert actual.etag == etag
+
+    def test_response_with_selected_fields(self, schema_request, biz_schema):
+        full_request = schema_request()
+        schema_views.get_schema_by_id(full_request)
+
+        request = schema_request()
+        request.GET['fields'] = 'schema_id,topic.name'
+        actual = schema_views.get_schema_by_id(request)
+
+        assert actual == {
+            'schema_id': biz_schema.id,
+            'topic': {'name': biz_schema.topic.name}
+        }
+        assert request.response.etag
+        assert request.response.etag != full_request.response.etag
+
+    def test_response_is_cached(self, schema_request, biz_schema):
+        expected = self.get_expected_schema_resp(biz_schema.id)
+        schema_views.get_schema_by_id(schema_request())
+
+        with utils.count_queries(self.engine) as statements:
+            actual = schema_views.get_schema_by_id(schema_request())
+        assert actual == expected
+        assert statements == []
+
+    def test_note_change_invalidates_response(
+        self,
+        schema_request,
+        biz_schema
+    ):
+        first_request = schema_request()
+        schema_views.get_schema_by_id(first_request)
+
+        note = doc_tool.create_note(
+            reference_type=models.ReferenceTypeEnum.SCHEMA,
+            reference_id=biz_schema.id,
+            note_text='biz schema note',
+            last_updated_by='test@yelp.com'
+        )
+        request = schema_request(
+            if_none_match='"{}"'.format(first_request.response.etag)
+        )
+        actual = schema_views.get_schema_by_id(request)
+
+        assert actual['note']['id'] == note.id
+        assert request.response.etag != first_request.response.etag
+
+    def test_status_change_invalidates_response(
+        self,
+        schema_request,
+        biz_schema
+    ):
+        schema_views.get_schema_by_id(schema_request())
+        schema_repository.mark_schema_readonly(biz_schema.id)
+
+        actual = schema_views.get_schema_by_id(schema_request())
+        assert actual['status'] == models.AvroSchemaStatus.READ_ONLY
+
+
 class TestGetSchemaAfterDate(ApiTestBase):
 
     def test_get_schemas_filter_by_created_timestamp(
@@ -80,13 +182,17 @@ class TestGetSchemaAfterDate(ApiTestBase):
         creation_timestamp = (biz_created_at -
                               datetime.utcfromtimestamp(0)).total_seconds()
         mock_request.params = {'created_after': creation_timestamp}
-        schemas_early = schema_views.get_schemas_created_after(mock_request)
+        schemas_early = list(
+            schema_views.get_schemas_created_after(mock_request)
+        )
 
         biz_created_at = biz_schema.created_at + timedelta(1, 0)
         creation_timestamp = (biz_created_at -
                               datetime.utcfromtimestamp(0)).total_seconds()
         mock_request.params = {'created_after': creation_timestamp}
-        schemas_later = schema_views.get_schemas_created_after(mock_request)
+        schemas_later = list(
+            schema_views.get_schemas_created_after(mock_request)
+        )
         assert len(schemas_early) > len(schemas_later)
 
     def test_limit_schemas_by_count(
@@ -105,7 +211,8 @@ class TestGetSchemaAfterDate(ApiTestBase):
         }
 
         # Without the count param, length would be 2
-        assert len(schema_views.get_schemas_created_after(mock_request)) == 1
+        actual = list(schema_views.get_schemas_created_after(mock_request))
+        assert len(actual) == 1
 
     def test_limit_schemas_by_min_id(
         self,
@@ -130,8 +237,8 @@ class TestGetSchemaAfterDate(ApiTestBase):
                 'created_after': creation_timestamp,
                 'min_id': min_id
             }
-            actual_schemas = schema_views.get_schemas_created_after(
-                mock_request
+            actual_schemas = list(
+                schema_views.get_schemas_created_after(mock_request)
             )
             expected_schemas = [
                 self.get_expected_schema_resp(schema.id)
@@ -139,6 +246,86 @@ class TestGetSchemaAfterDate(ApiTestBase):
             ]
             assert actual_schemas == expected_schemas
 
+    def test_get_schemas_in_batches(
+        self,
+        mock_request,
+        biz_schema,
+        biz_pkey_schema
+    ):
+        note = factories.create_note(
+            models.ReferenceTypeEnum.SCHEMA,
+            biz_pkey_schema.id,
+            'biz pkey schema note',
+            'test@yelp.com'
+        )
+        sorted_schemas = sorted(
+            [biz_schema, biz_pkey_schema],
+            key=lambda schema: schema.id
+        )
+        expected = [
+            self.get_expected_schema_resp(schema.id)
+            for schema in sorted_schemas
+        ]
+        expected[sorted_schemas.index(biz_pkey_schema)]['note'] = (
+            self._get_expected_note_resp(note.id)
+        )
+        mock_request.params = {'created_after': 0}
+
+        with staticconf.testing.MockConfiguration(
+            {'streaming_response_batch_size': 1}
+        ), utils.count_queries(self.engine) as statements:
+            actual = list(schema_views.get_schemas_created_after(mock_request))
+
+        assert actual == expected
+        # The schemas, and the notes of each batch of schemas.
+        assert len(statements) == 3
+
+    def test_get_schemas_with_selected_fields(
+        self,
+        mock_request,
+        biz_schema,
+        biz_pkey_schema
+    ):
+        factories.create_note(
+            models.ReferenceTypeEnum.SCHEMA,
+            biz_pkey_schema.id,
+            'biz pkey schema note',
+            'test@yelp.com'
+        )
+        expected = [
+            {'schema_id': schema.id, 'topic': {'name': schema.topic.name}}
+            for schema in sorted(
+                [biz_schema, biz_pkey_schema],
+                key=lambda schema: schema.id
+            )
+        ]
+        mock_request.params = {
+            'created_after': 0,
+            'fields': 'schema_id,topic.name'
+        }
+
+        with staticconf.testing.MockConfiguration(
+            {'streaming_response_batch_size': 1}
+        ), utils.count_queries(self.engine) as statements:
+            actual = list(schema_views.get_schemas_created_after(mock_request))
+
+        assert actual == expected
+        # Neither the notes nor the schema json are queried.
+        assert len(statements) == 1
+        assert 'avro_schema.avro_schema' not in statements[0]
+
+    def _get_expected_note_resp(self, note_id):
+        note = utils.get_entity_by_id(models.Note, note_id)
+        return {
+            'id': note.id,
+            'reference_type': note.reference_type,
+            'reference_id': note.reference_id,
+            'note': note.note,
+            'last_updated_by': note.last_updated_by,
+            'created_at': _format_datetime(note.created_at),
+            'updated_at': _format_datetime(note.updated_at)
+        }
+
 
 class RegisterSchemaTestBase(ApiTestBase):
 
@@ -160,6 +347,66 @@ class RegisterSchemaTestBase(ApiTestBase):
         assert actual_namespace_name == request_json['namespace']
 
 
+class TestWatchSchemas(ApiTestBase):
+
+    @pytest.yield_fixture(autouse=True)
+    def poller(self):
+        poller = SharedPoller(
+            schema_watcher._poll_max_schema_id,
+            poll_interval_seconds=0
+        )
+        with mock.patch.object(
+            schema_watcher,
+            '_get_max_schema_id_poller',
+            return_value=poller
+        ):
+            yield poller
+
+    @pytest.fixture
+    def schema_ids(self, biz_schema, biz_pkey_schema):
+        # The watch ends the transaction to see new schemas, so the schemas
+        # must be committed.
+        schema_ids = sorted([biz_schema.id, biz_pkey_schema.id])
+        session.commit()
+        return schema_ids
+
+    def test_watch_schemas(self, mock_request, schema_ids):
+        mock_request.params = {'after_id': schema_ids[0], 'timeout': 0}
+        actual = list(schema_views.watch_schemas(mock_request))
+        assert actual == [self.get_expected_schema_resp(schema_ids[1])]
+
+    def test_watch_schemas_times_out(self, mock_request, schema_ids):
+        mock_request.params = {'after_id': schema_ids[1], 'timeout': 0}
+        actual = list(schema_views.watch_schemas(mock_request))
+        assert actual == []
+
+    def test_watch_schemas_with_count(self, mock_request, schema_ids):
+        mock_request.params = {'after_id': 0, 'timeout': 0, 'count': 1}
+        actual = list(schema_views.watch_schemas(mock_request))
+        assert [resp['schema_id'] for resp in actual] == schema_ids[:1]
+
+    @pytest.mark.parametrize('params', [
+        {'timeout': 'foo'},
+        {'timeout': '-1'},
+        {'after_id': 'foo'},
+        {'after_id': '-1'},
+        {'count': 'foo'},
+    ])
+    def test_watch_schemas_with_invalid_params(self, mock_request, params):
+        mock_request.params = params
+        expected_exception = self.get_http_exception(400)
+        with pytest.raises(expected_exception):
+            list(schema_views.watch_schemas(mock_request))
+
+    def test_watch_schemas_including_disabled(self, mock_request, schema_ids):
+        schema_repository.mark_schema_disabled(schema_ids[1])
+        session.commit()
+        mock_request.params = {'after_id': schema_ids[0], 'timeout': 0}
+        actual = list(schema_views.watch_schemas(mock_request))
+        assert [resp['schema_id'] for resp in actual] == schema_ids[1:]
+        assert actual[0]['status'] == models.AvroSchemaStatus.DISABLED
+
+
 class TestRegisterSchema(RegisterSchemaTestBase):
 
     @pytest.fixture
@@ -183,6 +430,37 @@ class TestRegisterSchema(RegisterSchemaTestBase):
         actual = schema_views.register_schema(mock_request)
         self._assert_equal_schema_response(actual, request_json)
 
+    @pytest.mark.parametrize('coalescing_enabled', [True, False])
+    def test_register_schema_leaves_commit_to_transaction_manager(
+        self,
+        mock_request,
+        request_json,
+        coalescing_enabled
+    ):
+        mock_request.json_body = request_json
+        with staticconf.testing.MockConfiguration(
+            {'registration_coalescing_enabled': coalescing_enabled}
+        ), mock.patch.object(session, 'commit') as mock_commit:
+            actual = schema_views.register_schema(mock_request)
+        self._assert_equal_schema_response(actual, request_json)
+        assert not mock_commit.called
+
+    def test_commit_shared_registration(self, mock_request, request_json):
+        def do_with_waiting_caller(key, func, timeout=None, before_share=None):
+            result = func()
+            before_share(result)
+            return result
+
+        mock_request.json_body = request_json
+        with mock.patch.object(
+            schema_views._registration_flight,
+            'do',
+            side_effect=do_with_waiting_caller
+        ), mock.patch.object(session, 'commit') as mock_commit:
+            actual = schema_views.register_schema(mock_request)
+        self._assert_equal_schema_response(actual, request_json)
+        assert mock_commit.call_count == 1
+
     def test_register_invalid_schema_json(self, mock_request, request_json):
         request_json['schema'] = 'Not valid json!%#!#$#'
         mock_request.json_body = request_json
@@ -369,6 +647,88 @@ class TestRegisterSchema(RegisterSchemaTestBase):
         self._assert_equal_schema_response(actual, request_json)
 
 
+class TestRegisterSchemasInBatch(RegisterSchemaTestBase):
+
+    @pytest.fixture
+    def schema_request_json(self, biz_schema_json, biz_source):
+        return {
+            "schema": simplejson.dumps(biz_schema_json),
+            "namespace": biz_source.namespace.name,
+            "source": biz_source.name,
+            "source_owner_email": 'biz.user@yelp.com',
+            'contains_pii': False
+        }
+
+    def test_register_schemas_in_batch(
+        self,
+        mock_request,
+        schema_request_json
+    ):
+        another_schema_request_json = dict(
+            schema_request_json,
+            source='biz_v2'
+        )
+        mock_request.json_body = {
+            'schemas': [schema_request_json, another_schema_request_json]
+        }
+        actual = schema_views.register_schemas_in_batch(mock_request)
+
+        assert [item['index'] for item in actual] == [0, 1]
+        self._assert_equal_schema_response(
+            actual[0]['schema'],
+            schema_request_json
+        )
+        self._assert_equal_schema_response(
+            actual[1]['schema'],
+            another_schema_request_json
+        )
+
+    def test_register_invalid_schemas_in_batch(
+        self,
+        mock_request,
+        schema_request_json
+    ):
+        mock_request.json_body = {
+            'schemas': [
+                dict(schema_request_json, schema='Not valid json!%#!#$#'),
+                schema_request_json,
+                dict(schema_request_json, namespace='yelp|main'),
+                dict(schema_request_json, schema='{"type": "record"}'),
+            ]
+        }
+        actual = schema_views.register_schemas_in_batch(mock_request)
+
+        assert [item['index'] for item in actual] == [0, 1, 2, 3]
+        assert actual[0]['error'] == (
+            'Error "Expecting value: line 1 column 1 (char 0)" encountered '
+            'decoding JSON: "Not valid json!%#!#$#"'
+        )
+        self._assert_equal_schema_response(
+            actual[1]['schema'],
+            schema_request_json
+        )
+        assert actual[2]['error'] == (
+            'Source name or Namespace name should not contain the '
+            'restricted character: |'
+        )
+        assert 'Invalid Avro schema JSON.' in actual[3]['error']
+
+    def test_register_too_many_schemas_in_batch(
+        self,
+        mock_request,
+        schema_request_json
+    ):
+        mock_request.json_body = {'schemas': [schema_request_json] * 2}
+        expected_exception = self.get_http_exception(400)
+        with mock.patch(
+            'schematizer.views.schemas.get_config'
+        ) as mock_get_config, pytest.raises(expected_exception) as e:
+            mock_get_config.return_value.batch_registration_max_size = 1
+            schema_views.register_schemas_in_batch(mock_request)
+
+        assert e.value.code == expected_exception.code
+
+
 class TestRegisterSchemaFromMySQL(RegisterSchemaTestBase):
 
     @property
@@ -479,24 +839,57 @@ class TestGetSchemaElements(ApiTestBase):
         actual = schema_views.get_schema_elements_by_schema_id(mock_request)
         assert actual == self._get_expected_elements_response(biz_schema)
 
-    def _get_expected_elements_response(self, biz_schema):
+    def test_get_schema_elements_with_notes(self, mock_request, biz_schema):
+        notes = dict(
+            (element.id, factories.create_note(
+                models.ReferenceTypeEnum.SCHEMA_ELEMENT,
+                element.id,
+                'note of {}'.format(element.key),
+                'user@yelp.com'
+            ))
+            for element in biz_schema.avro_schema_elements
+        )
+        expected = self._get_expected_elements_response(biz_schema, notes)
+
+        mock_request.matchdict = {'schema_id': str(biz_schema.id)}
+        with utils.count_queries(self.engine) as statements:
+            actual = schema_views.get_schema_elements_by_schema_id(
+                mock_request
+            )
+
+        assert actual == expected
+        # The schema, its elements, and the notes of all the elements.
+        assert len(statements) == 3
+
+    def _get_expected_elements_response(self, biz_schema, notes=None):
+        notes = notes or {}
         response = []
         for element in biz_schema.avro_schema_elements:
-            response.append(
-                {
-                    'id': element.id,
-                    'schema_id': biz_schema.id,
-                    'element_type': element.element_type,
-                    'key': element.key,
-                    'doc': element.doc,
-                    'created_at': _format_datetime(
-                        element.created_at
-                    ),
-                    'updated_at': _format_datetime(
-                        element.updated_at
-                    )
+            element_response = {
+                'id': element.id,
+                'schema_id': biz_schema.id,
+                'element_type': element.element_type,
+                'key': element.key,
+                'doc': element.doc,
+                'created_at': _format_datetime(
+                    element.created_at
+                ),
+                'updated_at': _format_datetime(
+                    element.updated_at
+                )
+            }
+            note = notes.get(element.id)
+            if note is not None:
+                element_response['note'] = {
+                    'id': note.id,
+                    'reference_type': note.reference_type,
+                    'reference_id': note.reference_id,
+                    'note': note.note,
+                    'last_updated_by': note.last_updated_by,
+                    'created_at': _format_datetime(note.created_at),
+                    'updated_at': _format_datetime(note.updated_at)
                 }
-            )
+            response.append(element_response)
 
         return response
 
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import io
+
+import pytest
+
+from schematizer.api import cursors
+from schematizer.logic import catalog_snapshot
+from schematizer.views import snapshots as snapshot_views
+from tests.views.api_test_base import ApiTestBase
+
+
+class TestGetCatalogSnapshot(ApiTestBase):
+
+    def read_response(self, response):
+        body = b''.join(response.app_iter)
+        assert response.content_length == len(body)
+        return list(catalog_snapshot.read_snapshot(io.BytesIO(body)))
+
+    def test_get_catalog_snapshot(self, mock_request, biz_schema):
+        response = snapshot_views.get_catalog_snapshot(mock_request)
+
+        assert response.content_type == 'application/gzip'
+        records = self.read_response(response)
+        header = records[0]
+        assert not header['is_delta']
+        assert [r['schema_id'] for r in records if r['type'] == 'schema'] == [
+            biz_schema.id
+        ]
+        position = cursors.decode_cursor(
+            response.headers[snapshot_views.SNAPSHOT_POSITION_HEADER],
+            required_keys=()
+        )
+        assert position == header['position']
+
+    def test_get_catalog_delta(self, mock_request, biz_schema):
+        response = snapshot_views.get_catalog_snapshot(mock_request)
+        mock_request.params = {
+            'since': response.headers[snapshot_views.SNAPSHOT_POSITION_HEADER]
+        }
+
+        records = self.read_response(
+            snapshot_views.get_catalog_snapshot(mock_request)
+        )
+
+        assert records[0]['is_delta']
+        assert records[0]['base_position']['schema'] == biz_schema.id
+
+    def test_invalid_since(self, mock_request):
+        mock_request.params = {'since': 'foo'}
+        expected_exception = self.get_http_exception(400)
+        with pytest.raises(expected_exception) as e:
+            snapshot_views.get_catalog_snapshot(mock_request)
+        assert e.value.code == expected_exception.code
@@ -30,12 +30,12 @@ class TestListSources(ApiTestBase):
 
     def test_no_sources(self, mock_request):
         mock_request.params = {}
-        actual = source_views.list_sources(mock_request)
+        actual = list(source_views.list_sources(mock_request))
         assert actual == []
 
     def test_happy_case(self, mock_request, biz_source):
         mock_request.params = {}
-        actual = source_views.list_sources(mock_request)
+        actual = list(source_views.list_sources(mock_request))
         expected = [self.get_expected_src_resp(biz_source.id)]
         assert actual == expected
 
@@ -49,7 +49,7 @@ class TestListSources(ApiTestBase):
         mock_request.params = {
             'count': 1
         }
-        actual = source_views.list_sources(mock_request)
+        actual = list(source_views.list_sources(mock_request))
 
         # Without the count param, length would be 2
         assert len(actual) == 1
@@ -68,7 +68,7 @@ class TestListSources(ApiTestBase):
         mock_request.params = {
             'min_id': min_id
         }
-        actual = source_views.list_sources(mock_request)
+        actual = list(source_views.list_sources(mock_request))
 
         assert actual == expected
 
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import mock
+
+from schematizer.logic import schema_response_cache
+from schematizer.views import status as status_views
+
+
+class TestGetCacheStats(object):
+
+    def test_get_cache_stats(self):
+        schema_response_cache.clear_schema_response_cache()
+        stats_before = schema_response_cache.get_schema_response_cache_stats()
+        schema_response_cache.get_schema_response(1, lambda: {'id': 1})
+        schema_response_cache.get_schema_response(1, lambda: {'id': 1})
+
+        actual = status_views.get_cache_stats(mock.Mock())
+
+        assert set(actual) == {
+            'parsed_avro_schema',
+            'compatibility_verdict',
+            'schema_response',
+            'lookup'
+        }
+        schema_response_stats = actual['schema_response']
+        assert schema_response_stats['size'] == 1
+        assert schema_response_stats['hits'] == stats_before.hits + 1
+        assert schema_response_stats['misses'] == stats_before.misses + 1
+        assert 0.0 < schema_response_stats['hit_ratio'] <= 1.0
@@ -22,6 +22,7 @@ import pytest
 
 from schematizer.api.exceptions import exceptions_v1 as exc_v1
 from schematizer.views import topics as topic_views
+from schematizer_testing import utils
 from tests.views.api_test_base import ApiTestBase
 
 
@@ -48,6 +49,15 @@ class TestGetTopicByTopicName(ApiTestBase):
         expected = self.get_expected_topic_resp(biz_pkey_topic.id)
         assert actual == expected
 
+    def test_selected_fields(self, mock_request, biz_topic):
+        mock_request.matchdict = {'topic_name': biz_topic.name}
+        mock_request.params = {'fields': 'name,source.name'}
+        actual = topic_views.get_topic_by_topic_name(mock_request)
+        assert actual == {
+            'name': biz_topic.name,
+            'source': {'name': biz_topic.source.name}
+        }
+
 
 class TestListSchemasByTopicName(ApiTestBase):
 
@@ -71,6 +81,19 @@ class TestListSchemasByTopicName(ApiTestBase):
         expected = [self.get_expected_schema_resp(biz_schema.id)]
         assert actual == expected
 
+    def test_selected_fields(self, mock_request, biz_topic, biz_schema):
+        mock_request.matchdict = {'topic_name': biz_topic.name}
+        mock_request.params = {'fields': 'schema_id,schema,topic.name'}
+        with utils.count_queries(self.engine) as statements:
+            actual = topic_views.list_schemas_by_topic_name(mock_request)
+
+        assert actual == [{
+            'schema_id': biz_schema.id,
+            'schema': biz_schema.avro_schema,
+            'topic': {'name': biz_topic.name}
+        }]
+        assert not any('FROM note' in statement for statement in statements)
+
 
 class TestGetLatestSchemaByTopicName(ApiTestBase):
 
@@ -109,7 +132,7 @@ class TestGetTopicsByCriteria(ApiTestBase):
 
     def test_non_existing_namespace_name(self, mock_request, biz_topic):
         mock_request.params = {'namespace': 'missing'}
-        actual = topic_views.get_topics_by_criteria(mock_request)
+        actual = list(topic_views.get_topics_by_criteria(mock_request))
         assert actual == []
 
     def test_bad_source_name(self, mock_request, biz_topic):
@@ -117,7 +140,7 @@ class TestGetTopicsByCriteria(ApiTestBase):
             'namespace': biz_topic.source.namespace.name,
             'source': 'missing'
         }
-        actual = topic_views.get_topics_by_criteria(mock_request)
+        actual = list(topic_views.get_topics_by_criteria(mock_request))
         assert actual == []
 
     def test_filter_by_namespace_and_time(self, mock_request, biz_topic):
@@ -126,7 +149,7 @@ class TestGetTopicsByCriteria(ApiTestBase):
             'created_after': (biz_topic.created_at -
                               datetime.utcfromtimestamp(0)).total_seconds()
         }
-        actual = topic_views.get_topics_by_criteria(mock_request)
+        actual = list(topic_views.get_topics_by_criteria(mock_request))
         expected = [self.get_expected_topic_resp(biz_topic.id)]
         assert actual == expected
 
@@ -136,7 +159,7 @@ class TestGetTopicsByCriteria(ApiTestBase):
         }
 
         # Without the count param, length would be 2
-        assert len(topic_views.get_topics_by_criteria(mock_request)) == 1
+        assert len(list(topic_views.get_topics_by_criteria(mock_request))) == 1
 
     def test_min_id(self, mock_request, biz_topic, biz_pkey_topic):
         # Sorting the topics to find the one with the lowest id,
@@ -151,7 +174,7 @@ class TestGetTopicsByCriteria(ApiTestBase):
             'min_id': sorted_topics[0].id + 1
         }
 
-        actual = topic_views.get_topics_by_criteria(mock_request)
+        actual = list(topic_views.get_topics_by_criteria(mock_request))
         expected = [self.get_expected_topic_resp(sorted_topics[1].id)]
         assert actual == expected
 
@@ -168,7 +191,7 @@ class TestGetTopicsByCriteria(ApiTestBase):
             'min_id': sorted_topics[0].id
         }
 
-        actual = topic_views.get_topics_by_criteria(mock_request)
+        actual = list(topic_views.get_topics_by_criteria(mock_request))
         expected = [
             self.get_expected_topic_resp(topic.id)
             for topic in sorted_topics